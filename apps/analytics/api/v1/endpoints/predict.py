@@ -1,5 +1,7 @@
 # apps/api/v1/endpoints/predict.py
 import time
+from typing import List, Optional
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -8,6 +10,7 @@ import numpy as np
 import structlog
 from django.conf import settings
 
+from apps.analytics.features.store import FeatureStoreError, feature_store_enabled, get_feature_store
 from apps.mlops.services import get_active_model
 from apps.trading_core.models import FeatureVector
 from apps.market_data.models import Asset
@@ -22,6 +25,24 @@ def _prepare_numeric_df(df: pd.DataFrame) -> pd.DataFrame:
     return df.astype(float).replace([np.inf, -np.inf], np.nan).fillna(0.0)
 
 
+def _latest_from_feature_store(asset: Asset, timeframe: str, columns: List[str]) -> Optional[pd.DataFrame]:
+    """
+    آخر صف من مخزن الميزات العمودي، أو None إذا لم يكن مفعّلًا أو لا يحتوي على الأعمدة المطلوبة
+    (عندها نرجع إلى FeatureVector).
+    """
+    if not feature_store_enabled():
+        return None
+    store = get_feature_store()
+    tail = store.tail(asset, timeframe)
+    if tail is None:
+        return None
+    try:
+        matrix = store.get_matrix(asset, columns, start=tail, end=tail, timeframe=timeframe)
+    except FeatureStoreError:
+        return None
+    return pd.DataFrame(matrix, columns=columns)
+
+
 class PredictAPIView(APIView):
     """
     نقطة نهاية (Endpoint) للـ API تقوم بتلقي بيانات الأصول أو متجهات الميزات
@@ -40,8 +61,14 @@ class PredictAPIView(APIView):
         try:
             if 'symbol' in request.data:
                 asset = Asset.objects.get(symbol__iexact=request.data['symbol'])
-                fv = FeatureVector.objects.filter(asset=asset).latest('timestamp')
-                features_dict = fv.features
+                stored = _latest_from_feature_store(
+                    asset, request.data.get('timeframe', 'H1'), list(registry.feature_list)
+                )
+                if stored is not None:
+                    features_dict = stored.iloc[0].to_dict()
+                else:
+                    fv = FeatureVector.objects.filter(asset=asset).latest('timestamp')
+                    features_dict = fv.features
             elif 'feature_vector' in request.data:
                 features_dict = request.data['feature_vector']
             else:
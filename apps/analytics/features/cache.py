@@ -0,0 +1,191 @@
+# apps/analytics/features/cache.py
+"""
+Content-addressed disk cache of `FeaturePipeline.build_feature_dataframe`.
+
+Training (`load_aligned_data`), the research commands and the task chain
+featurise the same OHLCV slices over and over. The key of a result is a hash
+of the input bars (timestamps and OHLCV values, not the symbol: the pipeline
+does not read it) and of the pipeline itself: `FeaturePipeline.VERSION`, its
+feature columns and the source code of the modules that compute them. Editing
+any of those changes every key, so stale results are never served; they just
+stop being read and age out.
+
+    <root>/ab/abcdef....npz     float64 values, int64 ns index, column names
+
+Entries are written atomically (temp file + rename) and read without pickle.
+A hit refreshes the entry's mtime; once the directory exceeds `max_bytes` the
+least recently used entries are deleted.
+
+    df = memoised_feature_dataframe(asset.symbol, prices_df)   # == build_feature_dataframe(...)
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+import structlog
+from django.conf import settings
+
+from apps.analytics.features import graph as indicator_graph
+from apps.analytics.features import indicators, pipeline
+from apps.analytics.features.graph import IndicatorGraph
+from apps.analytics.features.pipeline import FeaturePipeline
+
+logger = structlog.get_logger(__name__)
+
+INPUT_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@functools.lru_cache(maxsize=1)
+def pipeline_fingerprint() -> str:
+    """Hash of everything that defines the pipeline's output besides its input."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{FeaturePipeline.VERSION}:{','.join(FeaturePipeline.FEATURE_COLUMNS)}".encode())
+    for module in (pipeline, indicator_graph, indicators):
+        try:
+            digest.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):  # no source shipped; VERSION still applies
+            digest.update(module.__name__.encode())
+    return digest.hexdigest()
+
+
+def bars_digest(ohlcv_df: pd.DataFrame) -> str:
+    """Hash of the bars the pipeline reads, after its own numeric coercion."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(pipeline_fingerprint().encode())
+    index = pd.DatetimeIndex(ohlcv_df.index)
+    digest.update(str(index.tz).encode())
+    digest.update(np.ascontiguousarray(index.as_unit("ns").asi8).tobytes())
+    for col in INPUT_COLUMNS:
+        if col in ohlcv_df.columns:
+            values = pd.to_numeric(ohlcv_df[col], errors="coerce").to_numpy(dtype=float)
+            digest.update(col.encode())
+            digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Feature frames on disk under `root`, keyed by `bars_digest`.
+
+    Example:
+        cache = FeatureCache("/srv/trady2/feature_cache", max_bytes=2 * 1024 ** 3)
+        df = cache.get_or_build("XAUUSD", prices_df)  # featurised once per distinct slice
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 1024 ** 3) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npz"
+
+    def get_or_build(
+        self, symbol: str, ohlcv_df: pd.DataFrame, graph: Optional[IndicatorGraph] = None
+    ) -> pd.DataFrame:
+        if ohlcv_df.empty:
+            return FeaturePipeline.build_feature_dataframe(symbol, ohlcv_df, graph=graph)
+
+        key = bars_digest(ohlcv_df)
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug("Feature cache hit", symbol=symbol, rows=len(cached))
+            return cached
+
+        features_df = FeaturePipeline.build_feature_dataframe(symbol, ohlcv_df, graph=graph)
+        try:
+            self.put(key, features_df)
+        except OSError:
+            logger.exception("Failed to write feature cache entry", symbol=symbol)
+        return features_df
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        path = self.path_for(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                index = pd.DatetimeIndex(data["index"].view("datetime64[ns]"), name=_optional(data["index_name"]))
+                tz = _optional(data["tz"])
+                frame = pd.DataFrame(
+                    data["values"],
+                    index=index.tz_localize(tz) if tz else index,
+                    columns=[str(col) for col in data["columns"]],
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            logger.warning("Discarding unreadable feature cache entry", path=str(path))
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return frame
+
+    def put(self, key: str, features_df: pd.DataFrame) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        index = pd.DatetimeIndex(features_df.index)
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            values=features_df.to_numpy(dtype=float),
+            index=index.tz_localize(None).as_unit("ns").asi8 if index.tz else index.as_unit("ns").asi8,
+            tz=np.array(str(index.tz) if index.tz else ""),
+            index_name=np.array(index.name or ""),
+            columns=np.array([str(col) for col in features_df.columns]),
+        )
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits `max_bytes`. Returns the count deleted."""
+        entries = []
+        for path in self.root.glob("*/*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        return deleted
+
+    def clear(self) -> None:
+        for path in self.root.glob("*/*.npz"):
+            path.unlink(missing_ok=True)
+
+
+def _optional(value: np.ndarray) -> Optional[str]:
+    text = str(value)
+    return text or None
+
+
+def get_feature_cache() -> Optional[FeatureCache]:
+    """The cache under ANALYTICS_CONFIG["FEATURE_CACHE_DIR"], or None when `FEATURE_CACHE_ENABLED` is off."""
+    config = settings.ANALYTICS_CONFIG
+    if not config.get("FEATURE_CACHE_ENABLED", False):
+        return None
+    return FeatureCache(
+        config.get("FEATURE_CACHE_DIR", "data/feature_cache"), config.get("FEATURE_CACHE_MAX_BYTES", 1024 ** 3)
+    )
+
+
+def memoised_feature_dataframe(
+    symbol: str, ohlcv_df: pd.DataFrame, graph: Optional[IndicatorGraph] = None
+) -> pd.DataFrame:
+    """`FeaturePipeline.build_feature_dataframe`, served from the feature cache when it is enabled."""
+    cache = get_feature_cache()
+    if cache is None:
+        return FeaturePipeline.build_feature_dataframe(symbol, ohlcv_df, graph=graph)
+    return cache.get_or_build(symbol, ohlcv_df, graph=graph)
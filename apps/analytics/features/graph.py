@@ -0,0 +1,258 @@
+# apps/analytics/features/graph.py
+"""
+Per-frame indicator graph: every intermediate series (true range, EMA(n),
+rolling max/min, Wilder smoothing, ...) is a node computed at most once per
+OHLCV frame and shared by every feature, strategy and filter that asks for it.
+
+Nodes are addressed by keys, `(name, *params)`. A parameter naming another
+series is itself a key, or a bare node name for parameterless nodes:
+
+    graph = IndicatorGraph(df_h1)
+    graph.get("ema", "close", 200)                   # EMA200 of the close
+    graph.get("adx", 14)                             # shares ("tr",) with "atr"/"chop"
+    graph.get("ema", ("macd_line", 12, 26), 9)       # MACD signal line
+
+Evaluation is lazy: `get` computes the requested node and only the nodes it
+depends on; `graph.evaluated` lists what has been computed so far, in order.
+Parameters are positional and never defaulted, so equal requests map to equal
+keys. Node values are the float64 arrays of `features.indicators`, aligned with
+the frame's index; treat them as read-only, they are shared.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Hashable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.analytics.features import indicators
+
+Key = Tuple[Hashable, ...]
+
+SOURCES = ("open", "high", "low", "close", "volume")
+
+
+class _Node(NamedTuple):
+    compute: Callable
+    deps: Callable[..., Sequence]
+
+
+_NODES: Dict[str, _Node] = {}
+
+
+def key(ref) -> Key:
+    """Normalises a node reference: "close" -> ("close",); keys pass through."""
+    return ref if isinstance(ref, tuple) else (ref,)
+
+
+def node(name: str, deps: Callable[..., Sequence] = lambda *params: ()):
+    """
+    Registers `compute(*dependency values, *params)` as node `name`.
+    `deps(*params)` returns the references the node reads.
+    """
+
+    def register(compute: Callable) -> Callable:
+        _NODES[name] = _Node(compute, deps)
+        return compute
+
+    return register
+
+
+class IndicatorGraph:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.index = df.index
+        self.evaluated: List[Key] = []
+        self._values: Dict[Key, object] = {}
+
+    def get(self, name: str, *params):
+        """Value of node `(name, *params)`, computing it and its dependencies on first use."""
+        return self._evaluate((name, *params))
+
+    def series(self, name: str, *params) -> pd.Series:
+        return pd.Series(self.get(name, *params), index=self.index)
+
+    def __contains__(self, ref) -> bool:
+        return key(ref) in self._values
+
+    def _evaluate(self, node_key: Key):
+        try:
+            return self._values[node_key]
+        except KeyError:
+            pass
+
+        name, params = node_key[0], node_key[1:]
+        if name in SOURCES and not params:
+            value = pd.to_numeric(self.df[name], errors="coerce").to_numpy(dtype=float)
+        else:
+            try:
+                spec = _NODES[name]
+            except KeyError:
+                raise KeyError(f"Unknown indicator node {name!r}") from None
+            inputs = [self._evaluate(key(dep)) for dep in spec.deps(*params)]
+            value = spec.compute(*inputs, *params)
+
+        self._values[node_key] = value
+        self.evaluated.append(node_key)
+        return value
+
+
+# ---------------------------
+# Price transforms
+# ---------------------------
+@node("log_return", deps=lambda: ["close"])
+def _log_return(close):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(close / indicators.previous(close))
+
+
+@node("tr", deps=lambda: ["high", "low", "close"])
+def _true_range(high, low, close):
+    return indicators.true_range(high, low, close)
+
+
+@node("dm", deps=lambda: ["high", "low"])
+def _directional_movement(high, low):
+    return indicators.directional_movement(high, low)
+
+
+@node("dm_pos", deps=lambda: ["dm"])
+def _dm_pos(dm):
+    return dm[0]
+
+
+@node("dm_neg", deps=lambda: ["dm"])
+def _dm_neg(dm):
+    return dm[1]
+
+
+@node("gains_losses", deps=lambda src: [src])
+def _gains_losses(values, src):
+    return indicators.gains_losses(values)
+
+
+@node("gain", deps=lambda src: [("gains_losses", src)])
+def _gain(gains_losses, src):
+    return gains_losses[0]
+
+
+@node("loss", deps=lambda src: [("gains_losses", src)])
+def _loss(gains_losses, src):
+    return gains_losses[1]
+
+
+# ---------------------------
+# Smoothing
+# ---------------------------
+@node("ema", deps=lambda src, window: [src])
+def _ema(values, src, window):
+    return indicators.ema(values, window)
+
+
+@node("smma", deps=lambda src, window, min_periods: [src])
+def _smma(values, src, window, min_periods):
+    """Wilder's moving average as an EWM with alpha = 1 / window."""
+    return indicators.ewm_mean(values, 1.0 / window, min_periods)
+
+
+@node("wilder_average", deps=lambda src, window: [src])
+def _wilder_average(values, src, window):
+    return indicators.wilder_average(values, window)
+
+
+@node("wilder_sum", deps=lambda src, window: [src])
+def _wilder_sum(values, src, window):
+    return indicators.wilder_sum(values, window)
+
+
+# ---------------------------
+# Rolling windows
+# ---------------------------
+@node("rolling_max", deps=lambda src, window: [src])
+def _rolling_max(values, src, window):
+    return indicators.rolling_max(values, window)
+
+
+@node("rolling_min", deps=lambda src, window: [src])
+def _rolling_min(values, src, window):
+    return indicators.rolling_min(values, window)
+
+
+@node("rolling_sum", deps=lambda src, window: [src])
+def _rolling_sum(values, src, window):
+    return indicators.rolling_sum(values, window)
+
+
+@node("rolling_moments", deps=lambda src, window, ddof: [src])
+def _rolling_moments(values, src, window, ddof):
+    return indicators.rolling_moments(values, window, ddof)
+
+
+@node("rolling_std", deps=lambda src, window, ddof: [("rolling_moments", src, window, ddof)])
+def _rolling_std(moments, src, window, ddof):
+    return moments[1]
+
+
+# ---------------------------
+# Indicators
+# ---------------------------
+@node(
+    "rsi",
+    deps=lambda window: [("smma", (side, "close"), window, window) for side in ("gain", "loss")],
+)
+def _rsi(avg_gain, avg_loss, window):
+    return indicators.rsi_from_averages(avg_gain, avg_loss)
+
+
+@node("atr", deps=lambda window: [("wilder_average", "tr", window)])
+def _atr(average, window):
+    return average
+
+
+@node(
+    "adx",
+    deps=lambda window: [("wilder_sum", src, window) for src in ("tr", "dm_pos", "dm_neg")],
+)
+def _adx(tr_sum, pos_sum, neg_sum, window):
+    return indicators.adx_from_sums(tr_sum, pos_sum, neg_sum, window)
+
+
+@node(
+    "chop",
+    deps=lambda window: [
+        ("rolling_sum", "tr", window),
+        ("rolling_max", "high", window),
+        ("rolling_min", "low", window),
+    ],
+)
+def _choppiness(tr_sum, highest, lowest, window):
+    return indicators.choppiness_from(tr_sum, highest, lowest, window)
+
+
+@node("stoch_k", deps=lambda window: ["close", ("rolling_min", "low", window), ("rolling_max", "high", window)])
+def _stochastic_k(close, lowest, highest, window):
+    return indicators.stochastic_k(close, lowest, highest)
+
+
+@node("stoch_d", deps=lambda window, smooth_window: [("stoch_k", window)])
+def _stochastic_d(k, window, smooth_window):
+    return indicators.stochastic_d(k, window, smooth_window)
+
+
+@node("macd_line", deps=lambda fast, slow: [("ema", "close", fast), ("ema", "close", slow)])
+def _macd_line(ema_fast, ema_slow, fast, slow):
+    return ema_fast - ema_slow
+
+
+@node(
+    "macd_diff",
+    deps=lambda fast, slow, sign: [("macd_line", fast, slow), ("ema", ("macd_line", fast, slow), sign)],
+)
+def _macd_diff(line, signal, fast, slow, sign):
+    return line - signal
+
+
+@node("bollinger", deps=lambda window, window_dev: ["close", ("rolling_moments", "close", window, 0)])
+def _bollinger(close, moments, window, window_dev):
+    return indicators.bollinger_from_moments(close, *moments, window_dev)
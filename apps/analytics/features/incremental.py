@@ -0,0 +1,484 @@
+# apps/analytics/features/incremental.py
+"""
+Streaming counterpart of `FeaturePipeline.build_feature_dataframe`.
+
+The batch pipeline recomputes every indicator over the whole loaded window on
+each cycle. `IncrementalFeatureEngine` keeps the recursive state of each
+indicator instead (EMA, Wilder smoothing, fixed-size rolling windows) and folds
+one bar at a time into it, so a new bar costs the same no matter how much
+history is behind it. Fed the same bars from the same first bar it reproduces
+the batch features (including the `ta` warm-up quirks) to float precision.
+
+The state is JSON-serialisable and persisted per (asset, timeframe, pipeline
+version) in `FeatureEngineState`, so whichever worker sees the next bar resumes
+where the previous one stopped:
+
+    features = incremental_features(asset, "H1", ohlcv_df)
+
+Only closed bars advance the persisted state; the forming bar is evaluated on
+a throwaway copy.
+"""
+
+from __future__ import annotations
+
+import copy
+import datetime
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+import structlog
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.analytics.features.cache import memoised_feature_dataframe
+from apps.analytics.features.graph import IndicatorGraph
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.common.enums import Timeframe
+from apps.common.sqlite import single_writer
+from apps.market_data.models import Asset
+from apps.trading_core.models import FeatureEngineState
+
+logger = structlog.get_logger(__name__)
+
+NAN = float("nan")
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with numpy semantics (inf / nan instead of ZeroDivisionError)."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _encode(value: Any) -> Any:
+    """JSON-safe copy of a state value (jsonb rejects NaN/inf; deques become lists)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (list, tuple, deque)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if value is None:
+        return NAN
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class _Indicator:
+    """Recursive indicator state; subclasses list their state attributes in `fields`."""
+
+    fields: tuple = ()
+    windows: tuple = ()
+
+    def to_state(self) -> Dict[str, Any]:
+        return {name: _encode(getattr(self, name)) for name in self.fields}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        for name in self.fields:
+            value = _decode(state[name])
+            if name in self.windows:
+                value = deque(value, maxlen=getattr(self, name).maxlen)
+            setattr(self, name, value)
+
+
+class _EMA(_Indicator):
+    """`ewm(span=window, min_periods=window, adjust=False).mean()` (ta's EMAIndicator)."""
+
+    fields = ("value", "count")
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if self.count == 0:
+            self.value = x
+        else:
+            self.value = ((1.0 - self.alpha) * self.value + self.alpha * x) / ((1.0 - self.alpha) + self.alpha)
+        self.count += 1
+        return self.value if self.count >= self.window else NAN
+
+
+class _RSI(_Indicator):
+    """ta's RSIIndicator: Wilder averages of gains/losses, the first bar counting as a zero move."""
+
+    fields = ("up", "down", "count", "prev_close")
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.up = _EMA(window)
+        self.down = _EMA(window)
+        self.up.alpha = self.down.alpha = 1.0 / window
+        self.count = 0
+        self.prev_close = NAN
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "up": self.up.to_state(),
+            "down": self.down.to_state(),
+            "count": self.count,
+            "prev_close": _encode(self.prev_close),
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.up.load_state(state["up"])
+        self.down.load_state(state["down"])
+        self.count = state["count"]
+        self.prev_close = _decode(state["prev_close"])
+
+    def update(self, close: float) -> float:
+        diff = close - self.prev_close if self.count else NAN
+        self.prev_close = close
+        self.count += 1
+        avg_up = self.up.update(diff if diff > 0 else 0.0)
+        avg_down = self.down.update(-diff if diff < 0 else 0.0)
+        if avg_down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + _div(avg_up, avg_down))
+
+
+class _RollingStd(_Indicator):
+    """`rolling(window).std()` (ddof=1) via Welford add/remove over a ring buffer."""
+
+    fields = ("values", "mean", "m2", "invalid", "pushed")
+    windows = ("values",)
+
+    def __init__(self, window: int) -> None:
+        self.values: deque = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.invalid = 0  # non-finite values in the window: pandas yields NaN while any is present
+        self.pushed = 0
+
+    def update(self, x: float) -> float:
+        window = self.values.maxlen
+        if len(self.values) == window:
+            self._remove(self.values[0])
+        self.values.append(x)
+        self._add(x)
+        self.pushed += 1
+        if self.pushed % window == 0:
+            self._reseed()  # bound the drift of the add/remove updates
+        if len(self.values) < window or self.invalid:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (window - 1))
+
+    def _add(self, x: float) -> None:
+        if not math.isfinite(x):
+            self.invalid += 1
+            return
+        n = len(self.values) - self.invalid
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        if not math.isfinite(x):
+            self.invalid -= 1
+            return
+        n = len(self.values) - self.invalid
+        if n <= 1:
+            self.mean = self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / (n - 1)
+        self.m2 -= delta * (x - self.mean)
+
+    def _reseed(self) -> None:
+        finite = [v for v in self.values if math.isfinite(v)]
+        self.mean = math.fsum(finite) / len(finite) if finite else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in finite)
+
+
+class _ADX(_Indicator):
+    """
+    ta's ADXIndicator, bar by bar: Wilder sums of TR/+DM/-DM seeded with the sum of
+    bars 1..window, DX from bar `window`, ADX seeded with the mean of the first
+    `window` DX values and 0 before that.
+    """
+
+    fields = ("count", "prev_high", "prev_low", "prev_close", "trs", "dip", "din", "dx_sum", "adx")
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.count = 0
+        self.prev_high = self.prev_low = self.prev_close = NAN
+        self.trs = self.dip = self.din = 0.0
+        self.dx_sum = 0.0
+        self.adx = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        row = self.count
+        self.count += 1
+        if row == 0:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return 0.0
+
+        tr = max(high, self.prev_close) - min(low, self.prev_close)
+        up = high - self.prev_high
+        down = self.prev_low - low
+        pos = up if (up > down and up > 0) else 0.0
+        neg = down if (down > up and down > 0) else 0.0
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        w = self.window
+        if row <= w:
+            self.trs += tr
+            self.dip += pos
+            self.din += neg
+        else:
+            self.trs = self.trs - self.trs / float(w) + tr
+            self.dip = self.dip - self.dip / float(w) + pos
+            self.din = self.din - self.din / float(w) + neg
+        if row < w:
+            return 0.0
+
+        di_pos = 100 * _div(self.dip, self.trs)
+        di_neg = 100 * _div(self.din, self.trs)
+        dx = 100 * abs(_div(di_pos - di_neg, di_pos + di_neg))
+        if row < 2 * w - 1:
+            self.dx_sum += dx
+            return 0.0
+        if row == 2 * w - 1:
+            self.adx = (self.dx_sum + dx) / w
+        else:
+            self.adx = (self.adx * (w - 1) + dx) / float(w)
+        return self.adx
+
+
+class _Choppiness(_Indicator):
+    """`FeaturePipeline._calculate_choppiness` over ring buffers of TR, highs and lows."""
+
+    fields = ("prev_close", "tr", "highs", "lows", "tr_sum", "pushed")
+    windows = ("tr", "highs", "lows")
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.prev_close = NAN
+        self.tr: deque = deque(maxlen=window)
+        self.highs: deque = deque(maxlen=window)
+        self.lows: deque = deque(maxlen=window)
+        self.tr_sum = 0.0
+        self.pushed = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if not math.isnan(self.prev_close):
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+
+        if len(self.tr) == self.window:
+            self.tr_sum -= self.tr[0]
+        self.tr.append(tr)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.tr_sum += tr
+        self.pushed += 1
+        if self.pushed % self.window == 0:
+            self.tr_sum = math.fsum(self.tr)
+        if len(self.tr) < self.window:
+            return NAN
+
+        range_hl = max(self.highs) - min(self.lows)
+        if range_hl == 0:
+            return NAN
+        return 100 * math.log10(_div(self.tr_sum, range_hl)) / math.log10(self.window)
+
+
+class IncrementalFeatureEngine:
+    """
+    Per-bar feature state for one (asset, timeframe), producing the
+    `FeaturePipeline.FEATURE_COLUMNS` row of each bar it is fed.
+
+    Example:
+        engine = IncrementalFeatureEngine()
+        history = engine.run(ohlcv_df)          # == FeaturePipeline.build_feature_dataframe(...)
+        row = engine.update(ts, o, h, l, c)     # next bar, O(1)
+        restored = IncrementalFeatureEngine.from_state(engine.to_state())
+    """
+
+    version = FeaturePipeline.VERSION
+    columns = FeaturePipeline.FEATURE_COLUMNS
+
+    def __init__(self) -> None:
+        self.ema200 = _EMA(200)
+        self.rsi = _RSI(14)
+        self.adx = _ADX(14)
+        self.chop = _Choppiness(14)
+        self.vol = _RollingStd(20)
+        self.prev_close = NAN
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.last_features: Optional[Dict[str, float]] = None
+
+    def update(
+        self, timestamp: datetime.datetime, open_: float, high: float, low: float, close: float
+    ) -> Dict[str, float]:
+        """Fold one bar (strictly after `last_timestamp`) into the state and return its features."""
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(f"Bar {timestamp} is not after the engine's last bar {self.last_timestamp}.")
+
+        vol_std = NAN
+        if not math.isnan(self.prev_close):
+            log_ret = math.log(close / self.prev_close) if self.prev_close > 0 and close > 0 else NAN
+            vol_std = self.vol.update(log_ret)
+        self.prev_close = close
+
+        ema = self.ema200.update(close)
+        raw = {
+            "vol_std": vol_std,
+            "dist_ema200": _div(close - ema, ema),
+            "rsi": self.rsi.update(close),
+            "adx": self.adx.update(high, low, close),
+            "chop": self.chop.update(high, low, close),
+            "is_green": float(close > open_),
+        }
+        # Same cleaning as the batch pipeline: inf -> NaN -> 0.
+        features = {col: raw[col] if math.isfinite(raw[col]) else 0.0 for col in self.columns}
+        self.last_timestamp = timestamp
+        self.last_features = features
+        return features
+
+    def run(self, ohlcv_df: pd.DataFrame) -> pd.DataFrame:
+        """Feed every bar of `ohlcv_df` and return their features, indexed like the input."""
+        rows = [
+            self.update(ts, o, h, l, c)
+            for ts, o, h, l, c in zip(
+                ohlcv_df.index,
+                ohlcv_df["open"].astype(float),
+                ohlcv_df["high"].astype(float),
+                ohlcv_df["low"].astype(float),
+                ohlcv_df["close"].astype(float),
+            )
+        ]
+        return pd.DataFrame(rows, index=ohlcv_df.index, columns=self.columns)
+
+    def copy(self) -> "IncrementalFeatureEngine":
+        return copy.deepcopy(self)
+
+    def _indicators(self) -> Iterable[tuple]:
+        return (
+            ("ema200", self.ema200),
+            ("rsi", self.rsi),
+            ("adx", self.adx),
+            ("chop", self.chop),
+            ("vol", self.vol),
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {name: indicator.to_state() for name, indicator in self._indicators()}
+        state["version"] = self.version
+        state["prev_close"] = _encode(self.prev_close)
+        state["last_timestamp"] = self.last_timestamp.isoformat() if self.last_timestamp is not None else None
+        state["last_features"] = self.last_features
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "IncrementalFeatureEngine":
+        if state.get("version") != cls.version:
+            raise ValueError(
+                f"Feature state version {state.get('version')} does not match pipeline {cls.version}."
+            )
+        engine = cls()
+        for name, indicator in engine._indicators():
+            indicator.load_state(state[name])
+        engine.prev_close = _decode(state["prev_close"])
+        if state["last_timestamp"] is not None:
+            engine.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        engine.last_features = state["last_features"]
+        return engine
+
+
+def load_engine(asset: Asset, timeframe: str) -> Optional[IncrementalFeatureEngine]:
+    """The persisted engine of the series, or None when there is none for this pipeline version."""
+    row = FeatureEngineState.objects.filter(
+        asset=asset, timeframe=timeframe, pipeline_version=FeaturePipeline.VERSION
+    ).first()
+    if row is None:
+        return None
+    try:
+        return IncrementalFeatureEngine.from_state(row.state)
+    except (KeyError, TypeError, ValueError):
+        logger.warning("Discarding unreadable feature engine state", symbol=asset.symbol, timeframe=timeframe)
+        return None
+
+
+def save_engine(asset: Asset, timeframe: str, engine: IncrementalFeatureEngine) -> None:
+    with single_writer(), transaction.atomic():
+        FeatureEngineState.objects.update_or_create(
+            asset=asset,
+            timeframe=timeframe,
+            pipeline_version=engine.version,
+            defaults={"last_timestamp": engine.last_timestamp.to_pydatetime(), "state": engine.to_state()},
+        )
+
+
+def incremental_features(
+    asset: Asset,
+    timeframe: str,
+    ohlcv_df: pd.DataFrame,
+    now: Optional[datetime.datetime] = None,
+) -> pd.DataFrame:
+    """
+    Features of the bars in `ohlcv_df` the persisted state has not seen yet, with
+    the last bar's row always included.
+
+    The stored engine is resumed when `ohlcv_df` still contains its last bar (so
+    no bar in between is missing); otherwise a fresh engine is run over the whole
+    frame, like the batch pipeline. Bars whose period has ended by `now` advance
+    and are persisted in the state; a still-forming last bar is computed on a copy.
+    """
+    if ohlcv_df.empty:
+        return pd.DataFrame(columns=FeaturePipeline.FEATURE_COLUMNS)
+
+    now = now or timezone.now()
+    closed_until = pd.Timestamp(now) - Timeframe(timeframe).to_timedelta()
+    engine = load_engine(asset, timeframe)
+    if engine is None or engine.last_timestamp is None or engine.last_timestamp not in ohlcv_df.index:
+        engine = IncrementalFeatureEngine()
+        pending = ohlcv_df
+    else:
+        pending = ohlcv_df[ohlcv_df.index > engine.last_timestamp]
+
+    closed = pending[pending.index <= closed_until]
+    forming = pending[pending.index > closed_until]
+    frames = []
+    if not closed.empty:
+        frames.append(engine.run(closed))
+        save_engine(asset, timeframe, engine)
+    if not forming.empty:
+        frames.append(engine.copy().run(forming))
+    if not frames:
+        if engine.last_features is None:
+            return IncrementalFeatureEngine().run(ohlcv_df).iloc[[-1]]
+        return pd.DataFrame([engine.last_features], index=ohlcv_df.index[-1:], columns=engine.columns)
+    return pd.concat(frames)
+
+
+def build_features(
+    asset: Asset, timeframe: str, ohlcv_df: pd.DataFrame, graph: Optional[IndicatorGraph] = None
+) -> pd.DataFrame:
+    """
+    Feature frame for the analysis paths: incremental when
+    ANALYTICS_CONFIG["INCREMENTAL_FEATURES"] is on (new bars only), the full batch
+    pipeline otherwise or if the incremental path fails. The batch pipeline reuses
+    the nodes already evaluated on `graph`, an IndicatorGraph over `ohlcv_df`.
+    """
+    if settings.ANALYTICS_CONFIG.get("INCREMENTAL_FEATURES", False):
+        try:
+            return incremental_features(asset, timeframe, ohlcv_df)
+        except Exception:
+            logger.exception(
+                "Incremental features failed; falling back to the batch pipeline", symbol=asset.symbol
+            )
+    return memoised_feature_dataframe(asset.symbol, ohlcv_df, graph=graph)
@@ -0,0 +1,395 @@
+# apps/analytics/features/indicators.py
+"""
+Indicator kernels on raw float64 arrays, numerically matching the `ta` package.
+
+`ta` builds several intermediate pandas Series per indicator and runs its ADX
+and ATR recursions as Python loops. These kernels take and return plain
+NumPy arrays:
+
+  * rolling windows (Bollinger, Stochastic, choppiness) are combined from
+    forward/backward scans over blocks of `window` rows, O(n) for any window;
+  * the first-order recursions behind EMA, Wilder smoothing, ADX and ATR
+    run through one primitive, `_recurrence`. It is a numba-compiled loop
+    when numba is installed and `scipy.signal.lfilter` (a C loop; scipy
+    ships with scikit-learn) otherwise.
+
+Each kernel reproduces the `ta` defaults (fillna=False) to float rounding,
+including warm-up rows: NaN where `ta` yields NaN and 0 where `ta` yields 0.
+Differences:
+  * `adx` returns zeros instead of raising IndexError for inputs shorter
+    than 2 * window rows;
+  * rolling standard deviations are exact to rounding, whereas pandas'
+    add/remove rolling variance drifts on long, high-priced series. That
+    drift shows up in Bollinger %B once the bands are narrow.
+Inputs may start with NaNs but must be gap-free after that.
+
+The composite kernels are assembled from public building blocks
+(`true_range`, `wilder_sum`, `adx_from_sums`, ...) so that
+`features.graph.IndicatorGraph` can share the intermediate series between
+indicators computed on the same frame.
+
+    close = df["close"].to_numpy(dtype=float)
+    df["rsi"] = indicators.rsi(close, 14)
+
+`manage.py benchmark_indicators` times every kernel against `ta`.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    import numba  # type: ignore
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _recurrence_jit(x, decay, gain, initial):  # pragma: no cover - depends on numba
+        out = np.empty_like(x)
+        prev = initial
+        for i in range(x.shape[0]):
+            prev = decay * prev + gain * x[i]
+            out[i] = prev
+        return out
+
+
+def _recurrence(x: np.ndarray, decay: float, gain: float, initial: float) -> np.ndarray:
+    """y[i] = decay * y[i-1] + gain * x[i], with y[-1] = initial."""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if x.size == 0:
+        return x.copy()
+    if NUMBA_AVAILABLE:
+        return _recurrence_jit(x, decay, gain, initial)
+    return lfilter([gain], [1.0, -decay], x, zi=[decay * initial])[0]
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _block_scans(x: np.ndarray, window: int, accumulate, fill: float):
+    """
+    Running `accumulate` within consecutive blocks of `window` rows, forwards and backwards,
+    cut to the window starts (`backward`) and window ends (`forward`).
+
+    The trailing window ending at row j = i + window - 1 is backward[i] (row i to the end of
+    its block) combined with forward[i] (start of the next block to row j), following van
+    Herk / Gil-Werman: every rolling reduction below is O(n) and only ever accumulates
+    within one block. For block-aligned windows (i % window == 0) both sides cover the
+    same single block.
+    """
+    n = x.shape[0]
+    padded = np.full(-(-n // window) * window, fill)
+    padded[:n] = x
+    blocks = padded.reshape(-1, window)
+    forward = accumulate(blocks, axis=1).ravel()[window - 1 : n]
+    backward = accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[: n - window + 1]
+    return forward, backward
+
+
+def _rolling_extreme(x, window: int, ufunc: np.ufunc) -> np.ndarray:
+    x = _as_float(x)
+    out = np.full(x.shape[0], np.nan)
+    if window < 1 or x.shape[0] < window:
+        return out
+    forward, backward = _block_scans(x, window, ufunc.accumulate, np.nan)
+    out[window - 1 :] = ufunc(backward, forward)
+    return out
+
+
+def rolling_max(x, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, np.maximum)
+
+
+def rolling_min(x, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, np.minimum)
+
+
+def _rolling_block_sum(x: np.ndarray, window: int) -> np.ndarray:
+    forward, backward = _block_scans(x, window, np.cumsum, 0.0)
+    total = backward + forward
+    total[::window] = backward[::window]  # aligned windows are one block: don't count it twice
+    return total
+
+
+def rolling_sum(x, window: int) -> np.ndarray:
+    x = _as_float(x)
+    out = np.full(x.shape[0], np.nan)
+    if window < 1 or x.shape[0] < window:
+        return out
+    out[window - 1 :] = _rolling_block_sum(x, window)
+    return out
+
+
+def _flat(x: np.ndarray, window: int) -> np.ndarray:
+    """Windows (by end row, from row window - 1) whose values are all equal; NaN never is."""
+    changes = np.concatenate(([0], np.cumsum(x[1:] != x[:-1])))
+    return changes[window - 1 :] == changes[: x.shape[0] - window + 1]
+
+
+# Like pandas, a constant window has exactly its value as mean and 0 as std: the sums below
+# leave rounding noise there, which would turn 0/0 band ratios into +-inf.
+def rolling_mean(x, window: int) -> np.ndarray:
+    mean = rolling_sum(x, window) / window
+    if mean.shape[0] >= window:
+        x = _as_float(x)
+        flat = np.flatnonzero(_flat(x, window)) + window - 1
+        mean[flat] = x[flat]
+    return mean
+
+
+def _rolling_moments(x: np.ndarray, window: int, ddof: int):
+    """
+    Rolling mean and standard deviation, by window end row from row window - 1. Values are
+    taken relative to an anchor value of their block, so the sums of squares stay at the
+    scale of local moves rather than of the price itself.
+    """
+    n = x.shape[0]
+    padded = np.full(-(-n // window) * window + window, np.nan)
+    padded[:n] = np.where(np.isfinite(x), x, np.nan)
+    with np.errstate(invalid="ignore"):
+        anchors = np.fmax.reduce(padded.reshape(-1, window), axis=1)
+    anchors[np.isnan(anchors)] = 0.0
+    dev = x - np.repeat(anchors, window)[:n]
+    fwd1, back1 = _block_scans(dev, window, np.cumsum, 0.0)
+    fwd2, back2 = _block_scans(dev * dev, window, np.cumsum, 0.0)
+
+    # The tail of each window lies in the next block: re-express it relative to this
+    # block's anchor. Aligned windows have no tail (tail == 0).
+    tail = np.arange(n - window + 1) % window
+    shift = np.repeat(np.diff(anchors), window)[: n - window + 1]
+    fwd1[::window] = 0.0
+    fwd2[::window] = 0.0
+    s1 = back1 + fwd1 + tail * shift
+    s2 = back2 + fwd2 + shift * (2 * fwd1 + tail * shift)
+
+    mean = np.repeat(anchors[:-1], window)[: n - window + 1] + s1 / window
+    std = np.sqrt(np.maximum(s2 - s1 * s1 / window, 0.0) / (window - ddof))
+    flat = _flat(x, window)
+    mean[flat] = x[window - 1 :][flat]
+    std[flat] = 0.0
+    return mean, std
+
+
+def rolling_moments(x, window: int, ddof: int = 1):
+    """(rolling mean, rolling std), both NaN for the first window - 1 rows."""
+    x = _as_float(x)
+    mean = np.full(x.shape[0], np.nan)
+    std = np.full(x.shape[0], np.nan)
+    if window > ddof and x.shape[0] >= window:
+        mean[window - 1 :], std[window - 1 :] = _rolling_moments(x, window, ddof)
+    return mean, std
+
+
+def rolling_std(x, window: int, ddof: int = 1) -> np.ndarray:
+    return rolling_moments(x, window, ddof)[1]
+
+
+def ewm_mean(x, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """`Series.ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean()` after leading NaNs."""
+    x = _as_float(x)
+    out = np.full(x.shape[0], np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if valid.size == 0:
+        return out
+    first = valid[0]
+    values = _recurrence(x[first:], 1.0 - alpha, alpha, x[first])
+    values[: max(min_periods - 1, 0)] = np.nan
+    out[first:] = values
+    return out
+
+
+def previous(x: np.ndarray) -> np.ndarray:
+    shifted = np.empty_like(x)
+    shifted[:1] = np.nan
+    shifted[1:] = x[:-1]
+    return shifted
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """max(high - low, |high - prev close|, |low - prev close|); the first row is high - low."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = previous(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def directional_movement(high, low):
+    """(+DM, -DM) as in ta's ADX; the first row is NaN."""
+    high, low = _as_float(high), _as_float(low)
+    up = high - previous(high)
+    down = previous(low) - low
+    pos = np.where((up > down) & (up > 0), up, 0.0)
+    neg = np.where((down > up) & (down > 0), down, 0.0)
+    pos[:1] = neg[:1] = np.nan
+    return pos, neg
+
+
+def gains_losses(close):
+    """Per-bar (gain, loss) of the close, both 0 on the first row (ta's RSI)."""
+    diff = np.diff(_as_float(close), prepend=np.nan)
+    return np.where(diff > 0, diff, 0.0), np.where(diff < 0, -diff, 0.0)
+
+
+def wilder_average(x, window: int) -> np.ndarray:
+    """ta's ATR smoothing: mean of the first `window` rows at row window - 1, then Wilder; 0 before."""
+    x = _as_float(x)
+    out = np.zeros(x.shape[0])
+    if x.shape[0] < window:
+        return out
+    seed = x[:window].mean()
+    out[window - 1] = seed
+    out[window:] = _recurrence(x[window:], (window - 1) / window, 1.0 / window, seed)
+    return out
+
+
+def wilder_sum(x, window: int) -> np.ndarray:
+    """ta's ADX smoothing: sum of rows 1..window at row `window`, then S - S / window + x; NaN before."""
+    x = _as_float(x)
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] <= window:
+        return out
+    seed = x[1 : window + 1].sum()
+    out[window] = seed
+    out[window + 1 :] = _recurrence(x[window + 1 :], 1.0 - 1.0 / window, 1.0, seed)
+    return out
+
+
+def adx_from_sums(tr_sum, pos_sum, neg_sum, window: int) -> np.ndarray:
+    """ADX from the `wilder_sum`s of TR, +DM and -DM."""
+    tr_sum = _as_float(tr_sum)
+    n = tr_sum.shape[0]
+    out = np.zeros(n)
+    if n < 2 * window:
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_pos = 100 * (_as_float(pos_sum)[window:] / tr_sum[window:])
+        di_neg = 100 * (_as_float(neg_sum)[window:] / tr_sum[window:])
+        dx = 100 * np.abs((di_pos - di_neg) / (di_pos + di_neg))
+    seed = dx[:window].mean()
+    out[2 * window - 1] = seed
+    out[2 * window :] = _recurrence(dx[window:], (window - 1) / window, 1.0 / window, seed)
+    return out
+
+
+def rsi_from_averages(avg_gain, avg_loss) -> np.ndarray:
+    avg_gain, avg_loss = _as_float(avg_gain), _as_float(avg_loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def ema(close, window: int) -> np.ndarray:
+    """ta.trend.EMAIndicator(close, window).ema_indicator()"""
+    return ewm_mean(close, 2.0 / (window + 1), window)
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """ta.momentum.RSIIndicator(close, window).rsi()"""
+    gain, loss = gains_losses(close)
+    return rsi_from_averages(ewm_mean(gain, 1.0 / window, window), ewm_mean(loss, 1.0 / window, window))
+
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    """ta.volatility.AverageTrueRange(high, low, close, window).average_true_range()"""
+    return wilder_average(true_range(high, low, close), window)
+
+
+def adx(high, low, close, window: int = 14) -> np.ndarray:
+    """
+    ta.trend.ADXIndicator(high, low, close, window).adx(): Wilder sums of TR/+DM/-DM
+    seeded with rows 1..window, DX from row `window`, ADX seeded at row 2 * window - 1
+    with the mean of the first `window` DX values and 0 before that.
+    """
+    pos, neg = directional_movement(high, low)
+    return adx_from_sums(
+        wilder_sum(true_range(high, low, close), window),
+        wilder_sum(pos, window),
+        wilder_sum(neg, window),
+        window,
+    )
+
+
+class MACDResult(NamedTuple):
+    macd: np.ndarray
+    signal: np.ndarray
+    diff: np.ndarray
+
+
+def macd_from_emas(ema_fast, ema_slow, window_sign: int) -> MACDResult:
+    line = _as_float(ema_fast) - _as_float(ema_slow)
+    signal = ema(line, window_sign)
+    return MACDResult(line, signal, line - signal)
+
+
+def macd(close, window_fast: int = 12, window_slow: int = 26, window_sign: int = 9) -> MACDResult:
+    """ta.trend.MACD(close, window_slow, window_fast, window_sign): macd(), macd_signal(), macd_diff()"""
+    return macd_from_emas(ema(close, window_fast), ema(close, window_slow), window_sign)
+
+
+class StochasticResult(NamedTuple):
+    k: np.ndarray
+    d: np.ndarray
+
+
+def stochastic_k(close, lowest, highest) -> np.ndarray:
+    lowest = _as_float(lowest)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * (_as_float(close) - lowest) / (_as_float(highest) - lowest)
+
+
+def stochastic_d(k, window: int, smooth_window: int) -> np.ndarray:
+    # pandas' rolling mean skips the warm-up NaNs of %K rather than spanning them.
+    k = _as_float(k)
+    d = np.full(k.shape[0], np.nan)
+    if k.shape[0] >= window:
+        d[window - 1 :] = rolling_mean(k[window - 1 :], smooth_window)
+    return d
+
+
+def stochastic(high, low, close, window: int = 14, smooth_window: int = 3) -> StochasticResult:
+    """ta.momentum.StochasticOscillator(high, low, close, window, smooth_window): stoch(), stoch_signal()"""
+    k = stochastic_k(close, rolling_min(low, window), rolling_max(high, window))
+    return StochasticResult(k, stochastic_d(k, window, smooth_window))
+
+
+class BollingerResult(NamedTuple):
+    mavg: np.ndarray
+    hband: np.ndarray
+    lband: np.ndarray
+    wband: np.ndarray
+    pband: np.ndarray
+
+
+def bollinger_from_moments(close, mavg, mstd, window_dev: float) -> BollingerResult:
+    close, mavg, mstd = _as_float(close), _as_float(mavg), _as_float(mstd)
+    hband = mavg + window_dev * mstd
+    lband = mavg - window_dev * mstd
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wband = ((hband - lband) / mavg) * 100
+        pband = (close - lband) / (hband - lband)
+    return BollingerResult(mavg, hband, lband, wband, pband)
+
+
+def bollinger(close, window: int = 20, window_dev: float = 2) -> BollingerResult:
+    """ta.volatility.BollingerBands(close, window, window_dev): mavg/hband/lband/wband/pband"""
+    return bollinger_from_moments(close, *rolling_moments(close, window, ddof=0), window_dev)
+
+
+def choppiness_from(tr_sum, highest, lowest, window: int) -> np.ndarray:
+    range_hl = _as_float(highest) - _as_float(lowest)
+    range_hl[range_hl == 0] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * np.log10(_as_float(tr_sum) / range_hl) / np.log10(window)
+
+
+def choppiness(high, low, close, window: int = 14) -> np.ndarray:
+    """100 * log10(sum(TR, n) / (max(high, n) - min(low, n))) / log10(n); NaN where the range is 0."""
+    tr_sum = rolling_sum(true_range(high, low, close), window)
+    return choppiness_from(tr_sum, rolling_max(high, window), rolling_min(low, window), window)
@@ -1,45 +1,32 @@
 # apps/analytics/features/pipeline.py
 import pandas as pd
 import numpy as np
-from ta.momentum import RSIIndicator
-from ta.trend import ADXIndicator, EMAIndicator
-# REMOVED: from ta.trend import ChoppinessIndicator
+from apps.analytics.features.graph import IndicatorGraph
 from apps.market_data.models import Asset
 
 class FeaturePipeline:
+    # Bump VERSION whenever a feature's definition changes: persisted incremental
+    # engine state (see features/incremental.py) is keyed by it.
+    VERSION = 1
+    FEATURE_COLUMNS = ['vol_std', 'dist_ema200', 'rsi', 'adx', 'chop', 'is_green']
+
     @staticmethod
-    def _calculate_choppiness(df: pd.DataFrame, window: int = 14) -> pd.Series:
+    def _calculate_choppiness(df: pd.DataFrame, window: int = 14, graph: IndicatorGraph = None) -> pd.Series:
         """
         Manual implementation of Choppiness Index (CHOP).
         Formula: 100 * LOG10(Sum(TR, n) / (Max(H, n) - Min(L, n))) / LOG10(n)
         """
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        # 1. True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # 2. Sum of TR
-        tr_sum = tr.rolling(window=window).sum()
-        
-        # 3. Range (Max High - Min Low)
-        max_high = high.rolling(window=window).max()
-        min_low = low.rolling(window=window).min()
-        range_hl = max_high - min_low
-        
-        # Avoid division by zero
-        range_hl = range_hl.replace(0, np.nan)
-        
-        # 4. Calculation
-        chop = 100 * np.log10(tr_sum / range_hl) / np.log10(window)
-        return chop
+        graph = graph or IndicatorGraph(df)
+        return graph.series('chop', window)
 
     @staticmethod
-    def build_feature_dataframe(symbol: str, ohlcv_df: pd.DataFrame) -> pd.DataFrame:
+    def build_feature_dataframe(
+        symbol: str, ohlcv_df: pd.DataFrame, graph: IndicatorGraph = None
+    ) -> pd.DataFrame:
+        """
+        `graph` may be an IndicatorGraph the caller already built over `ohlcv_df`;
+        the indicators it has evaluated (EMA200, RSI14, ...) are then reused.
+        """
         if ohlcv_df.empty:
             return pd.DataFrame()
 
@@ -48,24 +35,26 @@ class FeaturePipeline:
         for col in ['open', 'high', 'low', 'close', 'volume']:
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
+        graph = graph or IndicatorGraph(df)
+
         # 1. Volatility
-        df['log_ret'] = np.log(df['close'] / df['close'].shift(1))
-        df['vol_std'] = df['log_ret'].rolling(window=20).std()
+        df['log_ret'] = graph.get('log_return')
+        df['vol_std'] = graph.get('rolling_std', 'log_return', 20, 1)
         
+        close = graph.get('close')
+
         # 2. Trend Context
-        ema_200 = EMAIndicator(close=df['close'], window=200).ema_indicator()
-        df['dist_ema200'] = (df['close'] - ema_200) / ema_200
+        ema_200 = graph.get('ema', 'close', 200)
+        df['dist_ema200'] = (close - ema_200) / ema_200
         
         # 3. Momentum
-        rsi_ind = RSIIndicator(close=df['close'], window=14)
-        df['rsi'] = rsi_ind.rsi()
+        df['rsi'] = graph.get('rsi', 14)
         
         # 4. Trend Strength
-        adx_ind = ADXIndicator(high=df['high'], low=df['low'], close=df['close'], window=14)
-        df['adx'] = adx_ind.adx()
+        df['adx'] = graph.get('adx', 14)
         
         # 5. Quality (Manual Choppiness)
-        df['chop'] = FeaturePipeline._calculate_choppiness(df)
+        df['chop'] = FeaturePipeline._calculate_choppiness(df, graph=graph)
 
         # 6. Interaction
         df['is_green'] = (df['close'] > df['open']).astype(float)
@@ -74,7 +63,7 @@ class FeaturePipeline:
         df.replace([np.inf, -np.inf], np.nan, inplace=True)
         df.fillna(0, inplace=True)
         
-        final_cols = ['vol_std', 'dist_ema200', 'rsi', 'adx', 'chop', 'is_green']
+        final_cols = FeaturePipeline.FEATURE_COLUMNS
         
         for col in final_cols:
             if col not in df.columns:
@@ -0,0 +1,342 @@
+# apps/analytics/features/store.py
+"""
+Column-wise feature store: one float32 file per feature column for each
+(asset, timeframe, pipeline version), so training, prediction and backtests
+read a feature matrix without decoding one JSON `FeatureVector` per candle.
+
+    <root>/XAUUSD/H1/v1/
+        meta.json        columns, committed row count and generation, symbol/timeframe/version
+        timestamp.i8     int64 ns UTC, strictly increasing
+        <column>.f4      float32 per feature, in `meta.json` column order
+        g<N>/...         the same files for generation N > 0
+
+`append` writes the rows past the stored tail and rewrites nothing before the
+first row whose timestamp or values differ from what is stored (a forming bar
+that changed, or recomputed history). Column files are written first and
+`meta.json` last, atomically; readers only trust the committed generation and
+row count. New rows go past the committed tail of the current files, so bytes
+left by an interrupted append are ignored and cut off by the next one. A
+rewrite of committed rows copies the unchanged prefix into the files of the
+next generation instead of truncating the current ones, so an interrupted
+rewrite leaves the committed series intact.
+
+A new `FeaturePipeline.VERSION` starts a new directory, leaving the previous
+version readable for models trained on it. `FeatureVector` keeps being
+written as the JSON compatibility view.
+
+    store = get_feature_store()
+    store.append(asset, "H1", FeaturePipeline.build_feature_dataframe(asset.symbol, bars))
+    X = store.get_matrix(asset, registry.feature_list, start_utc, end_utc, timeframe="H1")
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import structlog
+from django.conf import settings
+
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.common.sqlite import file_lock
+from apps.market_data.models import Asset
+from apps.market_data.storage.base import ensure_utc
+
+logger = structlog.get_logger(__name__)
+
+FORMAT = 1
+TIMESTAMP_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f4")
+_COPY_CHUNK = 1 << 20
+
+
+class FeatureStoreError(ValueError):
+    """The frame or the request does not fit the stored series."""
+
+
+def _bound_ns(value: Optional[datetime.datetime], default: int) -> int:
+    return pd.Timestamp(ensure_utc(value)).value if value is not None else default
+
+
+class ColumnarFeatureStore:
+    """
+    Feature matrices under `root`, for one pipeline version (the current one by default).
+
+    Example:
+        store = ColumnarFeatureStore("/srv/trady2/features")
+        store.append(asset, "H1", features_df)           # only new or changed rows hit the disk
+        X = store.get_matrix(asset, ["rsi", "adx"], start_utc, end_utc)  # (rows, 2) float32
+    """
+
+    def __init__(self, root: Union[str, Path], pipeline_version: int = FeaturePipeline.VERSION) -> None:
+        self.root = Path(root)
+        self.pipeline_version = pipeline_version
+
+    def series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe / f"v{self.pipeline_version}"
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def columns(self, asset: Asset, timeframe: str) -> List[str]:
+        meta = self._read_meta(self.series_dir(asset.symbol, timeframe))
+        return list(meta["columns"]) if meta else []
+
+    def tail(self, asset: Asset, timeframe: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the last stored row, None for an empty series."""
+        path = self.series_dir(asset.symbol, timeframe)
+        if not path.exists():
+            return None
+        with _series_lock(path):
+            meta = self._read_meta(path)
+            if not meta or not meta["rows"]:
+                return None
+            last = self._read_timestamps(_data_dir(path, meta), meta["rows"], meta["rows"] - 1)
+        return pd.Timestamp(int(last[0]), tz="UTC")
+
+    def get_matrix(
+        self,
+        asset: Asset,
+        columns: Sequence[str],
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        timeframe: str = "H1",
+    ) -> np.ndarray:
+        """C-contiguous float32 array of `columns` for the rows with start <= timestamp <= end."""
+        return self._read(asset, timeframe, columns, start, end)[1]
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """The same rows as a float32 DataFrame indexed by UTC timestamp (all columns by default)."""
+        columns = list(columns) if columns is not None else self.columns(asset, timeframe)
+        timestamps, matrix = self._read(asset, timeframe, columns, start, end)
+        index = pd.DatetimeIndex(timestamps.view("datetime64[ns]"), name="timestamp").tz_localize("UTC")
+        return pd.DataFrame(matrix, index=index, columns=columns)
+
+    def _read(
+        self,
+        asset: Asset,
+        timeframe: str,
+        columns: Sequence[str],
+        start: Optional[datetime.datetime],
+        end: Optional[datetime.datetime],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        path = self.series_dir(asset.symbol, timeframe)
+        columns = list(columns)
+        empty = np.empty(0, dtype=TIMESTAMP_DTYPE), np.empty((0, len(columns)), dtype=VALUE_DTYPE)
+        if not path.exists():
+            return empty
+
+        with _series_lock(path):
+            meta = self._read_meta(path)
+            if meta is None:
+                return empty
+            rows = meta["rows"]
+            missing = [col for col in columns if col not in meta["columns"]]
+            if missing:
+                raise FeatureStoreError(
+                    f"{asset.symbol} {timeframe} v{self.pipeline_version} has no columns {missing}."
+                )
+
+            data_dir = _data_dir(path, meta)
+            timestamps = self._read_timestamps(data_dir, rows)
+            lo = int(np.searchsorted(timestamps, _bound_ns(start, np.iinfo(np.int64).min), side="left"))
+            hi = int(np.searchsorted(timestamps, _bound_ns(end, np.iinfo(np.int64).max), side="right"))
+            count = max(hi - lo, 0)
+
+            matrix = np.empty((count, len(columns)), dtype=VALUE_DTYPE)
+            for j, col in enumerate(columns):
+                matrix[:, j] = np.fromfile(
+                    data_dir / f"{col}.f4", dtype=VALUE_DTYPE, count=count, offset=lo * VALUE_DTYPE.itemsize
+                )
+            return np.array(timestamps[lo : lo + count]), matrix
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def append(self, asset: Asset, timeframe: str, features_df: pd.DataFrame) -> int:
+        """
+        Store `features_df` (indexed by timestamp) and return the number of rows
+        written. Rows already stored with identical values are skipped; from the
+        first new or differing row on, the stored series is replaced by the frame.
+        """
+        if features_df is None or features_df.empty:
+            return 0
+        frame = features_df.sort_index()
+        index = pd.DatetimeIndex(frame.index)
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        if index.has_duplicates:
+            raise FeatureStoreError("Feature frame has duplicate timestamps.")
+        new_ts = index.as_unit("ns").asi8
+
+        path = self.series_dir(asset.symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        with _series_lock(path):
+            meta = self._read_meta(path) or {
+                "format": FORMAT,
+                "symbol": asset.symbol,
+                "timeframe": timeframe,
+                "pipeline_version": self.pipeline_version,
+                "columns": [str(col) for col in frame.columns],
+                "rows": 0,
+            }
+            columns = meta["columns"]
+            missing = [col for col in columns if col not in frame.columns]
+            if missing:
+                raise FeatureStoreError(
+                    f"Feature frame lacks stored columns {missing} of {asset.symbol} {timeframe} "
+                    f"v{self.pipeline_version}."
+                )
+            values = frame[columns].to_numpy(dtype=VALUE_DTYPE)
+
+            rows = meta["rows"]
+            source = _data_dir(path, meta)
+            stored_ts = self._read_timestamps(source, rows)
+            pos = int(np.searchsorted(stored_ts, new_ts[0], side="left"))
+            same = self._matching_prefix(source, columns, stored_ts, pos, new_ts, values)
+            cut = pos + same
+
+            written = len(new_ts) - same
+            if written == 0:
+                return 0  # everything is stored already; later rows stay
+
+            generation = meta.get("generation", 0)
+            if cut < rows:
+                # Committed rows change: build the next generation, the current one stays readable.
+                generation += 1
+                target = path / f"g{generation}"
+                shutil.rmtree(target, ignore_errors=True)  # left by an interrupted rewrite
+                target.mkdir()
+            else:
+                target = source
+            self._write_from(source, target, "timestamp.i8", cut * TIMESTAMP_DTYPE.itemsize, new_ts[same:])
+            for j, col in enumerate(columns):
+                self._write_from(source, target, f"{col}.f4", cut * VALUE_DTYPE.itemsize, values[same:, j])
+            meta["rows"] = cut + written
+            meta["generation"] = generation
+            self._write_meta(path, meta)
+            if target != source:
+                _discard_generations(path, columns, keep=generation)
+
+        logger.info(
+            "Appended feature rows",
+            symbol=asset.symbol,
+            timeframe=timeframe,
+            pipeline_version=self.pipeline_version,
+            rewritten=rows - cut,
+            written=written,
+        )
+        return written
+
+    def _matching_prefix(
+        self,
+        data_dir: Path,
+        columns: Sequence[str],
+        stored_ts: np.ndarray,
+        pos: int,
+        new_ts: np.ndarray,
+        values: np.ndarray,
+    ) -> int:
+        """Number of leading frame rows already stored, timestamps and values alike, from row `pos`."""
+        overlap = min(len(stored_ts) - pos, len(new_ts))
+        if overlap <= 0:
+            return 0
+        equal = stored_ts[pos : pos + overlap] == new_ts[:overlap]
+        for j, col in enumerate(columns):
+            stored = np.fromfile(
+                data_dir / f"{col}.f4", dtype=VALUE_DTYPE, count=overlap, offset=pos * VALUE_DTYPE.itemsize
+            )
+            fresh = values[:overlap, j]
+            # Bitwise comparison: NaN == NaN, and -0.0 / 0.0 are rewritten like any other change.
+            equal &= stored.view(np.uint32) == fresh.view(np.uint32)
+        mismatch = np.flatnonzero(~equal)
+        return int(mismatch[0]) if mismatch.size else overlap
+
+    @staticmethod
+    def _write_from(source: Path, target: Path, name: str, offset: int, data: np.ndarray) -> None:
+        """Write `data` at byte `offset` of `target/name`; a new target first gets that prefix of `source`."""
+        file_path = target / name
+        with open(file_path, "r+b" if file_path.exists() else "w+b") as fh:
+            if source == target:
+                fh.truncate(offset)  # only bytes past the committed tail
+                fh.seek(offset)
+            else:
+                fh.truncate(0)
+                with open(source / name, "rb") as src:
+                    remaining = offset
+                    while remaining:
+                        chunk = src.read(min(remaining, _COPY_CHUNK))
+                        if not chunk:
+                            raise FeatureStoreError(f"{source / name} is shorter than its committed rows.")
+                        fh.write(chunk)
+                        remaining -= len(chunk)
+            fh.write(np.ascontiguousarray(data).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    @staticmethod
+    def _read_timestamps(data_dir: Path, rows: int, start: int = 0) -> np.ndarray:
+        if rows <= start:
+            return np.empty(0, dtype=TIMESTAMP_DTYPE)
+        offset = start * TIMESTAMP_DTYPE.itemsize
+        return np.fromfile(data_dir / "timestamp.i8", dtype=TIMESTAMP_DTYPE, count=rows - start, offset=offset)
+
+    @staticmethod
+    def _read_meta(path: Path) -> Optional[Dict]:
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+        except FileNotFoundError:
+            return None
+        if meta.get("format") != FORMAT:
+            raise FeatureStoreError(f"{path} is not a format {FORMAT} feature store.")
+        return meta
+
+    @staticmethod
+    def _write_meta(path: Path, meta: Dict) -> None:
+        tmp = path / f".meta.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / "meta.json")
+
+
+def _data_dir(path: Path, meta: Dict) -> Path:
+    """Directory holding the column files of the committed generation."""
+    generation = meta.get("generation", 0)
+    return path / f"g{generation}" if generation else path
+
+
+def _discard_generations(path: Path, columns: Sequence[str], keep: int) -> None:
+    """Delete the column files of every generation but `keep`, once `keep` is committed."""
+    for stale in path.glob("g*"):
+        if stale.is_dir() and stale.name != f"g{keep}":
+            shutil.rmtree(stale, ignore_errors=True)
+    if keep:
+        for name in ["timestamp.i8", *(f"{col}.f4" for col in columns)]:
+            (path / name).unlink(missing_ok=True)
+
+
+def _series_lock(path: Path):
+    """Appends extend the tail in place, so readers and writers of one series take turns."""
+    return file_lock(f"{path}.lock")
+
+
+def feature_store_enabled() -> bool:
+    return settings.ANALYTICS_CONFIG.get("FEATURE_STORE_ENABLED", False)
+
+
+def get_feature_store(pipeline_version: int = FeaturePipeline.VERSION) -> ColumnarFeatureStore:
+    """The store under ANALYTICS_CONFIG["FEATURE_STORE_DIR"]."""
+    return ColumnarFeatureStore(
+        settings.ANALYTICS_CONFIG.get("FEATURE_STORE_DIR", "data/feature_store"), pipeline_version
+    )
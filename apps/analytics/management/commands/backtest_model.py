@@ -1,13 +1,17 @@
 # apps/analytics/management/commands/backtest_model.py
+import datetime
+
 import yaml
 import pandas as pd
 import structlog
 from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
 
 from apps.mlops.services import get_model_by_version
 from apps.analytics.models.train import load_training_data
 from apps.analytics.backtesting.run import run_vectorized_backtest, generate_report
-from apps.market_data.models import Asset, OHLCV
+from apps.market_data.models import Asset
+from apps.market_data.storage.backends import get_ohlcv_store
 
 logger = structlog.get_logger(__name__)
 
@@ -48,10 +52,10 @@ class Command(BaseCommand):
         asset = Asset.objects.get(symbol=train_cfg['asset_symbol'])
 
         self.stdout.write("Loading all OHLCV data for backtest period...")
-        all_ohlcv = OHLCV.objects.filter(asset=asset, timeframe=train_cfg['timeframe']).order_by('timestamp')
-        prices_df = pd.DataFrame.from_records(all_ohlcv.values('timestamp', 'open', 'high', 'low', 'close'))
-        prices_df['timestamp'] = pd.to_datetime(prices_df['timestamp'], utc=True)
-        prices_df = prices_df.set_index('timestamp')
+        start_utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        end_utc = timezone.now() + datetime.timedelta(days=1)
+        prices_df = get_ohlcv_store().load(asset, train_cfg['timeframe'], start_utc, end_utc)
+        prices_df = prices_df[['open', 'high', 'low', 'close']]
 
         # --- **بداية منطقة الإصلاح الحرجة** ---
         # تحويل أنواع البيانات من Decimal (القادمة من قاعدة البيانات) إلى float (المستخدمة في الحسابات).
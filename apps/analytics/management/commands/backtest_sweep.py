@@ -1,4 +1,6 @@
 # apps/analytics/management/commands/backtest_sweep.py
+import datetime
+
 import yaml
 import pandas as pd
 import numpy as np
@@ -7,7 +9,8 @@ from django.core.management.base import BaseCommand, CommandParser
 from django.utils import timezone
 from apps.mlops.services import get_model_by_version
 from apps.analytics.backtesting.run import run_vectorized_backtest
-from apps.market_data.models import Asset, OHLCV
+from apps.market_data.models import Asset
+from apps.market_data.storage.backends import get_ohlcv_store
 from apps.analytics.models.train import load_training_data
 
 logger = structlog.get_logger(__name__)
@@ -48,15 +51,14 @@ class Command(BaseCommand):
 
         train_cfg = config['training']
         asset = Asset.objects.get(symbol=train_cfg['asset_symbol'])
-        all_ohlcv = OHLCV.objects.filter(asset=asset, timeframe=train_cfg['timeframe']).order_by('timestamp')
-        if not all_ohlcv.exists():
+        start_utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        end_utc = timezone.now() + datetime.timedelta(days=1)
+        prices_df = get_ohlcv_store().load(asset, train_cfg['timeframe'], start_utc, end_utc)
+        if prices_df.empty:
             self.stderr.write(self.style.ERROR("No OHLCV data found for the asset/timeframe."))
             return
 
-        prices_df = pd.DataFrame.from_records(all_ohlcv.values('timestamp', 'open', 'high', 'low', 'close'))
-        prices_df['timestamp'] = pd.to_datetime(prices_df['timestamp'], utc=True)
-        prices_df = prices_df.set_index('timestamp')
-        prices_df[['open', 'high', 'low', 'close']] = prices_df[['open', 'high', 'low', 'close']].apply(pd.to_numeric)
+        prices_df = prices_df[['open', 'high', 'low', 'close']]
 
         X, _ = load_training_data(asset, train_cfg['timeframe'])
 
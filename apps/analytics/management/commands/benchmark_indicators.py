@@ -0,0 +1,117 @@
+# apps/analytics/management/commands/benchmark_indicators.py
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandParser
+from ta.momentum import RSIIndicator, StochasticOscillator
+from ta.trend import ADXIndicator, EMAIndicator, MACD
+from ta.volatility import AverageTrueRange, BollingerBands
+
+from apps.analytics.features import indicators
+
+# name -> (ta implementation, kernel, takes a window)
+INDICATORS = {
+    "ema": (
+        lambda df, w: EMAIndicator(df["close"], w).ema_indicator(),
+        lambda a, w: indicators.ema(a["close"], w),
+        True,
+    ),
+    "rsi": (
+        lambda df, w: RSIIndicator(df["close"], w).rsi(),
+        lambda a, w: indicators.rsi(a["close"], w),
+        True,
+    ),
+    "atr": (
+        lambda df, w: AverageTrueRange(df["high"], df["low"], df["close"], w).average_true_range(),
+        lambda a, w: indicators.atr(a["high"], a["low"], a["close"], w),
+        True,
+    ),
+    "adx": (
+        lambda df, w: ADXIndicator(df["high"], df["low"], df["close"], w).adx(),
+        lambda a, w: indicators.adx(a["high"], a["low"], a["close"], w),
+        True,
+    ),
+    "bollinger": (
+        lambda df, w: BollingerBands(df["close"], w, 2).bollinger_pband(),
+        lambda a, w: indicators.bollinger(a["close"], w, 2).pband,
+        True,
+    ),
+    "stochastic": (
+        lambda df, w: StochasticOscillator(df["high"], df["low"], df["close"], w, 3).stoch_signal(),
+        lambda a, w: indicators.stochastic(a["high"], a["low"], a["close"], w, 3).d,
+        True,
+    ),
+    "macd": (
+        lambda df, w: MACD(df["close"], window_slow=26, window_fast=12, window_sign=9).macd_diff(),
+        lambda a, w: indicators.macd(a["close"], 12, 26, 9).diff,
+        False,
+    ),
+}
+
+
+def synthetic_bars(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 2, rows))
+    wick = rng.uniform(0, 3, (2, rows))
+    return pd.DataFrame(
+        {"high": close + wick[0], "low": close - wick[1], "close": close},
+        index=pd.date_range("2000-01-01", periods=rows, freq="h", tz="UTC"),
+    )
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the NumPy indicator kernels (apps.analytics.features.indicators) against the `ta` "
+        "package per indicator, window and series length, with the largest relative difference between them."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+        parser.add_argument("--windows", nargs="+", type=int, default=[14, 50, 200])
+        parser.add_argument("--indicators", nargs="+", choices=sorted(INDICATORS), default=list(INDICATORS))
+        parser.add_argument("--repeat", type=int, default=3, help="Timings are the best of this many runs.")
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"numba: {'on' if indicators.NUMBA_AVAILABLE else 'off (scipy.signal.lfilter)'}")
+        self.stdout.write(
+            f"{'indicator':<11} {'window':>6} {'rows':>9} {'ta ms':>10} {'numpy ms':>10} {'speedup':>8} "
+            f"{'max rel diff':>12}"
+        )
+
+        for rows in options["rows"]:
+            df = synthetic_bars(rows)
+            arrays = {col: df[col].to_numpy() for col in df.columns}
+            for name in options["indicators"]:
+                ta_fn, kernel, windowed = INDICATORS[name]
+                windows: List[int] = options["windows"] if windowed else [0]
+                for window in windows:
+                    if 2 * window > rows:
+                        continue
+                    expected = ta_fn(df, window).to_numpy(dtype=float)
+                    result = kernel(arrays, window)  # also the warm-up (numba compilation)
+                    if not np.array_equal(np.isnan(result), np.isnan(expected)):
+                        self.stderr.write(f"{name} window={window} rows={rows}: NaN rows differ from ta")
+                    both = ~np.isnan(result) & ~np.isnan(expected)
+                    max_rel = np.max(
+                        np.abs(result[both] - expected[both]) / np.maximum(np.abs(expected[both]), 1e-12),
+                        initial=0.0,
+                    )
+
+                    ta_time = best_of(lambda: ta_fn(df, window), options["repeat"])
+                    np_time = best_of(lambda: kernel(arrays, window), options["repeat"])
+                    self.stdout.write(
+                        f"{name:<11} {window or '-':>6} {rows:>9,} {ta_time * 1e3:>10.2f} "
+                        f"{np_time * 1e3:>10.2f} {ta_time / np_time if np_time else float('inf'):>7.1f}x "
+                        f"{max_rel:>12.1e}"
+                    )
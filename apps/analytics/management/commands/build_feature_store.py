@@ -0,0 +1,47 @@
+# apps/analytics/management/commands/build_feature_store.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.features.store import get_feature_store
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.backends import get_ohlcv_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Featurises stored OHLCV series with the current FeaturePipeline and appends them to the columnar "
+        "feature store (ANALYTICS_CONFIG['FEATURE_STORE_DIR']). Unchanged rows are not rewritten."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--symbol", type=str, help="Only this symbol (default: all assets).")
+        parser.add_argument("--timeframe", type=str, help="Only this timeframe (default: all stored).")
+
+    def handle(self, *args, **options) -> None:
+        source = get_ohlcv_store(shared_cache=False)
+        store = get_feature_store()
+
+        assets = Asset.objects.all()
+        if options["symbol"]:
+            assets = assets.filter(symbol=options["symbol"])
+
+        start_utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        end_utc = timezone.now() + datetime.timedelta(days=1)
+        for asset in assets:
+            timeframes = OHLCV.objects.filter(asset=asset).values_list("timeframe", flat=True).distinct()
+            if options["timeframe"]:
+                timeframes = [tf for tf in timeframes if tf == options["timeframe"]]
+
+            for timeframe in timeframes:
+                bars = source.load(asset, timeframe, start_utc, end_utc)
+                features = FeaturePipeline.build_feature_dataframe(asset.symbol, bars)
+                written = store.append(asset, timeframe, features)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Features {asset.symbol} {timeframe} v{store.pipeline_version}: "
+                        f"{len(features)} rows, {written} written -> {store.series_dir(asset.symbol, timeframe)}"
+                    )
+                )
@@ -2,7 +2,7 @@
 import pandas as pd
 import lightgbm as lgb
 from django.core.management.base import BaseCommand
-from apps.analytics.models.train import load_training_data, create_triple_barrier_target
+from apps.analytics.models.train import load_aligned_data, create_triple_barrier_target
 from apps.market_data.models import Asset
 from datetime import datetime, timezone
 from sklearn.metrics import precision_score, roc_auc_score
@@ -13,6 +13,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--symbol', type=str, default='EURUSD')
         parser.add_argument('--timeframe', type=str, default='H1')
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
 
     def handle(self, *args, **options):
         symbol = options['symbol']
@@ -28,7 +32,7 @@ class Command(BaseCommand):
         
         # 1. Load Data (Using the new loader with 'vol_std')
         self.stdout.write("Loading data and computing survivor features...")
-        X, prices_df = load_training_data(asset, tf)
+        X, prices_df = load_aligned_data(asset, tf, from_snapshot=options['from_snapshot'])
         
         if X.empty:
             self.stdout.write(self.style.ERROR("No data found. Please ingest historical data."))
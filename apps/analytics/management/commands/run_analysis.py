@@ -5,8 +5,8 @@ from django.core.management.base import BaseCommand, CommandParser
 from django.db import transaction
 import yaml
 
-from apps.analytics.features.pipeline import FeaturePipeline
-from apps.analytics.services import OHLCVLoader
+from apps.analytics.features.cache import memoised_feature_dataframe
+from apps.analytics.services import OHLCVLoader, bulk_insert_feature_vectors
 from apps.market_data.models import Asset
 from apps.trading_core.models import FeatureVector
 
@@ -61,13 +61,13 @@ class Command(BaseCommand):
                 continue
             
             self.stdout.write(f"\n--- Building features for {period} period ({len(ohlcv_data)} records) ---")
-            features_df = FeaturePipeline.build_feature_dataframe(asset.symbol, ohlcv_data)
+            features_df = memoised_feature_dataframe(asset.symbol, ohlcv_data)
 
             self.stdout.write("Saving feature vectors to the database...")
             new_feature_vectors = [
                 FeatureVector(asset=asset, timestamp=ts, features=row)
                 for ts, row in features_df.to_dict('index').items()
             ]
-            FeatureVector.objects.bulk_create(new_feature_vectors, batch_size=500)
+            bulk_insert_feature_vectors(new_feature_vectors, batch_size=500)
             self.stdout.write(self.style.SUCCESS(f"Saved {len(new_feature_vectors)} feature vectors for {period} period."))
             
\ No newline at end of file
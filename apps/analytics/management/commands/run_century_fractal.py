@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 from django.core.management.base import BaseCommand
 from apps.market_data.services import ingest_ohlcv_data
-from apps.market_data.models import OHLCV, Asset
+from apps.market_data.models import Asset
+from apps.analytics.services import OHLCVLoader
 from apps.common.enums import Timeframe
 from ta.trend import EMAIndicator, ADXIndicator
 from ta.momentum import RSIIndicator
@@ -14,6 +15,12 @@ import time
 class Command(BaseCommand):
     help = "The Century Test: Robust H1 Fractal Strategy (2015-2024)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
+
     def handle(self, *args, **options):
         symbol = 'XAUUSD'
         tf_str = 'H1'
@@ -34,36 +41,32 @@ class Command(BaseCommand):
         self.stdout.write("-" * 100)
 
         for era_name, (start, end) in eras.items():
-            self.run_era_test(symbol, tf_str, era_name, start, end)
+            self.run_era_test(symbol, tf_str, era_name, start, end, options['from_snapshot'])
 
-    def run_era_test(self, symbol, tf_str, era_name, start_str, end_str):
+    def run_era_test(self, symbol, tf_str, era_name, start_str, end_str, from_snapshot=False):
         start_dt = datetime.strptime(start_str, "%Y-%m-%d").replace(tzinfo=pytz.UTC)
         end_dt = datetime.strptime(end_str, "%Y-%m-%d").replace(tzinfo=pytz.UTC)
 
-        # 1. Ingest Data (Robust)
-        try:
-            ingest_ohlcv_data(symbol, Timeframe(tf_str), start_dt, end_dt)
-            time.sleep(1) # Allow DB commit
-        except Exception:
-            pass 
+        # 1. Ingest Data (Robust); a snapshot is a frozen export, nothing to ingest
+        if not from_snapshot:
+            try:
+                ingest_ohlcv_data(symbol, Timeframe(tf_str), start_dt, end_dt)
+                time.sleep(1) # Allow DB commit
+            except Exception:
+                pass 
 
         # 2. Load Data
-        qs = OHLCV.objects.filter(
-            asset__symbol=symbol, 
-            timeframe=tf_str, 
-            timestamp__range=(start_dt, end_dt)
-        ).order_by('timestamp')
-        
-        df = pd.DataFrame.from_records(qs.values('timestamp', 'open', 'high', 'low', 'close'))
+        asset = Asset.objects.filter(symbol=symbol).first()
+        loader = OHLCVLoader(from_snapshot=from_snapshot)
+        try:
+            df = loader.load_dataframe(asset, tf_str, start_dt, end_dt) if asset else pd.DataFrame()
+        except ValueError:
+            df = pd.DataFrame()
 
         if len(df) < 500:
             self.stdout.write(f"{era_name:<15} | NO DATA (Found {len(df)})")
             return
 
-        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
-        df.set_index('timestamp', inplace=True)
-        for c in ['open', 'high', 'low', 'close']: df[c] = pd.to_numeric(df[c])
-
         # 3. Strategy Logic (H1 as the Fractal Unit)
         # Using H1 to emulate the "Macro" trend and "Micro" entry simultaneously
         
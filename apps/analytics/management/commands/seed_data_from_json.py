@@ -1,31 +1,47 @@
 # apps/analytics/management/commands/seed_data_from_json.py
 import json
-from decimal import Decimal
-from django.core.management.base import BaseCommand, CommandParser
+import os
+from pathlib import Path
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError, CommandParser
 from django.db import transaction
-from django.utils.dateparse import parse_datetime
-from apps.market_data.models import Asset, OHLCV
+
+from apps.analytics.services import bulk_insert_feature_vectors
+from apps.common.sqlite import single_writer
+from apps.market_data.coverage import record_coverage
+from apps.market_data.models import Asset
+from apps.market_data.storage.bulk_writer import write_ohlcv_bars
+from apps.market_data.streaming import iter_seed_batches, read_seed_header
 from apps.trading_core.models import FeatureVector
 
+
 class Command(BaseCommand):
-    help = "Seeds the database with OHLCV and FeatureVector data from a provided JSON file."
+    help = (
+        "Seeds the database with OHLCV and FeatureVector data from a provided JSON file "
+        "(optionally .gz/.zst compressed), streaming rows in committed batches."
+    )
 
     def add_arguments(self, parser: CommandParser):
         parser.add_argument("json_file", type=str, help="Path to the JSON data file.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows inserted and committed per batch.")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows committed by a previous interrupted run (tracked in <json_file>.progress).",
+        )
+        parser.add_argument(
+            "--skip-features", action="store_true", help="Only seed OHLCV rows, not the basic FeatureVectors."
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         file_path = options["json_file"]
+        batch_size = options["batch_size"]
+        progress_path = Path(f"{file_path}.progress")
         self.stdout.write(f"Loading data from {file_path}...")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        symbol = data.get("symbol")
-        timeframe = data.get("timeframe")
-        ohlcv_data = data.get("ohlcv", [])
-
-        if not all([symbol, timeframe, ohlcv_data]):
+        symbol, timeframe = read_seed_header(file_path)
+        if not all([symbol, timeframe]):
             self.stderr.write(self.style.ERROR("JSON file is missing symbol, timeframe, or ohlcv data."))
             return
 
@@ -33,38 +49,63 @@ class Command(BaseCommand):
         if created:
             self.stdout.write(self.style.SUCCESS(f"Created new asset: {symbol}"))
 
-        ohlcv_records = []
-        feature_records = []
-        for row in ohlcv_data:
-            ts = parse_datetime(row['time'])
-            ohlcv_records.append(
-                OHLCV(
-                    asset=asset,
-                    timeframe=timeframe,
-                    timestamp=ts,
-                    open=Decimal(row['open']),
-                    high=Decimal(row['high']),
-                    low=Decimal(row['low']),
-                    close=Decimal(row['close']),
-                    volume=int(row['volume'])
-                )
-            )
-            # Create a simplified FeatureVector from OHLCV for seeding purposes
-            feature_records.append(
-                FeatureVector(
-                    asset=asset,
-                    timestamp=ts,
-                    features={
-                        "open": float(row['open']),
-                        "high": float(row['high']),
-                        "low": float(row['low']),
-                        # NOTE: "close" is intentionally omitted here to prevent the overlap error
-                    }
-                )
+        committed = 0
+        if options["resume"] and progress_path.exists():
+            committed = json.loads(progress_path.read_text()).get("rows", 0)
+            self.stdout.write(f"Resuming after {committed} already committed rows.")
+
+        ohlcv_count = feature_count = 0
+        for batch in iter_seed_batches(file_path, batch_size, skip=committed):
+            df = pd.DataFrame.from_records(batch).rename(columns={"time": "timestamp"})
+            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+            df = df.set_index("timestamp")
+
+            # One transaction per batch: a failure loses at most one batch, and --resume picks up here.
+            with single_writer(), transaction.atomic():
+                result = write_ohlcv_bars(asset, timeframe, df, upsert=False, batch_size=batch_size)
+                record_coverage(asset, timeframe, df.index)
+                ohlcv_count += result.inserted
+                if not options["skip_features"]:
+                    feature_count += self._seed_features(asset, df, batch_size)
+
+            committed += len(batch)
+            self._save_progress(progress_path, committed)
+            self.stdout.write(f"  committed {committed} rows", ending="\r")
+
+        if committed == 0:
+            self.stderr.write(self.style.ERROR("JSON file is missing symbol, timeframe, or ohlcv data."))
+            return
+
+        progress_path.unlink(missing_ok=True)
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"Seeded {ohlcv_count} OHLCV records."))
+        if not options["skip_features"]:
+            self.stdout.write(self.style.SUCCESS(f"Seeded {feature_count} basic FeatureVector records."))
+
+    @staticmethod
+    def _seed_features(asset: Asset, df: pd.DataFrame, batch_size: int) -> int:
+        # Create a simplified FeatureVector from OHLCV for seeding purposes
+        prices = df[["open", "high", "low"]].astype(float)
+        records = [
+            FeatureVector(
+                asset=asset,
+                timestamp=ts,
+                features={
+                    "open": o,
+                    "high": h,
+                    "low": l,
+                    # NOTE: "close" is intentionally omitted here to prevent the overlap error
+                },
             )
-        
-        OHLCV.objects.bulk_create(ohlcv_records, ignore_conflicts=True)
-        self.stdout.write(self.style.SUCCESS(f"Seeded {len(ohlcv_records)} OHLCV records."))
-        
-        FeatureVector.objects.bulk_create(feature_records, ignore_conflicts=True)
-        self.stdout.write(self.style.SUCCESS(f"Seeded {len(feature_records)} basic FeatureVector records."))
\ No newline at end of file
+            for ts, (o, h, l) in zip(df.index.to_pydatetime(), prices.itertuples(index=False, name=None))
+        ]
+        return bulk_insert_feature_vectors(records, batch_size=batch_size, ignore_conflicts=True)
+
+    @staticmethod
+    def _save_progress(progress_path: Path, rows: int) -> None:
+        tmp_path = progress_path.with_name(progress_path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps({"rows": rows}))
+            os.replace(tmp_path, progress_path)
+        except OSError as exc:
+            raise CommandError(f"Cannot record seeding progress in {progress_path}: {exc}")
@@ -15,6 +15,10 @@ class Command(BaseCommand):
         parser.add_argument('--timeframe', type=str, default='H1')
         parser.add_argument('--capital', type=float, default=10000.0)
         parser.add_argument('--stress', action='store_true', help="Double Costs Mode")
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
 
     def handle(self, *args, **options):
         symbol = options['symbol']
@@ -45,7 +49,7 @@ class Command(BaseCommand):
         # 3. Load Data via Unified Pipeline
         try:
             asset = Asset.objects.get(symbol=symbol)
-            X, prices_df = load_aligned_data(asset, options['timeframe'])
+            X, prices_df = load_aligned_data(asset, options['timeframe'], from_snapshot=options['from_snapshot'])
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Data Load Error: {e}"))
             return
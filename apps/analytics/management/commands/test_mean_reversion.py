@@ -17,6 +17,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--symbol', type=str, default='XAUUSD')
         parser.add_argument('--timeframe', type=str, default='H1')
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
 
     def handle(self, *args, **options):
         symbol = options['symbol']
@@ -41,7 +45,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"Asset {symbol} not found."))
             return
 
-        loader = OHLCVLoader()
+        loader = OHLCVLoader(from_snapshot=options['from_snapshot'])
 
         for era_name, (start, end) in eras.items():
             start_dt = datetime.strptime(start, "%Y-%m-%d").replace(tzinfo=pytz.UTC)
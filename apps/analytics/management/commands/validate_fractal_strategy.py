@@ -11,6 +11,12 @@ from datetime import datetime, timezone
 class Command(BaseCommand):
     help = "Fractal Strategy Test: H4 Trend + M15 Entry"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
+
     def handle(self, *args, **options):
         symbol = 'XAUUSD'
         
@@ -22,7 +28,7 @@ class Command(BaseCommand):
 
         # 1. Load Data
         asset = Asset.objects.get(symbol=symbol)
-        loader = OHLCVLoader()
+        loader = OHLCVLoader(from_snapshot=options['from_snapshot'])
         
         # Load Macro (H4) & Micro (M15)
         # Load ample history to allow indicators to warm up
@@ -12,6 +12,12 @@ import pytz
 class Command(BaseCommand):
     help = "The Final Pivot: H4/D1 Macro Trend Following (Long Only)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
+
     def handle(self, *args, **options):
         symbol = 'XAUUSD'
         
@@ -29,7 +35,7 @@ class Command(BaseCommand):
         self.stdout.write("-" * 100)
 
         asset = Asset.objects.get(symbol=symbol)
-        loader = OHLCVLoader()
+        loader = OHLCVLoader(from_snapshot=options['from_snapshot'])
 
         for era_name, (start, end) in eras.items():
             start_dt = datetime.strptime(start, "%Y-%m-%d").replace(tzinfo=pytz.UTC)
@@ -14,6 +14,12 @@ from itertools import product
 class Command(BaseCommand):
     help = "Governance Protocol: Sensitivity Matrix & Stress Test"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
+
     def handle(self, *args, **options):
         symbol = 'XAUUSD'
         
@@ -42,7 +48,7 @@ class Command(BaseCommand):
         self.stdout.write("-" * 100)
 
         asset = Asset.objects.get(symbol=symbol)
-        loader = OHLCVLoader()
+        loader = OHLCVLoader(from_snapshot=options['from_snapshot'])
 
         # Load Full Data once to optimize
         full_start = datetime(2019, 1, 1, tzinfo=pytz.UTC)
@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 from django.core.management.base import BaseCommand
 from apps.market_data.services import ingest_ohlcv_data
-from apps.market_data.models import OHLCV, Asset
+from apps.market_data.models import Asset
+from apps.market_data.panel import load_panel
 from apps.common.enums import Timeframe
 from apps.analytics.quant.pairs_trading import PairsTradingEngine
 from datetime import datetime
@@ -31,10 +32,7 @@ class Command(BaseCommand):
         self.stdout.write("-" * 100)
 
         # Ensure Assets Exist
-        try:
-            asset_y = Asset.objects.get(symbol=asset_y_sym)
-            asset_x = Asset.objects.get(symbol=asset_x_sym)
-        except Asset.DoesNotExist:
+        if Asset.objects.filter(symbol__in=[asset_y_sym, asset_x_sym]).count() != 2:
             self.stdout.write(self.style.ERROR("Assets not found. Run ingestion first."))
             return
 
@@ -48,30 +46,16 @@ class Command(BaseCommand):
                 ingest_ohlcv_data(asset_x_sym, Timeframe(tf_str), start_dt, end_dt)
             except: pass
 
-            # 2. Load Data
-            q_y = OHLCV.objects.filter(asset=asset_y, timeframe=tf_str, timestamp__range=(start_dt, end_dt)).order_by('timestamp')
-            q_x = OHLCV.objects.filter(asset=asset_x, timeframe=tf_str, timestamp__range=(start_dt, end_dt)).order_by('timestamp')
+            # 2. Load Data (both legs in one query, aligned on timestamp)
+            panel = load_panel([asset_y_sym, asset_x_sym], tf_str, start_dt, end_dt, fields=['close'], align='outer')
+            counts = panel['close'].count()
             
-            df_y = pd.DataFrame.from_records(q_y.values('timestamp', 'close'))
-            df_x = pd.DataFrame.from_records(q_x.values('timestamp', 'close'))
-            
-            if len(df_y) < 500 or len(df_x) < 500:
+            if counts[asset_y_sym] < 500 or counts[asset_x_sym] < 500:
                 self.stdout.write(f"{era_name:<15} | NO DATA (Count mismatch)")
                 continue
                 
-            # Align Time Series & Convert Types
-            df_y['timestamp'] = pd.to_datetime(df_y['timestamp'], utc=True)
-            df_y.set_index('timestamp', inplace=True)
-            # FIX: Explicit float conversion from Decimal
-            df_y['close'] = df_y['close'].astype(float)
-            
-            df_x['timestamp'] = pd.to_datetime(df_x['timestamp'], utc=True)
-            df_x.set_index('timestamp', inplace=True)
-            # FIX: Explicit float conversion from Decimal
-            df_x['close'] = df_x['close'].astype(float)
-            
             # 3. Math Engine
-            data = PairsTradingEngine.get_aligned_data(df_y, df_x)
+            data = PairsTradingEngine.get_aligned_panel_data(panel, asset_y_sym, asset_x_sym)
             
             if data.empty:
                 self.stdout.write(f"{era_name:<15} | NO DATA (Alignment failed)")
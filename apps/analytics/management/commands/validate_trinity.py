@@ -5,7 +5,7 @@ import lightgbm as lgb
 from django.core.management.base import BaseCommand
 from apps.analytics.models.train import load_training_data, create_triple_barrier_target
 from apps.market_data.models import Asset
-from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.features.cache import memoised_feature_dataframe
 from apps.market_data.services import OHLCVLoader
 from datetime import datetime, timezone
 from ta.trend import ADXIndicator, EMAIndicator
@@ -49,7 +49,7 @@ class Command(BaseCommand):
 
             # 2. Build Features (Regime Aware Pipeline)
             # This ensures we have vol_std and other ML features ready
-            X = FeaturePipeline.build_feature_dataframe(symbol, prices_df)
+            X = memoised_feature_dataframe(symbol, prices_df)
             
             # --- 3. Signal Generation (Vectorized Logic for Pullback) ---
             # Replicating trend_pullback_signal logic globally
@@ -16,6 +16,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--symbol', type=str, default='XAUUSD')
         parser.add_argument('--timeframe', type=str, default='H1')
+        parser.add_argument(
+            '--from-snapshot', action='store_true',
+            help="Read bars from the snapshot_ohlcv export instead of the database.",
+        )
 
     def handle(self, *args, **options):
         # Asset Config: Costs in raw price units (approximate)
@@ -39,17 +43,17 @@ class Command(BaseCommand):
 
         # Run only for the requested symbol if specified in arguments (to match your workflow)
         if target_symbol in assets_config:
-             self.run_strict_test(target_symbol, target_tf, assets_config[target_symbol])
+             self.run_strict_test(target_symbol, target_tf, assets_config[target_symbol], options['from_snapshot'])
         else:
              # Default fallback if symbol not in map, assume Gold-like costs or fail
              self.stdout.write(self.style.WARNING(f"Symbol {target_symbol} not in config map. Using XAUUSD costs."))
-             self.run_strict_test(target_symbol, target_tf, assets_config['XAUUSD'])
+             self.run_strict_test(target_symbol, target_tf, assets_config['XAUUSD'], options['from_snapshot'])
 
-    def run_strict_test(self, symbol, tf, base_costs):
+    def run_strict_test(self, symbol, tf, base_costs, from_snapshot=False):
         try:
             asset = Asset.objects.get(symbol=symbol)
             # FIX: Use the new aligned loader
-            X, prices_df = load_aligned_data(asset, tf)
+            X, prices_df = load_aligned_data(asset, tf, from_snapshot=from_snapshot)
             
             # --- 1. Signal Generation (Strict Entry) ---
             # Trend Pullback + Green Candle Confirmation
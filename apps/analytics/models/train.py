@@ -5,7 +5,7 @@ import lightgbm as lgb
 from typing import Dict, Tuple
 from apps.market_data.models import Asset
 from apps.mlops.services import save_model
-from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.features.cache import memoised_feature_dataframe
 from apps.analytics.services import OHLCVLoader
 
 def create_triple_barrier_target(
@@ -37,8 +37,8 @@ def create_triple_barrier_target(
     is_worth = (volatility * pt_multiplier) > min_ret
     return pd.Series((is_profit & is_worth).astype(int), index=prices.index)
 
-def load_aligned_data(asset: Asset, timeframe: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    loader = OHLCVLoader()
+def load_aligned_data(asset: Asset, timeframe: str, from_snapshot: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    loader = OHLCVLoader(from_snapshot=from_snapshot)
     # Load ALL available data to ensure indicators (EMA/RSI) warm up correctly
     prices_df = loader.load_dataframe(asset, timeframe, pd.Timestamp.min.tz_localize('UTC'), pd.Timestamp.max.tz_localize('UTC'))
     
@@ -46,7 +46,7 @@ def load_aligned_data(asset: Asset, timeframe: str) -> Tuple[pd.DataFrame, pd.Da
         raise ValueError(f"No OHLCV data for {asset.symbol}")
 
     # FORCE usage of FeaturePipeline
-    features_df = FeaturePipeline.build_feature_dataframe(asset.symbol, prices_df)
+    features_df = memoised_feature_dataframe(asset.symbol, prices_df)
     
     # Align indices (Drop rows where features are NaN due to warmup)
     common_index = prices_df.index.intersection(features_df.index)
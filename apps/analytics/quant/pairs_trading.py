@@ -22,6 +22,15 @@ class PairsTradingEngine:
         df = pd.concat([d1, d2], axis=1, join='inner').dropna()
         return df
 
+    @staticmethod
+    def get_aligned_panel_data(panel: pd.DataFrame, y_symbol: str, x_symbol: str) -> pd.DataFrame:
+        """
+        Same y/x frame as get_aligned_data, taken from a (field, symbol) panel
+        built by apps.market_data.panel.load_panel.
+        """
+        closes = panel['close'][[y_symbol, x_symbol]]
+        return closes.set_axis(['y', 'x'], axis=1).dropna()
+
     @staticmethod
     def calculate_rolling_metrics(df: pd.DataFrame, window: int = 60) -> pd.DataFrame:
         """
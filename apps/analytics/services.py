@@ -1,12 +1,13 @@
 # apps/analytics/services.py
 """
 Analytics services: OHLCV loading, feature engineering, regime classification,
-and chart data assembly. This version includes a composite 'overbought' feature.
+FeatureVector bulk inserts and chart data assembly. This version includes a composite 'overbought' feature.
 """
 
 from __future__ import annotations
 
 import datetime
+import json
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -16,15 +17,14 @@ from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
-# استيراد مكتبات المؤشرات الفنية
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD
-from ta.volatility import BollingerBands
-
+from apps.analytics.features.graph import IndicatorGraph
 from apps.analytics.serializers import AnnotationSerializer, OHLCVChartSerializer
-from apps.analytics.volatility.atr_analyzer import atr as calculate_atr
+from apps.common.pg_copy import copy_enabled, copy_rows
 from apps.market_data.models import Asset, MarketRegime, OHLCV
-from apps.trading_core.models import PatternCandidate, VerifiedPattern, TradingSignal
+from apps.market_data.storage.backends import get_ohlcv_store, get_snapshot_store
+from apps.market_data.storage.base import ensure_utc
+from apps.market_data.storage.frame_cache import OHLCVFrameCache
+from apps.trading_core.models import FeatureVector, PatternCandidate, VerifiedPattern, TradingSignal
 
 logger = structlog.get_logger(__name__)
 
@@ -35,8 +35,15 @@ logger = structlog.get_logger(__name__)
 class OHLCVLoader:
     """
     Loads OHLCV rows for a given asset/timeframe and returns a timezone-aware (UTC) DataFrame.
+    Bars are read from the backend selected by `MARKET_DATA_CONFIG["OHLCV_BACKEND"]`,
+    from the process-local frame cache when one is passed in, or with
+    `from_snapshot=True` from the memory-mapped `snapshot_ohlcv` export.
     """
 
+    def __init__(self, cache: Optional[OHLCVFrameCache] = None, from_snapshot: bool = False) -> None:
+        self.cache = cache
+        self.from_snapshot = from_snapshot
+
     def load_dataframe(
         self,
         asset: Asset,
@@ -46,22 +53,16 @@ class OHLCVLoader:
     ) -> pd.DataFrame:
         logger.info("Loading OHLCV data for analysis", asset=asset.symbol, timeframe=timeframe)
 
-        queryset = OHLCV.objects.filter(
-            asset=asset, timeframe=timeframe, timestamp__range=(start_utc, end_utc)
-        ).order_by("timestamp")
+        if self.cache is not None:
+            df = self.cache.get(asset, timeframe, start_utc, end_utc)
+        elif self.from_snapshot:
+            df = get_snapshot_store().load(asset, timeframe, ensure_utc(start_utc), ensure_utc(end_utc))
+        else:
+            df = get_ohlcv_store().load(asset, timeframe, ensure_utc(start_utc), ensure_utc(end_utc))
 
-        if not queryset.exists():
+        if df.empty:
             raise ValueError(f"No OHLCV data found for {asset.symbol} in the given range.")
 
-        df = pd.DataFrame.from_records(queryset.values("timestamp", "open", "high", "low", "close", "volume"))
-
-        for col in ("open", "high", "low", "close", "volume"):
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
-        df.set_index("timestamp", inplace=True)
-
-        df = df[["open", "high", "low", "close", "volume"]]
         return df
 
 
@@ -84,19 +85,19 @@ class FeatureEngineer:
                 df_featured[col] = pd.to_numeric(df_featured[col], errors='coerce')
 
         # === 1. Standard Technical Indicators ===
-        df_featured["atr"] = calculate_atr(df_featured["high"], df_featured["low"], df_featured["close"], window=self.config.get("ATR_WINDOW", 14))
-        df_featured["rsi"] = RSIIndicator(close=df_featured["close"], window=self.config.get("RSI_WINDOW", 14)).rsi()
+        graph = IndicatorGraph(df_featured)
+        atr_window = self.config.get("ATR_WINDOW", 14)
+        df_featured["atr"] = graph.get("smma", "tr", atr_window, 0)  # == volatility.atr_analyzer.atr
+        df_featured["rsi"] = graph.get("rsi", self.config.get("RSI_WINDOW", 14))
         
-        macd = MACD(close=df_featured["close"], window_slow=26, window_fast=12, window_sign=9)
-        df_featured["macd_diff"] = macd.macd_diff()
+        df_featured["macd_diff"] = graph.get("macd_diff", 12, 26, 9)
         
-        stoch = StochasticOscillator(high=df_featured["high"], low=df_featured["low"], close=df_featured["close"], window=14, smooth_window=3)
-        df_featured["stoch_k"] = stoch.stoch()
-        df_featured["stoch_d"] = stoch.stoch_signal()
+        df_featured["stoch_k"] = graph.get("stoch_k", 14)
+        df_featured["stoch_d"] = graph.get("stoch_d", 14, 3)
 
-        bb = BollingerBands(close=df_featured["close"], window=20, window_dev=2)
-        df_featured["bb_width"] = bb.bollinger_wband()
-        df_featured["bb_pband"] = bb.bollinger_pband()
+        bb = graph.get("bollinger", 20, 2)
+        df_featured["bb_width"] = bb.wband
+        df_featured["bb_pband"] = bb.pband
 
         # === 2. Advanced Volatility Features ===
         log_high = np.log(df_featured['high'].clip(lower=1e-9))
@@ -145,6 +146,97 @@ def run_regime_analysis_for_asset(asset: Asset, timeframe: str) -> None:
     pass
 
 
+# ---------------------------
+# FeatureVector bulk inserts
+# ---------------------------
+def bulk_insert_feature_vectors(
+    vectors: List[FeatureVector], batch_size: int = 500, ignore_conflicts: bool = False
+) -> int:
+    """
+    Insert many FeatureVectors at once: through COPY on PostgreSQL, `bulk_create`
+    elsewhere. Returns the number of vectors passed to the database (on PostgreSQL,
+    the number actually inserted).
+    """
+    if not copy_enabled(len(vectors)):
+        created = FeatureVector.objects.bulk_create(
+            vectors, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+        return len(created)
+
+    created_at = timezone.now().isoformat()
+    result = copy_rows(
+        FeatureVector,
+        ["asset", "timestamp", "features", "created_at"],
+        (
+            (fv.asset_id, fv.timestamp.isoformat(), json.dumps(fv.features, default=str), created_at)
+            for fv in vectors
+        ),
+        unique_fields=["asset", "timestamp"] if ignore_conflicts else None,
+    )
+    return result.inserted
+
+
+def feature_records(features_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    One JSON-ready dict per row of `features_df`: numeric columns as Python
+    floats, booleans as bools, NaN and infinities as None (JSON has no NaN).
+    """
+    frame = features_df.copy()
+    numeric = frame.select_dtypes(include="number").columns
+    frame[numeric] = frame[numeric].astype(float).replace([np.inf, -np.inf], np.nan)
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict("records")
+
+
+def upsert_feature_vectors(asset: Asset, features_df: pd.DataFrame, batch_size: int = 500) -> int:
+    """
+    Persist `features_df` (indexed by timestamp) as the asset's FeatureVectors in
+    one batched upsert: through COPY on PostgreSQL, `bulk_create(update_conflicts=True)`
+    elsewhere. Rows newer than the stored tail are always written; older rows only
+    when missing or when their values changed. Returns the number of rows written.
+    """
+    if features_df is None or features_df.empty:
+        return 0
+    timestamps = pd.DatetimeIndex(features_df.index)
+    if timestamps.tz is None:
+        timestamps = timestamps.tz_localize("UTC")
+    records = feature_records(features_df)
+
+    # One query for what is stored over the window instead of a SELECT per row.
+    stored = dict(
+        FeatureVector.objects.filter(asset=asset, timestamp__gte=timestamps.min()).values_list(
+            "timestamp", "features"
+        )
+    )
+    tail = max(stored) if stored else None
+    changed = [
+        (ts.to_pydatetime(), features)
+        for ts, features in zip(timestamps, records)
+        if tail is None or ts > tail or stored.get(ts.to_pydatetime()) != features
+    ]
+    if not changed:
+        return 0
+
+    if copy_enabled(len(changed)):
+        created_at = timezone.now().isoformat()
+        copy_rows(
+            FeatureVector,
+            ["asset", "timestamp", "features", "created_at"],
+            ((asset.pk, ts.isoformat(), json.dumps(features), created_at) for ts, features in changed),
+            unique_fields=["asset", "timestamp"],
+            update_fields=["features"],
+        )
+    else:
+        FeatureVector.objects.bulk_create(
+            [FeatureVector(asset=asset, timestamp=ts, features=features) for ts, features in changed],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["asset", "timestamp"],
+            update_fields=["features"],
+        )
+    return len(changed)
+
+
 # ---------------------------
 # Chart Data Service
 # ---------------------------
@@ -152,14 +244,17 @@ class ChartDataService:
     @staticmethod
     def get_chart_data(symbol: str, timeframe: str, start_utc: datetime.datetime, end_utc: datetime.datetime) -> Dict[str, Any]:
         asset = Asset.objects.get(symbol__iexact=symbol)
-        ohlcv_qs = OHLCV.objects.filter(
-            asset=asset, timeframe=timeframe, timestamp__range=(start_utc, end_utc)
-        ).order_by("timestamp")
+        # Through the configured store, so bars compacted into the archive still chart.
+        df = get_ohlcv_store().load(asset, timeframe, ensure_utc(start_utc), ensure_utc(end_utc))
 
-        if not ohlcv_qs.exists():
+        if df.empty:
             raise ValueError("No OHLCV data for the selected range.")
 
-        ohlcv_data = OHLCVChartSerializer(ohlcv_qs, many=True).data
+        bars = [
+            OHLCV(asset=asset, timeframe=timeframe, timestamp=ts.to_pydatetime(), **row)
+            for ts, row in zip(df.index, df[["open", "high", "low", "close", "volume"]].to_dict("records"))
+        ]
+        ohlcv_data = OHLCVChartSerializer(bars, many=True).data
         annotations = []
         annotations.extend(ChartDataService._get_regime_annotations(asset, start_utc, end_utc))
         annotations.extend(ChartDataService._get_verified_pattern_annotations(asset, start_utc, end_utc))
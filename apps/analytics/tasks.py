@@ -20,7 +20,6 @@ import datetime
 import time
 from typing import Any, Dict, List, Optional
 
-import numpy as np
 import structlog
 from celery import chain, shared_task
 from django.db import transaction
@@ -29,11 +28,14 @@ from django.utils import timezone
 from apps.analytics.patterns import screeners
 from apps.analytics.patterns.templates import PatternTemplates
 from apps.analytics.patterns.verifiers.dtw_verifier import DTWVerifier
-from apps.analytics.services import OHLCVLoader, run_regime_analysis_for_asset
-from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.services import OHLCVLoader, run_regime_analysis_for_asset, upsert_feature_vectors
+from apps.analytics.features.incremental import build_features
+from apps.analytics.features.store import feature_store_enabled, get_feature_store
+from apps.common.sqlite import single_writer
 from apps.market_data.models import Asset
+from apps.market_data.storage.frame_cache import get_frame_cache
 from apps.market_data.tasks import ingest_historical_data_task, trigger_decision_manager
-from apps.trading_core.models import PatternCandidate, VerifiedPattern, FeatureVector
+from apps.trading_core.models import PatternCandidate, VerifiedPattern
 
 logger = structlog.get_logger(__name__)
 
@@ -117,7 +119,7 @@ def scan_for_candidate_patterns(self, prev_result: Dict[str, Any], **kwargs) ->
         logger.warning("Asset not found for pattern scan", symbol=symbol)
         return prev_result
 
-    loader = OHLCVLoader()
+    loader = OHLCVLoader(cache=get_frame_cache())
     end_utc = timezone.now()
     start_utc = end_utc - datetime.timedelta(days=45)
 
@@ -179,7 +181,7 @@ def scan_for_candidate_patterns(self, prev_result: Dict[str, Any], **kwargs) ->
         return prev_result
 
     try:
-        with transaction.atomic():
+        with single_writer(), transaction.atomic():
             created = PatternCandidate.objects.bulk_create(candidate_objects, ignore_conflicts=True)
         persisted = len(created) if created is not None else 0
         logger.info("Pattern scan task completed", symbol=symbol, found=len(all_candidates), persisted=persisted)
@@ -215,7 +217,7 @@ def verify_pattern_candidates_task(self, prev_result: Dict[str, Any], **kwargs)
     start_utc = end_utc - datetime.timedelta(days=10)
 
     try:
-        df = OHLCVLoader().load_dataframe(asset, timeframe, start_utc, end_utc)
+        df = OHLCVLoader(cache=get_frame_cache()).load_dataframe(asset, timeframe, start_utc, end_utc)
     except ValueError as e:
         logger.warning("OHLCV load failed for verification", symbol=symbol, error=str(e))
         return prev_result
@@ -283,7 +285,7 @@ def verify_pattern_candidates_task(self, prev_result: Dict[str, Any], **kwargs)
         return prev_result
 
     try:
-        with transaction.atomic():
+        with single_writer(), transaction.atomic():
             created = VerifiedPattern.objects.bulk_create(verified_instances, ignore_conflicts=True)
             persisted = len(created) if created is not None else len(verified_instances)
     except Exception:
@@ -319,7 +321,7 @@ def generate_feature_vectors_task(self, prev_result: Dict[str, Any], **kwargs) -
     end_utc = timezone.now()
     start_utc = end_utc - datetime.timedelta(days=45)
     try:
-        ohlcv_df = OHLCVLoader().load_dataframe(asset, timeframe, start_utc, end_utc)
+        ohlcv_df = OHLCVLoader(cache=get_frame_cache()).load_dataframe(asset, timeframe, start_utc, end_utc)
     except ValueError as e:
         logger.warning("Cannot generate features due to data issue", symbol=symbol, error=str(e))
         return prev_result
@@ -331,9 +333,10 @@ def generate_feature_vectors_task(self, prev_result: Dict[str, Any], **kwargs) -
         logger.info("No OHLCV data available for feature generation", symbol=symbol)
         return prev_result
 
-    # Build features DataFrame via FeaturePipeline (expected to return DataFrame indexed by timestamp)
+    # Build features DataFrame via FeaturePipeline (expected to return DataFrame indexed by timestamp);
+    # with INCREMENTAL_FEATURES only the bars the stored engine state has not seen are returned.
     try:
-        features_df = FeaturePipeline.build_feature_dataframe(symbol, ohlcv_df)
+        features_df = build_features(asset, timeframe, ohlcv_df)
     except Exception:
         logger.exception("FeaturePipeline failed to build feature dataframe", symbol=symbol)
         return prev_result
@@ -342,41 +345,23 @@ def generate_feature_vectors_task(self, prev_result: Dict[str, Any], **kwargs) -
         logger.info("FeaturePipeline returned empty dataframe; nothing to persist", symbol=symbol)
         return prev_result
 
-    feature_vectors = []
-    for timestamp, row in features_df.iterrows():
-        try:
-            # Convert numpy scalars and booleans to native python types for JSON storage
-            feature_dict = {}
-            for k, v in row.to_dict().items():
-                if isinstance(v, (np.floating, np.integer)):
-                    feature_dict[k] = float(v)
-                elif isinstance(v, (np.bool_)):
-                    feature_dict[k] = bool(v)
-                else:
-                    # allow None and other JSON serializable items
-                    feature_dict[k] = v
-            feature_vectors.append(
-                FeatureVector(asset=asset, timestamp=timestamp.to_pydatetime() if hasattr(timestamp, "to_pydatetime") else timestamp, features=feature_dict)
-            )
-        except Exception:
-            logger.exception("Failed to convert feature row to FeatureVector", symbol=symbol, index=timestamp)
-
-    if not feature_vectors:
-        logger.info("No feature vectors were generated.", symbol=symbol)
-        return prev_result
-
-    # Persist feature vectors using update_or_create inside a transaction (DB-agnostic)
+    # One batched upsert of the new or changed rows (see services.upsert_feature_vectors)
     try:
-        with transaction.atomic():
-            for fv in feature_vectors:
-                FeatureVector.objects.update_or_create(
-                    asset=fv.asset, timestamp=fv.timestamp, defaults={"features": fv.features}
-                )
+        with single_writer(), transaction.atomic():
+            written = upsert_feature_vectors(asset, features_df)
     except Exception:
         logger.exception("Failed to persist FeatureVectors", symbol=symbol)
         return prev_result
 
-    logger.info("Feature vector generation task completed", symbol=symbol, count=len(feature_vectors))
+    if feature_store_enabled():
+        try:
+            get_feature_store().append(asset, timeframe, features_df)
+        except Exception:
+            logger.exception("Failed to append features to the feature store", symbol=symbol)
+
+    logger.info(
+        "Feature vector generation task completed", symbol=symbol, count=len(features_df), written=written
+    )
     return prev_result
 
 
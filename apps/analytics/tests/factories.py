@@ -1,6 +1,8 @@
 import datetime
 
 import factory
+import numpy as np
+import pandas as pd
 from django.utils import timezone
 
 from apps.market_data.models import Asset, OHLCV
@@ -27,3 +29,25 @@ class OHLCVFactory(factory.django.DjangoModelFactory):
     low = 1.09
     close = 1.105
     volume = 1000
+
+
+def make_hours(start: str, periods: int, seed: int = 11) -> pd.DataFrame:
+    """Random-walk hourly OHLCV bars, indexed by UTC timestamp."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq="h", tz="UTC", name="timestamp")
+    close = 2000 + np.cumsum(rng.normal(0, 3, periods))
+    open_ = close + rng.normal(0, 1.5, periods)
+    wick = rng.uniform(0, 4, (2, periods))
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + wick[0],
+            "low": np.minimum(open_, close) - wick[1],
+            "close": close,
+            "volume": rng.integers(1, 500, periods),
+        },
+        index=index,
+    )
+    # A flat stretch exercises the zero-range / zero-loss branches.
+    df.iloc[300:320, :4] = df["close"].iloc[299]
+    return df
@@ -0,0 +1,65 @@
+# apps/analytics/tests/test_feature_cache.py
+import os
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from apps.analytics.features import cache as feature_cache
+from apps.analytics.features.cache import FeatureCache
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.tests.factories import make_hours
+
+
+@pytest.fixture
+def bars():
+    return make_hours("2024-01-01", 500)
+
+
+def build_counter():
+    return patch.object(
+        FeaturePipeline, "build_feature_dataframe", wraps=FeaturePipeline.build_feature_dataframe
+    )
+
+
+def test_repeated_slices_skip_featurisation(tmp_path, bars):
+    cache = FeatureCache(tmp_path)
+    expected = FeaturePipeline.build_feature_dataframe("XAUUSD", bars)
+
+    with build_counter() as build:
+        first = cache.get_or_build("XAUUSD", bars)
+        second = cache.get_or_build("XAUUSD", bars.copy())
+        cache.get_or_build("XAUUSD", bars.iloc[:-1])
+
+    assert build.call_count == 2  # the full slice once, the shorter one once
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected, check_freq=False)
+
+
+def test_pipeline_change_invalidates_entries(tmp_path, bars):
+    cache = FeatureCache(tmp_path)
+    cache.get_or_build("XAUUSD", bars)
+    key = feature_cache.bars_digest(bars)
+
+    feature_cache.pipeline_fingerprint.cache_clear()
+    try:
+        with patch.object(FeaturePipeline, "VERSION", FeaturePipeline.VERSION + 1):
+            assert feature_cache.bars_digest(bars) != key
+    finally:
+        feature_cache.pipeline_fingerprint.cache_clear()
+    assert feature_cache.bars_digest(bars) == key
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path, bars):
+    cache = FeatureCache(tmp_path)
+    paths = []
+    for age, rows in enumerate((300, 350, 400)):
+        cache.get_or_build("XAUUSD", bars.iloc[:rows])
+        paths.append(cache.path_for(feature_cache.bars_digest(bars.iloc[:rows])))
+        os.utime(paths[-1], ns=(age * 10**9, age * 10**9))  # written oldest first
+
+    cache.get(feature_cache.bars_digest(bars.iloc[:300]))  # 300 is now the most recently used
+    cache.max_bytes = paths[0].stat().st_size + paths[2].stat().st_size
+    assert cache.evict() == 1
+
+    assert [path.exists() for path in paths] == [True, False, True]
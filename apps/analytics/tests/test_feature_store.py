@@ -0,0 +1,95 @@
+# apps/analytics/tests/test_feature_store.py
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.features.store import ColumnarFeatureStore, FeatureStoreError
+from apps.analytics.tests.factories import make_hours
+from apps.market_data.models import Asset
+
+
+@pytest.fixture
+def asset():
+    # Only the symbol is used; no database access.
+    return Asset(symbol="XAUUSD")
+
+
+@pytest.fixture
+def features():
+    return FeaturePipeline.build_feature_dataframe("XAUUSD", make_hours("2024-01-01", 600))
+
+
+def test_get_matrix_returns_contiguous_float32_window(tmp_path, asset, features):
+    store = ColumnarFeatureStore(tmp_path)
+    assert store.append(asset, "H1", features) == len(features)
+
+    start, end = features.index[100], features.index[199]
+    matrix = store.get_matrix(asset, ["rsi", "adx"], start, end, timeframe="H1")
+
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(matrix, features.loc[start:end, ["rsi", "adx"]].to_numpy(dtype=np.float32))
+    assert store.tail(asset, "H1") == features.index[-1]
+    pd.testing.assert_frame_equal(store.load(asset, "H1"), features.astype(np.float32), check_freq=False)
+
+
+def test_append_writes_only_new_and_changed_rows(tmp_path, asset, features):
+    store = ColumnarFeatureStore(tmp_path)
+    store.append(asset, "H1", features.iloc[:500])
+
+    assert store.append(asset, "H1", features.iloc[300:500]) == 0
+    changed = features.iloc[450:].copy()
+    changed.iloc[49, 0] += 1.0  # row 499 (a forming bar) was revised
+    assert store.append(asset, "H1", changed) == 101
+
+    expected = features.astype(np.float32)
+    expected.iloc[499, 0] = np.float32(changed.iloc[49, 0])
+    pd.testing.assert_frame_equal(store.load(asset, "H1"), expected, check_freq=False)
+
+
+def test_interrupted_append_is_ignored_and_versions_are_separate(tmp_path, asset, features):
+    store = ColumnarFeatureStore(tmp_path)
+    store.append(asset, "H1", features.iloc[:100])
+    with open(store.series_dir("XAUUSD", "H1") / "rsi.f4", "ab") as fh:
+        fh.write(b"\xff" * 64)  # column bytes of an append that never committed
+
+    assert len(store.get_matrix(asset, ["rsi"], timeframe="H1")) == 100
+    store.append(asset, "H1", features.iloc[100:200])
+    np.testing.assert_array_equal(
+        store.get_matrix(asset, ["rsi"], timeframe="H1")[:, 0], features["rsi"].iloc[:200].to_numpy(np.float32)
+    )
+
+    next_version = ColumnarFeatureStore(tmp_path, pipeline_version=FeaturePipeline.VERSION + 1)
+    assert next_version.get_matrix(asset, ["rsi"], timeframe="H1").shape == (0, 1)
+    with pytest.raises(FeatureStoreError):
+        store.get_matrix(asset, ["no_such_feature"], timeframe="H1")
+    with pytest.raises(FeatureStoreError):
+        store.append(asset, "H1", features.drop(columns="rsi"))
+
+
+def test_interrupted_rewrite_leaves_the_committed_series_readable(tmp_path, asset, features):
+    store = ColumnarFeatureStore(tmp_path)
+    store.append(asset, "H1", features.iloc[:500])
+    revised = features.iloc[400:].copy()
+    revised.iloc[:, :] += 1.0  # recomputed history from row 400 on
+
+    write_from = ColumnarFeatureStore._write_from
+
+    def crash_after_first_column(source, target, name, offset, data):
+        if name == f"{features.columns[1]}.f4":
+            raise OSError("killed")
+        write_from(source, target, name, offset, data)
+
+    with patch.object(ColumnarFeatureStore, "_write_from", side_effect=crash_after_first_column):
+        with pytest.raises(OSError):
+            store.append(asset, "H1", revised)
+
+    pd.testing.assert_frame_equal(
+        store.load(asset, "H1"), features.iloc[:500].astype(np.float32), check_freq=False
+    )
+    assert store.append(asset, "H1", revised) == len(revised)
+    expected = pd.concat([features.iloc[:400], revised]).astype(np.float32)
+    pd.testing.assert_frame_equal(store.load(asset, "H1"), expected, check_freq=False)
+    assert sorted(p.name for p in store.series_dir("XAUUSD", "H1").iterdir()) == ["g1", "meta.json"]
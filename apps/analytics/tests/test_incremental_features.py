@@ -0,0 +1,70 @@
+# apps/analytics/tests/test_incremental_features.py
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+from apps.analytics.features.incremental import IncrementalFeatureEngine, incremental_features
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.tests.factories import make_hours
+from apps.market_data.models import Asset
+from apps.trading_core.models import FeatureEngineState
+
+
+class TestIncrementalFeatureEngine:
+    def test_matches_batch_pipeline(self):
+        bars = make_hours("2024-01-01", 1200)
+        expected = FeaturePipeline.build_feature_dataframe("XAUUSD", bars)
+
+        result = IncrementalFeatureEngine().run(bars)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-7, atol=1e-9)
+
+    def test_resumes_from_serialised_state(self):
+        bars = make_hours("2024-01-01", 600)
+        engine = IncrementalFeatureEngine()
+        head = engine.run(bars.iloc[:450])
+
+        restored = IncrementalFeatureEngine.from_state(json.loads(json.dumps(engine.to_state())))
+        tail = restored.run(bars.iloc[450:])
+
+        expected = FeaturePipeline.build_feature_dataframe("XAUUSD", bars)
+        pd.testing.assert_frame_equal(pd.concat([head, tail]), expected, check_exact=False, rtol=1e-7, atol=1e-9)
+        with pytest.raises(ValueError):
+            restored.update(bars.index[-1], 1.0, 1.0, 1.0, 1.0)
+
+
+@pytest.mark.django_db
+class TestIncrementalFeatures:
+    def test_persists_closed_bars_and_resumes(self):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        bars = make_hours("2024-01-01", 500)
+        now = bars.index[399].to_pydatetime() + datetime.timedelta(minutes=30)  # bar 399 is forming
+
+        first = incremental_features(asset, "H1", bars.iloc[:400], now=now)
+        state = FeatureEngineState.objects.get(asset=asset, timeframe="H1")
+        assert len(first) == 400
+        assert state.last_timestamp == bars.index[398]
+
+        later = bars.index[-1].to_pydatetime() + datetime.timedelta(hours=1)
+        second = incremental_features(asset, "H1", bars.iloc[100:], now=later)
+        assert list(second.index) == list(bars.index[399:])
+
+        expected = FeaturePipeline.build_feature_dataframe("XAUUSD", bars)
+        pd.testing.assert_frame_equal(second, expected.iloc[399:], check_exact=False, rtol=1e-7, atol=1e-9)
+        # Nothing new: the last row comes from the stored state.
+        again = incremental_features(asset, "H1", bars.iloc[100:], now=later)
+        pd.testing.assert_frame_equal(again, expected.iloc[-1:], check_exact=False, rtol=1e-7, atol=1e-9)
+
+    def test_state_bar_missing_from_the_frame_starts_a_fresh_engine(self):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        bars = make_hours("2024-01-01", 500)
+        incremental_features(asset, "H1", bars.iloc[:400], now=bars.index[-1].to_pydatetime())
+
+        gapped = bars.drop(bars.index[399])  # the stored engine's last bar
+        later = bars.index[-1].to_pydatetime() + datetime.timedelta(hours=1)
+        result = incremental_features(asset, "H1", gapped, now=later)
+
+        expected = FeaturePipeline.build_feature_dataframe("XAUUSD", gapped)
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-7, atol=1e-9)
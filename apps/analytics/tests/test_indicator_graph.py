@@ -0,0 +1,76 @@
+# apps/analytics/tests/test_indicator_graph.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.analytics.features import indicators
+from apps.analytics.features.graph import IndicatorGraph
+from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.tests.factories import make_hours
+from apps.analytics.volatility.atr_analyzer import atr
+
+
+@pytest.fixture
+def bars():
+    return make_hours("2024-01-01", 800)
+
+
+def test_nodes_match_the_kernels(bars):
+    graph = IndicatorGraph(bars)
+    high, low, close = bars["high"], bars["low"], bars["close"]
+
+    np.testing.assert_allclose(graph.get("ema", "close", 200), indicators.ema(close, 200), equal_nan=True)
+    np.testing.assert_allclose(graph.get("rsi", 14), indicators.rsi(close, 14), equal_nan=True)
+    np.testing.assert_allclose(graph.get("adx", 14), indicators.adx(high, low, close, 14), equal_nan=True)
+    np.testing.assert_allclose(graph.get("atr", 14), indicators.atr(high, low, close, 14), equal_nan=True)
+    np.testing.assert_allclose(graph.get("chop", 14), indicators.choppiness(high, low, close, 14), equal_nan=True)
+    np.testing.assert_allclose(
+        graph.get("macd_diff", 12, 26, 9), indicators.macd(close, 12, 26, 9).diff, equal_nan=True
+    )
+    np.testing.assert_allclose(
+        graph.get("stoch_d", 14, 3), indicators.stochastic(high, low, close, 14, 3).d, equal_nan=True
+    )
+    np.testing.assert_allclose(
+        graph.get("smma", "tr", 14, 0), atr(high, low, close, 14).to_numpy(), equal_nan=True
+    )
+
+
+def test_shared_nodes_are_computed_once(bars):
+    graph = IndicatorGraph(bars)
+
+    graph.get("adx", 14)
+    graph.get("atr", 14)
+    graph.get("chop", 14)
+    FeaturePipeline.build_feature_dataframe("XAUUSD", bars, graph=graph)
+
+    assert len(graph.evaluated) == len(set(graph.evaluated))
+    assert ("tr",) in graph
+    assert ("ema", "close", 200) in graph
+
+
+def test_subset_evaluates_only_its_dependencies(bars):
+    graph = IndicatorGraph(bars)
+
+    graph.get("rsi", 14)
+
+    assert set(graph.evaluated) == {
+        ("close",),
+        ("gains_losses", "close"),
+        ("gain", "close"),
+        ("loss", "close"),
+        ("smma", ("gain", "close"), 14, 14),
+        ("smma", ("loss", "close"), 14, 14),
+        ("rsi", 14),
+    }
+    with pytest.raises(KeyError):
+        graph.get("no_such_indicator")
+
+
+def test_pipeline_is_unchanged_by_a_shared_graph(bars):
+    graph = IndicatorGraph(bars)
+    graph.get("rsi", 14)
+
+    pd.testing.assert_frame_equal(
+        FeaturePipeline.build_feature_dataframe("XAUUSD", bars, graph=graph),
+        FeaturePipeline.build_feature_dataframe("XAUUSD", bars),
+    )
@@ -0,0 +1,85 @@
+# apps/analytics/tests/test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator, StochasticOscillator
+from ta.trend import MACD, ADXIndicator, EMAIndicator
+from ta.volatility import AverageTrueRange, BollingerBands
+
+from apps.analytics.features import indicators
+from apps.analytics.tests.factories import make_hours
+
+
+@pytest.fixture
+def bars():
+    return make_hours("2024-01-01", 1500)
+
+
+def assert_matches(result, expected):
+    np.testing.assert_allclose(result, expected.to_numpy(dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [5, 14, 50])
+def test_single_series_kernels_match_ta(bars, window):
+    high, low, close = bars["high"], bars["low"], bars["close"]
+
+    assert_matches(indicators.ema(close, window), EMAIndicator(close, window).ema_indicator())
+    assert_matches(indicators.rsi(close, window), RSIIndicator(close, window).rsi())
+    assert_matches(
+        indicators.atr(high, low, close, window), AverageTrueRange(high, low, close, window).average_true_range()
+    )
+    assert_matches(indicators.adx(high, low, close, window), ADXIndicator(high, low, close, window).adx())
+
+
+def test_composite_kernels_match_ta(bars):
+    high, low, close = bars["high"], bars["low"], bars["close"]
+
+    result = indicators.macd(close, window_fast=12, window_slow=26, window_sign=9)
+    expected = MACD(close, window_slow=26, window_fast=12, window_sign=9)
+    assert_matches(result.macd, expected.macd())
+    assert_matches(result.signal, expected.macd_signal())
+    assert_matches(result.diff, expected.macd_diff())
+
+    result = indicators.stochastic(high, low, close, window=14, smooth_window=3)
+    expected = StochasticOscillator(high, low, close, window=14, smooth_window=3)
+    assert_matches(result.k, expected.stoch())
+    assert_matches(result.d, expected.stoch_signal())
+
+    result = indicators.bollinger(close, window=20, window_dev=2)
+    expected = BollingerBands(close, window=20, window_dev=2)
+    for name in ("mavg", "hband", "lband", "wband", "pband"):
+        assert_matches(getattr(result, name), getattr(expected, f"bollinger_{name}")())
+
+    tr = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    range_hl = (high.rolling(14).max() - low.rolling(14).min()).replace(0, np.nan)
+    expected = 100 * np.log10(tr.rolling(14).sum() / range_hl) / np.log10(14)
+    assert_matches(indicators.choppiness(high, low, close), expected)
+
+
+@pytest.mark.parametrize("window", [1, 3, 20, 64])
+def test_rolling_windows_match_pandas(window):
+    rng = np.random.default_rng(3)
+    values = pd.Series(50_000 + np.cumsum(rng.normal(0, 0.5, 5003)))
+    values.iloc[[40, 41, 2000]] = np.nan
+    values.iloc[3000:3100] = values.iloc[2999]
+    rolling = values.rolling(window)
+
+    assert_matches(indicators.rolling_sum(values, window), rolling.sum())
+    assert_matches(indicators.rolling_mean(values, window), rolling.mean())
+    assert_matches(indicators.rolling_max(values, window), rolling.max())
+    assert_matches(indicators.rolling_min(values, window), rolling.min())
+    if window > 1:
+        # pandas' add/remove variance drifts at this price level; compare with a two-pass std.
+        windows = np.lib.stride_tricks.sliding_window_view(values.to_numpy(), window)
+        for ddof in (0, 1):
+            exact = pd.Series(np.r_[np.full(window - 1, np.nan), windows.std(axis=1, ddof=ddof)])
+            exact[rolling.max() == rolling.min()] = 0.0
+            assert_matches(indicators.rolling_std(values, window, ddof=ddof), exact)
+
+
+def test_short_and_empty_inputs():
+    bars = make_hours("2024-01-01", 400).iloc[:20]
+    assert not indicators.adx(bars["high"], bars["low"], bars["close"]).any()
+    assert np.isnan(indicators.ema(bars["close"], 50)).all()
+    for kernel in (indicators.ema, indicators.rsi):
+        assert kernel(pd.Series([], dtype=float), 14).size == 0
@@ -11,9 +11,12 @@ from apps.analytics.services import (
     FeatureEngineer,
     OHLCVLoader,
     RegimeClassifier,
+    feature_records,
+    upsert_feature_vectors,
 )
 from apps.analytics.tests.factories import OHLCVFactory
 from apps.market_data.models import Asset
+from apps.trading_core.models import FeatureVector
 
 # --[ تحسين: تعريف تكوين اختبار مركزي لاستخدامه في جميع الاختبارات ]--
 TEST_ANALYTICS_CONFIG = {
@@ -102,4 +105,36 @@ class TestRegimeClassifier:
             regime, confidence, meta = classifier.classify(df)
 
             assert regime == "TRENDING"
-            assert meta["hurst"] > 0.55
\ No newline at end of file
+            assert meta["hurst"] > 0.55
+
+
+@pytest.mark.django_db
+class TestUpsertFeatureVectors:
+    def make_features(self, periods: int = 10) -> pd.DataFrame:
+        index = pd.date_range("2024-01-01", periods=periods, freq="h", tz="UTC")
+        return pd.DataFrame(
+            {"rsi": np.linspace(30.0, 70.0, periods), "is_green": np.arange(periods) % 2 == 0}, index=index
+        )
+
+    def test_feature_records_are_native(self):
+        features = self.make_features(2)
+        features.loc[features.index[1], "rsi"] = np.inf
+
+        records = feature_records(features)
+
+        assert records == [{"rsi": 30.0, "is_green": True}, {"rsi": None, "is_green": False}]
+        assert type(records[0]["rsi"]) is float and type(records[0]["is_green"]) is bool
+
+    def test_writes_only_new_and_changed_rows(self, django_assert_max_num_queries):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        features = self.make_features()
+        assert upsert_feature_vectors(asset, features.iloc[:8]) == 8
+
+        features.loc[features.index[7], "rsi"] = 99.0  # the formerly forming bar changed
+        with django_assert_max_num_queries(2):  # one SELECT of the window, one upsert
+            assert upsert_feature_vectors(asset, features.iloc[2:]) == 3
+        assert upsert_feature_vectors(asset, features) == 0
+
+        stored = dict(FeatureVector.objects.filter(asset=asset).values_list("timestamp", "features"))
+        assert len(stored) == 10
+        assert stored[features.index[7].to_pydatetime()]["rsi"] == 99.0
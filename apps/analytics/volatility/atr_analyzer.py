@@ -1,7 +1,8 @@
 #apps/analytics/volatility/atrs.py
-import numpy as np
 import pandas as pd
 
+from apps.analytics.features import indicators
+
 
 def atr(
     high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14
@@ -21,9 +22,5 @@ def atr(
     if not all(isinstance(s, pd.Series) for s in [high, low, close]):
         raise TypeError("Inputs must be pandas Series.")
 
-    high_low = high - low
-    high_close = np.abs(high - close.shift())
-    low_close = np.abs(low - close.shift())
-
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.ewm(alpha=1 / window, adjust=False).mean()
+    tr = indicators.true_range(high, low, close)
+    return pd.Series(indicators.ewm_mean(tr, 1 / window), index=close.index)
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    name = "apps.common"
+
+    def ready(self) -> None:
+        from django.db.backends.signals import connection_created
+
+        from apps.common.sqlite import configure_connection
+
+        connection_created.connect(configure_connection, dispatch_uid="apps.common.sqlite.configure_connection")
@@ -1,3 +1,4 @@
+import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -17,3 +18,12 @@ class Timeframe(Enum):
         import MetaTrader5 as mt5
 
         return getattr(mt5, f"TIMEFRAME_{self.value}")
+
+    def to_timedelta(self) -> datetime.timedelta:
+        """Nominal duration of one bar of this timeframe."""
+        unit, value = self.value[0], int(self.value[1:])
+        if unit == "M":
+            return datetime.timedelta(minutes=value)
+        if unit == "H":
+            return datetime.timedelta(hours=value)
+        return datetime.timedelta(days=value)
@@ -0,0 +1,102 @@
+# apps/common/pg_copy.py
+"""
+`COPY FROM STDIN` bulk loads for PostgreSQL.
+
+Rows are streamed as CSV into a temporary staging table (one round trip, no
+per-row INSERT parsing) and merged into the target with a single
+`INSERT ... SELECT ... ON CONFLICT`, which keeps upsert/ignore semantics and
+returns exact inserted/updated counts.
+
+On any other database `copy_rows` returns None and callers keep their
+`bulk_create` path, so SQLite deployments behave exactly as before.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence, Type
+
+from django.conf import settings
+from django.db import connection, models, transaction
+
+
+@dataclass(frozen=True)
+class CopyResult:
+    inserted: int = 0
+    updated: int = 0
+
+
+def copy_enabled(n_rows: int) -> bool:
+    """True when a load of `n_rows` rows should go through COPY."""
+    return (
+        connection.vendor == "postgresql"
+        and getattr(settings, "PG_COPY_ENABLED", True)
+        and n_rows >= getattr(settings, "PG_COPY_MIN_ROWS", 500)
+    )
+
+
+def copy_rows(
+    model: Type[models.Model],
+    fields: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    unique_fields: Optional[Sequence[str]] = None,
+    update_fields: Optional[Sequence[str]] = None,
+) -> Optional[CopyResult]:
+    """
+    Bulk load `rows` (values in `fields` order, JSON fields already serialised)
+    into `model`'s table.
+
+    Conflicts on `unique_fields` update `update_fields` when given and are
+    skipped otherwise; without `unique_fields` a conflict raises like a plain
+    INSERT. Returns None when the connection is not PostgreSQL.
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    staging = qn(f"{table}_copy")
+    columns = ", ".join(qn(model._meta.get_field(name).column) for name in fields)
+    on_conflict = ""
+    if unique_fields:
+        conflict = ", ".join(qn(model._meta.get_field(name).column) for name in unique_fields)
+        if update_fields:
+            assignments = ", ".join(
+                f"{qn(column)} = EXCLUDED.{qn(column)}"
+                for column in (model._meta.get_field(name).column for name in update_fields)
+            )
+            on_conflict = f"ON CONFLICT ({conflict}) DO UPDATE SET {assignments} "
+        else:
+            on_conflict = f"ON CONFLICT ({conflict}) DO NOTHING "
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {qn(table)} WITH NO DATA"
+        )
+        _copy_from(cursor, f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        # xmax = 0 only for freshly inserted tuples; DO NOTHING returns inserted rows only.
+        cursor.execute(
+            f"WITH merged AS ("
+            f"INSERT INTO {qn(table)} ({columns}) SELECT {columns} FROM {staging} "
+            f"{on_conflict}RETURNING (xmax = 0) AS inserted) "
+            f"SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FROM merged"
+        )
+        inserted, total = cursor.fetchone()
+        # Dropped now as well: inside an outer transaction ON COMMIT fires much later.
+        cursor.execute(f"DROP TABLE {staging}")
+    return CopyResult(inserted=inserted, updated=total - inserted)
+
+
+def _copy_from(cursor: Any, sql: str, buffer: io.StringIO) -> None:
+    if hasattr(cursor, "copy_expert"):  # psycopg2
+        cursor.copy_expert(sql, buffer)
+        return
+    with cursor.copy(sql) as copy:  # psycopg 3
+        copy.write(buffer.getvalue())
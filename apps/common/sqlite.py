@@ -0,0 +1,123 @@
+# apps/common/sqlite.py
+"""
+SQLite concurrency mode, opt-in with `SQLITE_PERFORMANCE_MODE`.
+
+- Every new connection switches to WAL and the tuned pragmas in
+  `SQLITE_PRAGMAS`, so readers work on a snapshot and never wait for a writer.
+- Bulk writes from tasks run inside `single_writer()`, which lines writers up
+  on one lock (a lock file next to the database, shared by every Celery worker
+  process) before their transaction starts. Writers queue there instead of
+  colliding on SQLite's own lock, where a deferred transaction that has to
+  upgrade to a write lock fails with "database is locked" without waiting.
+
+Within one process `single_writer()` always serialises threads on SQLite (the
+database allows a single writer anyway); on other databases it does nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator
+
+from django.conf import settings
+from django.db import connections
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    # NORMAL is durable in WAL mode except for the last commits on power loss.
+    "synchronous": "NORMAL",
+    "cache_size": -64_000,  # KiB
+    "mmap_size": 256 * 1024**2,
+    "temp_store": "MEMORY",
+}
+
+_thread_lock = threading.RLock()
+_state = threading.local()
+
+
+def performance_mode_enabled() -> bool:
+    return getattr(settings, "SQLITE_PERFORMANCE_MODE", False)
+
+
+def configure_connection(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """`connection_created` receiver: apply the pragmas to new SQLite connections."""
+    if connection.vendor != "sqlite" or not performance_mode_enabled():
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", DEFAULT_PRAGMAS)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@contextmanager
+def single_writer(using: str = "default") -> Iterator[None]:
+    """
+    Hold the database's writer slot for the duration of the block.
+
+    Re-entrant, so helpers that take it can call each other. Open the write
+    transaction inside the block, not around it.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with _thread_lock:
+        depth = getattr(_state, "depth", 0)
+        handle = None
+        if depth == 0 and performance_mode_enabled() and not connection.is_in_memory_db():
+            handle = _acquire_file_lock(_lock_path(connection))
+        _state.depth = depth + 1
+        try:
+            yield
+        finally:
+            _state.depth = depth
+            if handle is not None:
+                _release_file_lock(handle)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Exclusive inter-process lock on `path` (created if missing) for the duration of the block."""
+    handle = _acquire_file_lock(path)
+    try:
+        yield
+    finally:
+        _release_file_lock(handle)
+
+
+def _lock_path(connection: Any) -> str:
+    return f"{connection.settings_dict['NAME']}.writer.lock"
+
+
+def _acquire_file_lock(path: str) -> IO[bytes]:
+    handle = open(path, "a+b")
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+
+        while True:
+            try:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                return handle
+            except OSError:
+                # LK_LOCK gives up after ~10 seconds; keep queueing.
+                continue
+    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    return handle
+
+
+def _release_file_lock(handle: IO[bytes]) -> None:
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    handle.close()
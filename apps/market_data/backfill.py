@@ -0,0 +1,295 @@
+# apps/market_data/backfill.py
+"""
+Chunked, resumable historical backfill.
+
+A backfill over N symbols and a long date range is split into fixed-size date
+chunks on a calendar grid anchored at the Unix epoch (so chunk boundaries do
+not depend on when the job runs). Each chunk is fetched, written through the
+bulk writer and checkpointed in `BackfillCheckpoint`; re-running the same (or
+an overlapping) backfill skips chunks already marked DONE. Chunks run on a
+bounded thread pool, or as a Celery chord of `backfill_chunk_task`s, so memory
+stays proportional to `workers * chunk_days` bars. Watermarks advance once
+every chunk has succeeded (in the chord's `backfill_watermarks_task` callback).
+
+The chunk containing "now" is never checkpointed: it is still filling up and
+is simply fetched again (idempotently, thanks to upserts) on the next run.
+
+With `holes_only` the coverage index decides what to fetch instead of the
+checkpoints: chunks without missing bars are skipped and the others fetch just
+their holes.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+import structlog
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from apps.common.enums import Timeframe
+from apps.common.sqlite import single_writer
+from apps.market_data.connectors.base import get_connector
+from apps.market_data.coverage import find_holes
+from apps.market_data.models import Asset, BackfillCheckpoint, IngestionWatermark, OHLCV
+from apps.market_data.services import advance_watermark, persist_ohlcv_frame
+from apps.market_data.storage.base import ensure_utc
+
+logger = structlog.get_logger(__name__)
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+# The MT5 terminal API is process-global and not thread-safe; only DB writes run concurrently.
+_FETCH_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ChunkSpec:
+    """One [start, end) window of one series."""
+
+    symbol: str
+    timeframe: Timeframe
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+@dataclass
+class BackfillReport:
+    chunks_total: int = 0
+    chunks_skipped: int = 0
+    chunks_done: int = 0
+    chunks_failed: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def plan_chunks(
+    symbols: Iterable[str],
+    timeframe: Timeframe,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+    chunk_days: int,
+) -> List[ChunkSpec]:
+    """
+    Split [start_utc, end_utc) into grid-aligned chunks for every symbol.
+
+    The first and last chunks are widened to whole grid cells, so every chunk is
+    either fully fetched or not at all and its checkpoint stays valid for any
+    later range that overlaps it.
+    """
+    start_utc = ensure_utc(start_utc)
+    end_utc = ensure_utc(end_utc)
+    width = datetime.timedelta(days=chunk_days)
+    grid_start = _EPOCH + ((start_utc - _EPOCH) // width) * width
+
+    windows = []
+    chunk_start = grid_start
+    while chunk_start < end_utc:
+        windows.append((chunk_start, chunk_start + width))
+        chunk_start += width
+
+    return [
+        ChunkSpec(symbol, timeframe, chunk_start, chunk_end)
+        for symbol in symbols
+        for chunk_start, chunk_end in windows
+    ]
+
+
+def run_chunk(spec: ChunkSpec, now: Optional[datetime.datetime] = None, holes_only: bool = False) -> int:
+    """
+    Fetch and persist one chunk (or, with `holes_only`, just its missing bars).
+    Returns the number of rows written.
+
+    Raises on fetch/write errors so the caller can record the chunk as FAILED.
+    """
+    now = now or timezone.now()
+    # Ranges are inclusive in the connector; stop just before the next chunk.
+    end = min(spec.end, now) - datetime.timedelta(microseconds=1)
+    asset, _ = Asset.objects.get_or_create(symbol=spec.symbol)
+
+    windows = [(spec.start, end)]
+    if holes_only:
+        windows = [(hole.start, hole.end) for hole in find_holes(asset, spec.timeframe.value, spec.start, end)]
+
+    rows = 0
+    for window_start, window_end in windows:
+        with _FETCH_LOCK:
+            df = get_connector().fetch_ohlcv(spec.symbol, spec.timeframe, window_start, window_end)
+        if df is None or df.empty:
+            continue
+        # Serialised on SQLite by persist_ohlcv_frame's single_writer().
+        rows += persist_ohlcv_frame(asset, spec.timeframe, df).written
+    return rows
+
+
+class BackfillOrchestrator:
+    """
+    Runs a chunked backfill on a bounded worker pool.
+
+    Example:
+        report = BackfillOrchestrator(workers=4, chunk_days=30).run(["EURUSD", "XAUUSD"], Timeframe.M1, start, end)
+        print(report.rows_per_second)
+    """
+
+    def __init__(
+        self, workers: int = 4, chunk_days: int = 30, resume: bool = True, holes_only: bool = False
+    ) -> None:
+        self.workers = max(1, workers)
+        self.chunk_days = chunk_days
+        self.resume = resume
+        self.holes_only = holes_only
+
+    def pending_chunks(self, chunks: List[ChunkSpec]) -> List[ChunkSpec]:
+        """Drop chunks already checkpointed as DONE (or, with `holes_only`, chunks without holes)."""
+        if self.holes_only:
+            return self._chunks_with_holes(chunks)
+        if not self.resume or not chunks:
+            return chunks
+        done = set(
+            BackfillCheckpoint.objects.filter(
+                asset__symbol__in={c.symbol for c in chunks},
+                timeframe=chunks[0].timeframe.value,
+                status="DONE",
+            ).values_list("asset__symbol", "chunk_start")
+        )
+        return [c for c in chunks if (c.symbol, c.start) not in done]
+
+    @staticmethod
+    def _chunks_with_holes(chunks: List[ChunkSpec]) -> List[ChunkSpec]:
+        now = timezone.now()
+        assets = {asset.symbol: asset for asset in Asset.objects.filter(symbol__in={c.symbol for c in chunks})}
+        return [
+            c
+            for c in chunks
+            if c.symbol not in assets
+            or find_holes(assets[c.symbol], c.timeframe.value, c.start, min(c.end, now) - datetime.timedelta(microseconds=1))
+        ]
+
+    def run(
+        self,
+        symbols: Iterable[str],
+        timeframe: Timeframe,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> BackfillReport:
+        symbols = list(symbols)
+        for symbol in symbols:
+            Asset.objects.get_or_create(symbol=symbol)
+
+        chunks = plan_chunks(symbols, timeframe, start_utc, end_utc, self.chunk_days)
+        pending = self.pending_chunks(chunks)
+        report = BackfillReport(chunks_total=len(chunks), chunks_skipped=len(chunks) - len(pending))
+        logger.info(
+            "Starting backfill",
+            symbols=symbols,
+            timeframe=timeframe.value,
+            chunks=len(chunks),
+            pending=len(pending),
+            workers=self.workers,
+        )
+
+        now = timezone.now()
+        started = time.perf_counter()
+        if self.workers == 1:
+            for spec in pending:
+                self._record(report, spec, *self.execute_chunk(spec, now, close_connection=False))
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+                futures = {pool.submit(self.execute_chunk, spec, now): spec for spec in pending}
+                for future in as_completed(futures):
+                    self._record(report, futures[future], *future.result())
+        report.seconds = time.perf_counter() - started
+
+        if report.chunks_failed == 0:
+            advance_backfill_watermarks(symbols, timeframe, ensure_utc(start_utc), ensure_utc(end_utc))
+
+        logger.info(
+            "Backfill finished",
+            timeframe=timeframe.value,
+            rows=report.rows,
+            seconds=round(report.seconds, 2),
+            rows_per_second=round(report.rows_per_second, 1),
+            failed=report.chunks_failed,
+        )
+        return report
+
+    def execute_chunk(self, spec: ChunkSpec, now: datetime.datetime, close_connection: bool = True):
+        """Run one chunk and checkpoint it. Returns (rows, error)."""
+        if close_connection:
+            close_old_connections()
+        started = time.perf_counter()
+        try:
+            rows, error = run_chunk(spec, now, self.holes_only), ""
+        except Exception as exc:
+            logger.exception("Backfill chunk failed", symbol=spec.symbol, start=spec.start)
+            rows, error = 0, str(exc) or exc.__class__.__name__
+        try:
+            if error or spec.end <= now:
+                with single_writer():
+                    BackfillCheckpoint.objects.update_or_create(
+                        asset=Asset.objects.get(symbol=spec.symbol),
+                        timeframe=spec.timeframe.value,
+                        chunk_start=spec.start,
+                        chunk_end=spec.end,
+                        defaults={
+                            "status": "FAILED" if error else "DONE",
+                            "rows": rows,
+                            "duration_seconds": time.perf_counter() - started,
+                            "error": error,
+                        },
+                    )
+        finally:
+            if close_connection:
+                # Each pool thread owns its own DB connection; release it with the task.
+                connection.close()
+        return rows, error
+
+    @staticmethod
+    def _record(report: BackfillReport, spec: ChunkSpec, rows: int, error: str) -> None:
+        if error:
+            report.chunks_failed += 1
+            report.failures.append(f"{spec.symbol} {spec.start:%Y-%m-%d}: {error}")
+        else:
+            report.chunks_done += 1
+            report.rows += rows
+
+
+def advance_backfill_watermarks(
+    symbols: Iterable[str],
+    timeframe: Timeframe,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+) -> None:
+    """
+    Let incremental ingestion continue from where a completed backfill of
+    [start_utc, end_utc) stopped.
+
+    Only the backfilled range is recorded: a series whose watermark it does not
+    touch keeps its watermark, so the gap in between is still fetched in full.
+    """
+    end_utc = min(end_utc, timezone.now())
+    for symbol in symbols:
+        asset = Asset.objects.get(symbol=symbol)
+        newest = (
+            OHLCV.objects.filter(
+                asset=asset, timeframe=timeframe.value, timestamp__gte=start_utc, timestamp__lte=end_utc
+            )
+            .order_by("-timestamp")
+            .values_list("timestamp", flat=True)
+            .first()
+        )
+        if newest is None:
+            continue
+        watermark = IngestionWatermark.objects.filter(asset=asset, timeframe=timeframe.value).first()
+        if watermark is not None and (start_utc > watermark.last_timestamp or end_utc < watermark.covered_from):
+            continue
+        advance_watermark(asset, timeframe, watermark, start_utc, end_utc, newest)
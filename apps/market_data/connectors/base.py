@@ -0,0 +1,75 @@
+# apps/market_data/connectors/base.py
+"""
+Connector interface for OHLCV sources.
+
+Every connector exposes `fetch_ohlcv(symbol, timeframe, start_utc, end_utc)` and
+returns a DataFrame indexed by a tz-aware UTC "timestamp" with the columns
+open/high/low/close/volume (inclusive range, empty frame when nothing matches).
+
+The active connector is chosen by `settings.MARKET_DATA_CONFIG["CONNECTOR"]`:
+  - "mt5":       the MetaTrader 5 terminal (default; Windows only)
+  - "replay":    serves bars from local JSON/CSV/Parquet files (`REPLAY_PATH`)
+  - "synthetic": generates deterministic bars on the fly, any range, any symbol
+`CONNECTOR_LATENCY_MS` adds an artificial per-call delay to the offline connectors.
+Replay connectors are shared per (path, latency), so their parsed files are
+reused across fetches.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Protocol
+
+import pandas as pd
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.common.enums import Timeframe
+
+if TYPE_CHECKING:
+    from apps.market_data.connectors.replay_connector import ReplayConnector
+
+
+class OHLCVConnector(Protocol):
+    """Interface implemented by every OHLCV source."""
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        ...
+
+
+def get_connector(name: Optional[str] = None) -> OHLCVConnector:
+    """Return the connector named by `name` (or the configured default)."""
+    from apps.market_data.storage.backends import get_market_data_config
+
+    config = get_market_data_config()
+    name = (name or config.get("CONNECTOR", "mt5")).lower()
+    latency_ms = config.get("CONNECTOR_LATENCY_MS", 0)
+
+    if name == "mt5":
+        from apps.market_data.connectors.mt5_connector import MT5Connector
+
+        return MT5Connector
+
+    if name == "replay":
+        return _replay_connector(str(Path(config.get("REPLAY_PATH", "data")).resolve()), latency_ms)
+
+    if name == "synthetic":
+        from apps.market_data.connectors.synthetic_connector import SyntheticConnector
+
+        return SyntheticConnector(seed=config.get("SYNTHETIC_SEED", 0), latency_ms=latency_ms)
+
+    raise ImproperlyConfigured(f"Unknown market data CONNECTOR '{name}'.")
+
+
+@functools.lru_cache(maxsize=None)
+def _replay_connector(path: str, latency_ms: float) -> ReplayConnector:
+    from apps.market_data.connectors.replay_connector import ReplayConnector
+
+    return ReplayConnector(path, latency_ms=latency_ms)
@@ -2,16 +2,27 @@
 import datetime
 from typing import Optional
 
-import MetaTrader5 as mt5
 import pandas as pd
 import structlog
 from django.conf import settings
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 from apps.common.enums import Timeframe
 
+try:
+    import MetaTrader5 as mt5  # Windows-only terminal bridge
+    _MT5_AVAILABLE = True
+except ImportError:
+    mt5 = None
+    _MT5_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
+
+class MT5UnavailableError(ConnectionError):
+    """Raised when the MetaTrader5 package cannot be imported (e.g. on Linux CI)."""
+
+
 class MT5Connector:
     """
     A robust, class-based connector for MetaTrader 5 with managed state.
@@ -19,12 +30,21 @@ class MT5Connector:
     _initialized = False
 
     @classmethod
-    @retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3), reraise=True)
+    @retry(
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        stop=stop_after_attempt(3),
+        retry=retry_if_not_exception_type(MT5UnavailableError),
+        reraise=True,
+    )
     def initialize(cls) -> None:
         """
         Initializes the MT5 connection if not already active.
         This method is safe to call multiple times.
         """
+        if not _MT5_AVAILABLE:
+            raise MT5UnavailableError(
+                "MetaTrader5 package is not installed; use the 'replay' or 'synthetic' connector instead."
+            )
         if cls._initialized and mt5.terminal_info() is not None:
             return
 
@@ -56,7 +76,12 @@ class MT5Connector:
             logger.info("MT5 connection shut down.")
 
     @classmethod
-    @retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3), reraise=True)
+    @retry(
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        stop=stop_after_attempt(3),
+        retry=retry_if_not_exception_type(MT5UnavailableError),
+        reraise=True,
+    )
     def fetch_ohlcv(
         cls, symbol: str, timeframe: Timeframe, start_utc: datetime.datetime, end_utc: datetime.datetime
     ) -> pd.DataFrame:
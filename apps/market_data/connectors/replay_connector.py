@@ -0,0 +1,133 @@
+# apps/market_data/connectors/replay_connector.py
+"""
+File-replay connector: serves `fetch_ohlcv` from local files instead of a broker terminal.
+
+`path` is either a single file or a directory. In a directory, series are looked
+up as `<SYMBOL>_<TIMEFRAME>.<ext>` (e.g. `EURUSD_H1.parquet`); a single file is
+served for the symbol/timeframe it declares (JSON) or for any request (CSV/Parquet).
+
+Supported formats:
+  - JSON in the `data/sample_data.json` layout: {"symbol", "timeframe", "ohlcv": [{"time", ...}]}
+    or a bare list of bar objects
+  - CSV with a `time` or `timestamp` column
+  - Parquet (e.g. files written by the Parquet OHLCV store)
+
+Files are parsed once and kept in memory; each call then costs one index slice
+plus the configured latency.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+import structlog
+
+from apps.common.enums import Timeframe
+from apps.market_data.storage.base import empty_ohlcv_frame, ensure_utc, normalize_ohlcv_frame
+
+logger = structlog.get_logger(__name__)
+
+SUFFIXES = (".parquet", ".csv", ".json")
+
+
+def read_ohlcv_file(path: Union[str, Path]) -> Tuple[pd.DataFrame, Optional[str], Optional[str]]:
+    """
+    Parse one OHLCV file.
+
+    Returns:
+        (frame in the storage contract, declared symbol or None, declared timeframe or None)
+    """
+    path = Path(path)
+    symbol = timeframe = None
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+    elif path.suffix == ".csv":
+        df = pd.read_csv(path)
+    elif path.suffix == ".json":
+        with path.open() as fh:
+            payload = json.load(fh)
+        if isinstance(payload, dict):
+            symbol, timeframe = payload.get("symbol"), payload.get("timeframe")
+            payload = payload.get("ohlcv", [])
+        df = pd.DataFrame.from_records(payload)
+    else:
+        raise ValueError(f"Unsupported OHLCV file format: {path.suffix}")
+
+    if "time" in df.columns and "timestamp" not in df.columns:
+        df = df.rename(columns={"time": "timestamp"})
+    if "tick_volume" in df.columns and "volume" not in df.columns:
+        df = df.rename(columns={"tick_volume": "volume"})
+    return normalize_ohlcv_frame(df), symbol, timeframe
+
+
+def _declared_series(path: Path) -> Tuple[Optional[str], Optional[str]]:
+    """(symbol, timeframe) from a JSON file's header, (None, None) when it declares none."""
+    try:
+        with path.open() as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(payload, dict):
+        return None, None
+    return payload.get("symbol"), payload.get("timeframe")
+
+
+class ReplayConnector:
+    """
+    Example:
+        connector = ReplayConnector("data/", latency_ms=50)
+        df = connector.fetch_ohlcv("EURUSD", Timeframe.H1, start_utc, end_utc)
+    """
+
+    def __init__(self, path: Union[str, Path], latency_ms: float = 0.0) -> None:
+        self.path = Path(path)
+        self.latency_ms = latency_ms
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, symbol: str, timeframe: str) -> Optional[Path]:
+        if self.path.is_file():
+            return self.path
+        for suffix in SUFFIXES:
+            candidate = self.path / f"{symbol}_{timeframe}{suffix}"
+            if candidate.exists():
+                return candidate
+        # Fall back to any JSON file declaring this series (e.g. data/sample_data.json).
+        if not self.path.is_dir():
+            return None
+        for candidate in sorted(self.path.glob("*.json")):
+            if _declared_series(candidate) == (symbol, timeframe):
+                return candidate
+        return None
+
+    def _frame(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self._frames:
+                frame = empty_ohlcv_frame()
+                path = self._resolve(symbol, timeframe)
+                if path is not None:
+                    df, declared_symbol, declared_tf = read_ohlcv_file(path)
+                    if declared_symbol in (None, symbol) and declared_tf in (None, timeframe):
+                        frame = df
+                logger.info("Replay series loaded", symbol=symbol, timeframe=timeframe, path=str(path), rows=len(frame))
+                self._frames[key] = frame
+            return self._frames[key]
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        frame = self._frame(symbol, timeframe.value)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return frame.loc[ensure_utc(start_utc):ensure_utc(end_utc)].copy()
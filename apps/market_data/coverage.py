@@ -0,0 +1,309 @@
+# apps/market_data/coverage.py
+"""
+Coverage index: which bars of a series are stored, and which are missing.
+
+Every OHLCV write records the contiguous runs it touched in `CoverageInterval`
+(merging with the runs already there), so "what is missing in [start, end]" is
+one indexed query over a handful of intervals instead of a scan of the bars.
+
+"Contiguous" and "missing" are judged against a `TradingCalendar`: bars are
+expected on the timeframe grid during open sessions only (Monday-Friday by
+default, every day for crypto assets), so weekend closures never show up as
+holes. Holes come back as the first and last expected-but-missing bar, ready to
+be passed to the connector as a fetch window.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import structlog
+from django.db import transaction
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset, CoverageInterval, OHLCV
+from apps.market_data.resampling import SessionCalendar, bucket_floor
+from apps.market_data.storage.backends import get_market_data_config
+from apps.market_data.storage.base import ensure_utc
+
+logger = structlog.get_logger(__name__)
+
+_WEEK = datetime.timedelta(days=7)
+_DAY_NS = 86_400 * 10**9
+ALL_WEEKDAYS = (0, 1, 2, 3, 4, 5, 6)
+# Timestamps streamed per batch when the index is rebuilt from the OHLCV table.
+REBUILD_BATCH_SIZE = 100_000
+
+
+@dataclass(frozen=True)
+class TradingCalendar:
+    """Session days (0 = Monday) on which bars are expected, in the session's timezone."""
+
+    session: SessionCalendar = SessionCalendar()
+    weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)
+
+    @classmethod
+    def for_asset(cls, asset: Asset, config: Optional[Dict[str, Any]] = None) -> "TradingCalendar":
+        config = config if config is not None else get_market_data_config()
+        if asset.asset_type == "CRYPTO":
+            weekdays = ALL_WEEKDAYS
+        else:
+            weekdays = tuple(int(day) for day in config.get("TRADING_WEEKDAYS", "0,1,2,3,4").split(","))
+        return cls(SessionCalendar.from_config(config), weekdays)
+
+    def is_open(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """True for timestamps that fall in an open session."""
+        local = index.tz_convert(self.session.timezone).tz_localize(None) - self.session.offset
+        return np.isin(local.dayofweek, self.weekdays)
+
+    def expected_index(
+        self, timeframe: Timeframe, start_utc: datetime.datetime, end_utc: datetime.datetime
+    ) -> pd.DatetimeIndex:
+        """Every expected bar open time in [start_utc, end_utc] (use for short windows)."""
+        step = pd.Timedelta(timeframe.to_timedelta())
+        origin = pd.Timestamp(bucket_floor(start_utc, timeframe, self.session))
+        if origin < pd.Timestamp(start_utc):
+            origin += step
+        grid = pd.date_range(origin, pd.Timestamp(end_utc), freq=step, name="timestamp")
+        return grid[self.is_open(grid)]
+
+    def expected_bars(
+        self, timeframe: Timeframe, start_utc: datetime.datetime, end_utc: datetime.datetime
+    ) -> int:
+        """Number of expected bars in [start_utc, end_utc], in O(1 week) regardless of the span."""
+        if end_utc < start_utc:
+            return 0
+        weeks = (end_utc - start_utc) // _WEEK
+        per_week = len(self.weekdays) * (_DAY_NS // (int(timeframe.to_timedelta().total_seconds()) * 10**9))
+        remainder = self.expected_index(timeframe, start_utc + weeks * _WEEK, end_utc)
+        return weeks * per_week + len(remainder)
+
+    def first_expected(
+        self, timeframe: Timeframe, start_utc: datetime.datetime, end_utc: datetime.datetime
+    ) -> Optional[datetime.datetime]:
+        expected = self.expected_index(timeframe, start_utc, min(end_utc, start_utc + _WEEK))
+        return expected[0].to_pydatetime() if len(expected) else None
+
+    def last_expected(
+        self, timeframe: Timeframe, start_utc: datetime.datetime, end_utc: datetime.datetime
+    ) -> Optional[datetime.datetime]:
+        expected = self.expected_index(timeframe, max(start_utc, end_utc - _WEEK), end_utc)
+        return expected[-1].to_pydatetime() if len(expected) else None
+
+
+@dataclass(frozen=True)
+class Hole:
+    """Expected bars missing from storage: [start, end] are the first/last missing bar."""
+
+    start: datetime.datetime
+    end: datetime.datetime
+    expected_bars: int
+
+
+@dataclass
+class CoverageReport:
+    symbol: str
+    timeframe: str
+    start: datetime.datetime
+    end: datetime.datetime
+    expected_bars: int = 0
+    intervals: List[Tuple[datetime.datetime, datetime.datetime, int]] = field(default_factory=list)
+    holes: List[Hole] = field(default_factory=list)
+
+    @property
+    def missing_bars(self) -> int:
+        return sum(hole.expected_bars for hole in self.holes)
+
+    @property
+    def covered_bars(self) -> int:
+        """Expected bars that are stored."""
+        return self.expected_bars - self.missing_bars
+
+    @property
+    def completeness(self) -> float:
+        if self.expected_bars == 0:
+            return 1.0
+        return max(0.0, 1.0 - self.missing_bars / self.expected_bars)
+
+
+def split_runs(
+    index: pd.DatetimeIndex, timeframe: Timeframe, calendar: TradingCalendar
+) -> List[Tuple[datetime.datetime, datetime.datetime, int]]:
+    """
+    Split sorted bar timestamps into contiguous runs.
+
+    Returns:
+        [(first bar, last bar, number of bars), ...]
+    """
+    if len(index) == 0:
+        return []
+    stamps = index.asi8
+    step_ns = int(timeframe.to_timedelta().total_seconds()) * 10**9
+    # Rounding tolerates the 23h/25h D1 gaps of DST-following sessions.
+    skipped = np.rint(np.diff(stamps) / step_ns).astype(np.int64) - 1
+
+    breaks = []
+    step = timeframe.to_timedelta()
+    for position in np.flatnonzero(skipped > 0).tolist():
+        gap_start = index[position].to_pydatetime() + step
+        gap_end = index[position + 1].to_pydatetime() - step
+        if calendar.first_expected(timeframe, gap_start, gap_end) is not None:
+            breaks.append(position + 1)
+
+    bounds = [0, *breaks, len(index)]
+    return [
+        (index[lo].to_pydatetime(), index[hi - 1].to_pydatetime(), hi - lo)
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def _adjacent(
+    timeframe: Timeframe,
+    calendar: TradingCalendar,
+    left: Tuple[datetime.datetime, datetime.datetime],
+    right: Tuple[datetime.datetime, datetime.datetime],
+) -> bool:
+    """True when two [start, end] runs overlap or only calendar closures separate them."""
+    (_, left_end), (right_start, _) = sorted([left, right])
+    step = timeframe.to_timedelta()
+    if right_start <= left_end + step:
+        return True
+    return calendar.first_expected(timeframe, left_end + step, right_start - step) is None
+
+
+def record_coverage(
+    asset: Asset,
+    timeframe: str,
+    index: pd.DatetimeIndex,
+    calendar: Optional[TradingCalendar] = None,
+) -> None:
+    """
+    Merge the bars at `index` (just written) into the series' coverage intervals.
+
+    Runs are merged with stored intervals that overlap them or that only a
+    closure separates from them; bar counts are kept exact by adding only the
+    new timestamps that fall outside every merged interval.
+    """
+    if len(index) == 0:
+        return
+    timeframe = Timeframe(timeframe)
+    calendar = calendar or TradingCalendar.for_asset(asset)
+    index = pd.DatetimeIndex(index)
+    index = (index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")).unique().sort_values()
+    stamps = index.asi8
+
+    with transaction.atomic():
+        # Serialise concurrent writers of the same asset (no-op on SQLite, which has a single writer).
+        Asset.objects.select_for_update().filter(pk=asset.pk).first()
+        series = CoverageInterval.objects.filter(asset=asset, timeframe=timeframe.value)
+
+        for run_start, run_end, _ in split_runs(index, timeframe, calendar):
+            neighbours = [
+                interval
+                for interval in series.filter(start__lte=run_end + _WEEK, end__gte=run_start - _WEEK)
+                if _adjacent(timeframe, calendar, (interval.start, interval.end), (run_start, run_end))
+            ]
+            lo = np.searchsorted(stamps, pd.Timestamp(run_start).value, side="left")
+            hi = np.searchsorted(stamps, pd.Timestamp(run_end).value, side="right")
+            fresh = np.ones(hi - lo, dtype=bool)
+            for interval in neighbours:
+                run_stamps = stamps[lo:hi]
+                fresh &= (run_stamps < pd.Timestamp(interval.start).value) | (run_stamps > pd.Timestamp(interval.end).value)
+
+            merged_start = min([run_start, *(i.start for i in neighbours)])
+            merged_end = max([run_end, *(i.end for i in neighbours)])
+            bars = int(fresh.sum()) + sum(i.bars for i in neighbours)
+            series.filter(pk__in=[i.pk for i in neighbours]).delete()
+            CoverageInterval.objects.create(
+                asset=asset, timeframe=timeframe.value, start=merged_start, end=merged_end, bars=bars
+            )
+
+
+def rebuild_coverage(asset: Asset, timeframe: str, calendar: Optional[TradingCalendar] = None) -> int:
+    """
+    Recompute a series' coverage from the OHLCV table (for bars stored before the
+    index existed). Returns the number of intervals.
+    """
+    calendar = calendar or TradingCalendar.for_asset(asset)
+    CoverageInterval.objects.filter(asset=asset, timeframe=timeframe).delete()
+
+    timestamps = (
+        OHLCV.objects.filter(asset=asset, timeframe=timeframe)
+        .order_by("timestamp")
+        .values_list("timestamp", flat=True)
+        .iterator(chunk_size=REBUILD_BATCH_SIZE)
+    )
+    batch: List[datetime.datetime] = []
+    for ts in timestamps:
+        batch.append(ts)
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            record_coverage(asset, timeframe, pd.DatetimeIndex(batch), calendar)
+            batch = []
+    if batch:
+        record_coverage(asset, timeframe, pd.DatetimeIndex(batch), calendar)
+    return CoverageInterval.objects.filter(asset=asset, timeframe=timeframe).count()
+
+
+def find_holes(
+    asset: Asset,
+    timeframe: str,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+    calendar: Optional[TradingCalendar] = None,
+) -> List[Hole]:
+    """Missing expected bars in [start_utc, end_utc], from the coverage index alone."""
+    return coverage_report(asset, timeframe, start_utc, end_utc, calendar).holes
+
+
+def coverage_report(
+    asset: Asset,
+    timeframe: str,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+    calendar: Optional[TradingCalendar] = None,
+) -> CoverageReport:
+    """Covered intervals, holes and completeness of a series over [start_utc, end_utc]."""
+    timeframe = Timeframe(timeframe)
+    calendar = calendar or TradingCalendar.for_asset(asset)
+    start_utc, end_utc = ensure_utc(start_utc), ensure_utc(end_utc)
+    step = timeframe.to_timedelta()
+
+    intervals = list(
+        CoverageInterval.objects.filter(
+            asset=asset, timeframe=timeframe.value, start__lte=end_utc, end__gte=start_utc
+        )
+        .order_by("start")
+        .values_list("start", "end", "bars")
+    )
+    report = CoverageReport(
+        asset.symbol, timeframe.value, start_utc, end_utc,
+        expected_bars=calendar.expected_bars(timeframe, start_utc, end_utc),
+        intervals=intervals,
+    )
+
+    cursor = start_utc
+    for interval_start, interval_end, _ in intervals:
+        _append_hole(report.holes, calendar, timeframe, cursor, interval_start - step)
+        cursor = max(cursor, interval_end + step)
+    _append_hole(report.holes, calendar, timeframe, cursor, end_utc)
+    return report
+
+
+def _append_hole(
+    holes: List[Hole],
+    calendar: TradingCalendar,
+    timeframe: Timeframe,
+    gap_start: datetime.datetime,
+    gap_end: datetime.datetime,
+) -> None:
+    if gap_end < gap_start:
+        return
+    first = calendar.first_expected(timeframe, gap_start, gap_end)
+    if first is None:
+        return
+    last = calendar.last_expected(timeframe, gap_start, gap_end)
+    holes.append(Hole(first, last, calendar.expected_bars(timeframe, first, last)))
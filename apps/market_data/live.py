@@ -0,0 +1,346 @@
+# apps/market_data/live.py
+"""
+Live bar aggregation: ticks or partial bars in, "bar closed" events out.
+
+`BarAggregator` keeps the forming bar of every (symbol, timeframe) in memory.
+It is fed either
+  - `on_tick(symbol, ts, price, volume)` from a tick stream, or
+  - `on_bars(symbol, df)` with the connector's latest base bars, the last of
+    which is still forming (MT5 `copy_rates_range` returns it with the
+    current tick folded in).
+A base bar closes when a newer one arrives (or `flush` finds its end has
+passed); higher timeframes are folded from the base bars with the resampling
+calendar and close when the first base bar of the next bucket shows up.
+
+Each closed bar is published as a `BarClosed` event to the subscribed
+handlers, in subscription order:
+  - `AsyncBarWriter` queues it for `persist_ohlcv_frame` on a background thread;
+  - `FrameCacheFeeder` appends it to the process-wide frame cache, so the
+    analysis that follows reads it without waiting for the write;
+  - `DecisionTrigger` runs `DecisionManager` for the decision timeframe.
+
+`manage.py run_live_bars` wires these together around a polling loop.
+"""
+
+from __future__ import annotations
+
+import datetime
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import structlog
+from django.db import connection
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset
+from apps.market_data.resampling import SessionCalendar, bucket_floor, can_resample
+from apps.market_data.storage.base import OHLCV_COLUMNS, ensure_utc, normalize_ohlcv_frame
+from apps.market_data.storage.frame_cache import OHLCVFrameCache
+
+logger = structlog.get_logger(__name__)
+
+# open, high, low, close, volume
+BarValues = List[float]
+
+
+@dataclass(frozen=True)
+class BarClosed:
+    """A finished bar; `bar` is a one-row frame in the storage contract."""
+
+    symbol: str
+    timeframe: Timeframe
+    bar: pd.DataFrame
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        return self.bar.index[0].to_pydatetime()
+
+
+BarHandler = Callable[[BarClosed], None]
+
+
+@dataclass
+class _FormingBar:
+    open_time: datetime.datetime
+    values: BarValues
+
+
+@dataclass
+class _FormingBucket:
+    open_time: datetime.datetime
+    # base bars of the bucket by open time; the last one may still be updated
+    base: Dict[datetime.datetime, BarValues]
+
+    def values(self) -> BarValues:
+        bars = list(self.base.values())
+        return [
+            bars[0][0],
+            max(bar[1] for bar in bars),
+            min(bar[2] for bar in bars),
+            bars[-1][3],
+            sum(bar[4] for bar in bars),
+        ]
+
+
+def _bar_frame(open_time: datetime.datetime, values: BarValues) -> pd.DataFrame:
+    index = pd.DatetimeIndex([pd.Timestamp(open_time)], name="timestamp")
+    return normalize_ohlcv_frame(pd.DataFrame([values], columns=OHLCV_COLUMNS, index=index))
+
+
+class BarAggregator:
+    """
+    Builds `base` bars and the `targets` derived from them for any number of symbols.
+
+    Example:
+        aggregator = BarAggregator(Timeframe.M1, [Timeframe.H1])
+        aggregator.subscribe(lambda event: print(event.symbol, event.timeframe, event.timestamp))
+        aggregator.on_bars("EURUSD", connector.fetch_ohlcv("EURUSD", Timeframe.M1, since, now))
+    """
+
+    def __init__(
+        self,
+        base: Timeframe,
+        targets: Iterable[Timeframe] = (),
+        session: Optional[SessionCalendar] = None,
+    ) -> None:
+        self.base = base
+        self.targets = [tf for tf in targets if tf != base]
+        for target in self.targets:
+            if not can_resample(base, target):
+                raise ValueError(f"{target.value} bars cannot be built from {base.value} bars.")
+        self.session = session or SessionCalendar()
+        self._handlers: List[BarHandler] = []
+        self._forming: Dict[str, _FormingBar] = {}
+        self._buckets: Dict[Tuple[str, Timeframe], _FormingBucket] = {}
+        # open time of the last closed bar per (symbol, timeframe); older updates are late and dropped
+        self._closed: Dict[Tuple[str, Timeframe], datetime.datetime] = {}
+        self._muted = False
+        self._lock = threading.RLock()
+
+    def subscribe(self, handler: BarHandler) -> None:
+        self._handlers.append(handler)
+
+    def on_tick(self, symbol: str, ts: datetime.datetime, price: float, volume: float = 0) -> None:
+        """Fold one trade/quote into the forming base bar."""
+        ts = ensure_utc(ts)
+        open_time = bucket_floor(ts, self.base, self.session)
+        with self._lock:
+            forming = self._forming.get(symbol)
+            if forming is not None and forming.open_time == open_time:
+                o, h, l, _, v = forming.values
+                values = [o, max(h, price), min(l, price), price, v + volume]
+            else:
+                values = [price, price, price, price, volume]
+            self._update_base(symbol, open_time, values)
+
+    def on_bars(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Take the latest base bars as reported by the connector (oldest first).
+
+        Repeated bars replace what was seen before; bars older than the last
+        closed one are ignored.
+        """
+        frame = normalize_ohlcv_frame(df)
+        rows = frame.to_numpy(dtype=float).tolist()
+        with self._lock:
+            for ts, values in zip(frame.index.to_pydatetime(), rows):
+                self._update_base(symbol, ts, values)
+
+    def prime(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Feed history without publishing anything, e.g. the base bars since the
+        start of the current bucket of every target when the feed starts.
+        """
+        with self._lock:
+            self._muted = True
+            try:
+                self.on_bars(symbol, df)
+            finally:
+                self._muted = False
+
+    def flush(self, now: datetime.datetime) -> List[BarClosed]:
+        """
+        Close every bar whose period ended at or before `now`.
+
+        Needed for tick feeds and quiet markets, where no newer bar arrives to
+        close the forming one. Pass the wall clock minus a grace period so the
+        connector can still deliver the final values.
+        """
+        now = ensure_utc(now)
+        closed: List[BarClosed] = []
+        with self._lock:
+            for symbol, forming in list(self._forming.items()):
+                if self._bucket_end(forming.open_time, self.base) <= now:
+                    del self._forming[symbol]
+                    closed.append(self._close(symbol, self.base, forming.open_time, forming.values))
+            for (symbol, target), bucket in list(self._buckets.items()):
+                if self._bucket_end(bucket.open_time, target) <= now:
+                    del self._buckets[(symbol, target)]
+                    closed.append(self._close(symbol, target, bucket.open_time, bucket.values()))
+        return [event for event in closed if event is not None]
+
+    def forming(self, symbol: str, timeframe: Timeframe) -> Optional[pd.DataFrame]:
+        """Snapshot of the forming bar, or None when there is none."""
+        with self._lock:
+            if timeframe == self.base:
+                forming = self._forming.get(symbol)
+                return _bar_frame(forming.open_time, forming.values) if forming else None
+            bucket = self._buckets.get((symbol, timeframe))
+            return _bar_frame(bucket.open_time, bucket.values()) if bucket else None
+
+    def last_closed(self, symbol: str, timeframe: Timeframe) -> Optional[datetime.datetime]:
+        return self._closed.get((symbol, timeframe))
+
+    def _bucket_end(self, open_time: datetime.datetime, timeframe: Timeframe) -> datetime.datetime:
+        # Floor half a bar past the nominal end: session days are 23h/25h across DST changes.
+        return bucket_floor(open_time + timeframe.to_timedelta() * 1.5, timeframe, self.session)
+
+    def _update_base(self, symbol: str, open_time: datetime.datetime, values: BarValues) -> None:
+        last_closed = self._closed.get((symbol, self.base))
+        if last_closed is not None and open_time <= last_closed:
+            return
+        forming = self._forming.get(symbol)
+        if forming is not None and open_time < forming.open_time:
+            return
+        if forming is not None and open_time > forming.open_time:
+            self._close(symbol, self.base, forming.open_time, forming.values)
+        self._forming[symbol] = _FormingBar(open_time, values)
+
+        for target in self.targets:
+            bucket_open = bucket_floor(open_time, target, self.session)
+            last_closed = self._closed.get((symbol, target))
+            if last_closed is not None and bucket_open <= last_closed:
+                continue
+            key = (symbol, target)
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket_open > bucket.open_time:
+                self._close(symbol, target, bucket.open_time, bucket.values())
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[key] = _FormingBucket(bucket_open, {})
+            bucket.base[open_time] = values
+
+    def _close(
+        self, symbol: str, timeframe: Timeframe, open_time: datetime.datetime, values: BarValues
+    ) -> Optional[BarClosed]:
+        self._closed[(symbol, timeframe)] = open_time
+        if self._muted:
+            return None
+        event = BarClosed(symbol, timeframe, _bar_frame(open_time, values))
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception(
+                    "Bar-closed handler failed",
+                    handler=getattr(handler, "__name__", type(handler).__name__),
+                    symbol=symbol,
+                    timeframe=timeframe.value,
+                )
+        return event
+
+
+class _AssetLookup:
+    def __init__(self) -> None:
+        self._assets: Dict[str, Asset] = {}
+
+    def asset(self, symbol: str) -> Asset:
+        if symbol not in self._assets:
+            self._assets[symbol], _ = Asset.objects.get_or_create(symbol=symbol)
+        return self._assets[symbol]
+
+
+class FrameCacheFeeder(_AssetLookup):
+    """
+    Appends closed bars to the frame cache. A series that is not cached yet is
+    first warmed with `warmup` of history from the store.
+    """
+
+    def __init__(self, cache: OHLCVFrameCache, warmup: Dict[Timeframe, datetime.timedelta]) -> None:
+        super().__init__()
+        self.cache = cache
+        self.warmup = warmup
+
+    def __call__(self, event: BarClosed) -> None:
+        if event.timeframe not in self.warmup:
+            return
+        asset = self.asset(event.symbol)
+        timeframe = event.timeframe.value
+        if not self.cache.append(asset, timeframe, event.bar):
+            start_utc = event.timestamp - self.warmup[event.timeframe]
+            self.cache.get(asset, timeframe, start_utc, event.timestamp)
+            self.cache.append(asset, timeframe, event.bar)
+
+
+class DecisionTrigger:
+    """Runs `DecisionManager` as soon as a bar of the decision timeframe closes."""
+
+    def __init__(self, timeframes: Iterable[Timeframe]) -> None:
+        self.timeframes = set(timeframes)
+
+    def __call__(self, event: BarClosed) -> None:
+        if event.timeframe not in self.timeframes:
+            return
+        from apps.trading_core.decision_manager import DecisionManager
+
+        logger.info("Bar closed, running decision", symbol=event.symbol, timeframe=event.timeframe.value)
+        DecisionManager(event.symbol, event.timeframe.value).run_analysis()
+
+
+class AsyncBarWriter(_AssetLookup):
+    """
+    Persists closed bars on a background thread through `persist_ohlcv_frame`,
+    so the decision path never waits for the database. Bars queued while a
+    write is running are written together, one batch per series.
+    """
+
+    def __init__(self, timeframes: Optional[Iterable[Timeframe]] = None) -> None:
+        super().__init__()
+        self.timeframes = set(timeframes) if timeframes is not None else None
+        self._queue: "queue.Queue[Optional[BarClosed]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def __call__(self, event: BarClosed) -> None:
+        if self.timeframes is None or event.timeframe in self.timeframes:
+            self._queue.put(event)
+
+    def start(self) -> "AsyncBarWriter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="live-bar-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write everything still queued, then stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            running = True
+            while running:
+                events = [self._queue.get()]
+                while not self._queue.empty():
+                    events.append(self._queue.get_nowait())
+                if events[-1] is None:
+                    running = False
+                self.write([event for event in events if event is not None])
+        finally:
+            connection.close()
+
+    def write(self, events: List[BarClosed]) -> None:
+        from apps.market_data.services import persist_ohlcv_frame
+
+        series: Dict[Tuple[str, Timeframe], List[pd.DataFrame]] = {}
+        for event in events:
+            series.setdefault((event.symbol, event.timeframe), []).append(event.bar)
+        for (symbol, timeframe), bars in series.items():
+            try:
+                persist_ohlcv_frame(self.asset(symbol), timeframe, pd.concat(bars), upsert=True)
+            except Exception:
+                logger.exception("Failed to persist live bars", symbol=symbol, timeframe=timeframe.value)
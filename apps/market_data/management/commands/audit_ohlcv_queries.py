@@ -0,0 +1,82 @@
+# apps/market_data/management/commands/audit_ohlcv_queries.py
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.utils import timezone
+
+from apps.market_data.models import Asset
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+
+# Plan fragments that mean the scan never visits the table rows.
+INDEX_ONLY_MARKERS = {
+    "sqlite": "USING COVERING INDEX",
+    "postgresql": "Index Only Scan",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints query plans and timings of the OHLCV loader queries, and whether each one "
+        "is answered by an index-only scan (SQLite and PostgreSQL)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "symbols", nargs="+", type=str, help="Symbols to load (the first one for single-series loads)."
+        )
+        parser.add_argument("--timeframe", type=str, default="H1")
+        parser.add_argument("--days", type=int, default=100, help="Length of the loaded window, ending now.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query.")
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="PostgreSQL only: EXPLAIN ANALYZE, BUFFERS (executes the queries).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        assets = list(Asset.objects.filter(symbol__in=options["symbols"]))
+        if not assets:
+            raise CommandError("None of the given symbols exist.")
+        assets.sort(key=lambda asset: options["symbols"].index(asset.symbol))
+
+        end_utc = timezone.now()
+        start_utc = end_utc - datetime.timedelta(days=options["days"])
+        timeframe = options["timeframe"]
+        vendor = connection.vendor
+        marker = INDEX_ONLY_MARKERS.get(vendor)
+        explain_options = {}
+        if options["analyze"] and vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+
+        store = ORMOHLCVStore(fast_path=True)
+        queries = store.loader_querysets(assets, timeframe, start_utc, end_utc)
+        self.stdout.write(f"Database: {vendor}; window: {options['days']} days of {timeframe}.")
+
+        for name, queryset in queries.items():
+            plan = queryset.explain(**explain_options)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}"))
+            self.stdout.write(plan)
+            if marker is None:
+                continue
+            if marker in plan:
+                self.stdout.write(self.style.SUCCESS(f"index-only: yes ({marker})"))
+            else:
+                self.stdout.write(self.style.WARNING("index-only: no"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nTimings (median of runs)"))
+        timed = {
+            "load (fast path)": lambda: store.load(assets[0], timeframe, start_utc, end_utc),
+            "load (classic)": lambda: ORMOHLCVStore().load(assets[0], timeframe, start_utc, end_utc),
+            "load_many": lambda: store.load_many(assets, timeframe, start_utc, end_utc),
+        }
+        for name, load in timed.items():
+            durations = []
+            rows = 0
+            for _ in range(max(1, options["repeat"])):
+                started = time.perf_counter()
+                rows = len(load())
+                durations.append(time.perf_counter() - started)
+            self.stdout.write(f"{name:<18} {rows:>9,} rows  {statistics.median(durations) * 1000:>9.2f} ms")
@@ -0,0 +1,97 @@
+# apps/market_data/management/commands/backfill_ohlcv.py
+import datetime
+
+from celery import chord
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.common.enums import Timeframe
+from apps.market_data.backfill import BackfillOrchestrator, plan_chunks
+from apps.market_data.storage.backends import get_market_data_config
+from apps.market_data.tasks import backfill_chunk_task, backfill_watermarks_task
+
+
+class Command(BaseCommand):
+    help = "Backfills historical OHLCV data in resumable date chunks across one or more symbols."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        config = get_market_data_config()
+        parser.add_argument("symbols", nargs="+", type=str, help="Trading symbols (e.g. EURUSD XAUUSD)")
+        parser.add_argument("--timeframe", type=str, default="H1", help="Timeframe to backfill (e.g. M1, H1).")
+        parser.add_argument("--days", type=int, default=3650, help="Number of days back to backfill.")
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=config.get("BACKFILL_CHUNK_DAYS", 30),
+            help="Width of one date chunk in days.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=config.get("BACKFILL_WORKERS", 4),
+            help="Concurrent chunks in this process.",
+        )
+        parser.add_argument(
+            "--no-resume", action="store_true", help="Re-fetch chunks that were already checkpointed."
+        )
+        parser.add_argument(
+            "--holes-only",
+            action="store_true",
+            help="Fetch only the bars the coverage index reports as missing (ignores checkpoints).",
+        )
+        parser.add_argument(
+            "--celery",
+            action="store_true",
+            help="Dispatch the chunks as a Celery chord instead of running them here.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            timeframe = Timeframe(options["timeframe"])
+        except ValueError:
+            raise CommandError(f"Unknown timeframe '{options['timeframe']}'.")
+
+        end_utc = timezone.now()
+        start_utc = end_utc - datetime.timedelta(days=options["days"])
+        orchestrator = BackfillOrchestrator(
+            workers=options["workers"],
+            chunk_days=options["chunk_days"],
+            resume=not options["no_resume"],
+            holes_only=options["holes_only"],
+        )
+
+        if options["celery"]:
+            chunks = orchestrator.pending_chunks(
+                plan_chunks(options["symbols"], timeframe, start_utc, end_utc, options["chunk_days"])
+            )
+            # The callback only runs once every chunk has succeeded, like the in-process run.
+            result = chord(
+                backfill_chunk_task.s(
+                    spec.symbol,
+                    timeframe.value,
+                    spec.start.isoformat(),
+                    spec.end.isoformat(),
+                    options["chunk_days"],
+                    options["holes_only"],
+                )
+                for spec in chunks
+            )(
+                backfill_watermarks_task.s(
+                    options["symbols"], timeframe.value, start_utc.isoformat(), end_utc.isoformat()
+                )
+            )
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(chunks)} backfill chunks (chord {result.id})."))
+            return
+
+        report = orchestrator.run(options["symbols"], timeframe, start_utc, end_utc)
+        self.stdout.write(
+            f"Chunks: {report.chunks_total} total, {report.chunks_skipped} skipped, "
+            f"{report.chunks_done} done, {report.chunks_failed} failed."
+        )
+        for failure in report.failures:
+            self.stdout.write(self.style.WARNING(f"  failed: {failure}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {report.rows} bars in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/sec)."
+            )
+        )
@@ -0,0 +1,113 @@
+# apps/market_data/management/commands/benchmark_ingestion.py
+import datetime
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.common.enums import Timeframe
+from apps.market_data.backfill import BackfillOrchestrator
+from apps.market_data.connectors.base import get_connector
+from apps.market_data.models import Asset
+from apps.market_data.services import ingest_ohlcv_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks OHLCV ingestion (and optionally the full analysis chain) against an "
+        "offline connector, without a MetaTrader 5 terminal."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--connector", choices=["synthetic", "replay"], default="synthetic")
+        parser.add_argument("--replay-path", type=str, help="File or directory for the replay connector.")
+        parser.add_argument("--symbol", type=str, default="BENCH", help="Symbol to ingest (created if missing).")
+        parser.add_argument("--timeframe", type=str, default="M1")
+        parser.add_argument("--days", type=int, default=365, help="Length of the ingested range.")
+        parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial latency per fetch call.")
+        parser.add_argument(
+            "--workers", type=int, default=0, help="Use the chunked backfill with this many workers (0 = single call)."
+        )
+        parser.add_argument("--chunk-days", type=int, default=30)
+        parser.add_argument(
+            "--chain", action="store_true", help="Also run the full analysis chain eagerly (no broker needed)."
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the ingested bars (assets that already existed are always kept)."
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            timeframe = Timeframe(options["timeframe"])
+        except ValueError:
+            raise CommandError(f"Unknown timeframe '{options['timeframe']}'.")
+
+        config = {
+            **settings.MARKET_DATA_CONFIG,
+            "CONNECTOR": options["connector"],
+            "CONNECTOR_LATENCY_MS": options["latency_ms"],
+        }
+        if options["replay_path"]:
+            config["REPLAY_PATH"] = options["replay_path"]
+
+        symbol = options["symbol"]
+        existed = Asset.objects.filter(symbol=symbol).exists()
+        end_utc = timezone.now()
+        start_utc = end_utc - datetime.timedelta(days=options["days"])
+
+        with override_settings(MARKET_DATA_CONFIG=config):
+            if options["connector"] == "replay":
+                # Parse the replay file before the clock starts; later fetches reuse it.
+                get_connector().fetch_ohlcv(symbol, timeframe, start_utc, start_utc)
+            started = time.perf_counter()
+            if options["workers"]:
+                report = BackfillOrchestrator(
+                    workers=options["workers"], chunk_days=options["chunk_days"], resume=False
+                ).run([symbol], timeframe, start_utc, end_utc)
+                rows = report.rows
+            else:
+                rows = ingest_ohlcv_data(symbol, timeframe, start_utc, end_utc, incremental=False)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Ingested {rows:,} {timeframe.value} bars for {symbol} in {elapsed:.2f}s "
+                    f"({rows / elapsed if elapsed else 0:,.0f} rows/sec) via '{options['connector']}'."
+                )
+            )
+
+            if options["chain"]:
+                self._run_chain(symbol, timeframe, start_utc, end_utc)
+
+        if not options["keep"] and not existed:
+            # Cascades to the benchmark asset's bars, watermarks and checkpoints.
+            Asset.objects.filter(symbol=symbol).delete()
+
+    def _run_chain(self, symbol: str, timeframe: Timeframe, start_utc, end_utc) -> None:
+        from celery import chain
+
+        from apps.analytics.tasks import (
+            generate_feature_vectors_task,
+            scan_for_candidate_patterns,
+            update_asset_regime_task,
+            verify_pattern_candidates_task,
+        )
+        from apps.market_data.tasks import ingest_historical_data_task, trigger_decision_manager
+
+        workflow = chain(
+            ingest_historical_data_task.s(
+                symbol=symbol, timeframe_str=timeframe.value, start_utc=start_utc, end_utc=end_utc
+            ),
+            update_asset_regime_task.s(),
+            scan_for_candidate_patterns.s(),
+            verify_pattern_candidates_task.s(),
+            generate_feature_vectors_task.s(),
+            trigger_decision_manager.s(),
+        )
+        started = time.perf_counter()
+        # apply() runs every task in-process, so no broker or worker is required.
+        result = workflow.apply()
+        elapsed = time.perf_counter() - started
+        status = self.style.SUCCESS if result.successful() else self.style.ERROR
+        self.stdout.write(status(f"Analysis chain finished in {elapsed:.2f}s (state: {result.state})."))
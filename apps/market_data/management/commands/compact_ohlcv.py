@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.backends import get_archive_store, get_market_data_config
+from apps.market_data.storage.tiered_store import compact_series, hot_cutoff
+
+
+class Command(BaseCommand):
+    help = "Moves OHLCV bars older than the hot retention horizon into the compressed Parquet archive."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--symbol", type=str, help="Only compact this symbol (default: all assets).")
+        parser.add_argument("--timeframe", type=str, help="Only compact this timeframe (default: all stored).")
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help=(
+                "Bars newer than this stay in the OHLCV table. "
+                "Defaults to MARKET_DATA_CONFIG['HOT_RETENTION_DAYS']."
+            ),
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Compact with ARCHIVE_ENABLED off; loaders will not see the archived bars until it is on.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        config = get_market_data_config()
+        if not config.get("ARCHIVE_ENABLED", False) and not options["dry_run"]:
+            if not options["force"]:
+                raise CommandError(
+                    "ARCHIVE_ENABLED is off: loaders would stop seeing the compacted bars. "
+                    "Enable the archive first, or pass --force."
+                )
+            self.stdout.write(
+                self.style.WARNING("ARCHIVE_ENABLED is off: archived bars will not be read until it is enabled.")
+            )
+
+        retention_days = options["retention_days"] or config.get("HOT_RETENTION_DAYS", 120)
+        cutoff = hot_cutoff(retention_days)
+        archive = get_archive_store()
+
+        assets = Asset.objects.all()
+        if options["symbol"]:
+            assets = assets.filter(symbol=options["symbol"])
+
+        for asset in assets:
+            timeframes = OHLCV.objects.filter(asset=asset).values_list("timeframe", flat=True).distinct()
+            if options["timeframe"]:
+                timeframes = [tf for tf in timeframes if tf == options["timeframe"]]
+
+            for timeframe in timeframes:
+                result = compact_series(asset, timeframe, archive, cutoff, dry_run=options["dry_run"])
+                if not result.archived:
+                    continue
+                verb = "Would archive" if options["dry_run"] else "Archived"
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{verb} {result.archived} bars of {asset.symbol} {timeframe} "
+                        f"({result.months} months before {cutoff:%Y-%m-%d})."
+                    )
+                )
@@ -0,0 +1,63 @@
+# apps/market_data/management/commands/ohlcv_coverage.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.common.enums import Timeframe
+from apps.market_data.coverage import coverage_report, rebuild_coverage
+from apps.market_data.models import Asset
+from apps.market_data.services import fill_coverage_holes
+
+
+class Command(BaseCommand):
+    help = "Reports missing OHLCV bars per series from the coverage index, and optionally fetches exactly those."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("symbols", nargs="+", type=str, help="Trading symbols (e.g. EURUSD XAUUSD)")
+        parser.add_argument("--timeframe", type=str, default="H1")
+        parser.add_argument("--days", type=int, default=365, help="Length of the checked window, ending now.")
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute the index from the stored bars first (for data stored before the index existed).",
+        )
+        parser.add_argument("--fill", action="store_true", help="Fetch the missing ranges from the connector.")
+        parser.add_argument("--max-holes", type=int, default=20, help="Holes listed per series.")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            timeframe = Timeframe(options["timeframe"])
+        except ValueError:
+            raise CommandError(f"Unknown timeframe '{options['timeframe']}'.")
+
+        end_utc = timezone.now()
+        start_utc = end_utc - datetime.timedelta(days=options["days"])
+
+        for symbol in options["symbols"]:
+            asset = Asset.objects.filter(symbol=symbol).first()
+            if asset is None and not options["fill"]:
+                self.stdout.write(self.style.WARNING(f"{symbol}: unknown symbol."))
+                continue
+
+            if asset is not None and options["rebuild"]:
+                intervals = rebuild_coverage(asset, timeframe.value)
+                self.stdout.write(f"{symbol}: rebuilt coverage index ({intervals} intervals).")
+
+            if options["fill"]:
+                rows = fill_coverage_holes(symbol, timeframe, start_utc, end_utc)
+                self.stdout.write(f"{symbol}: fetched {rows} missing bars.")
+                asset = Asset.objects.get(symbol=symbol)
+
+            report = coverage_report(asset, timeframe.value, start_utc, end_utc)
+            style = self.style.SUCCESS if not report.holes else self.style.WARNING
+            self.stdout.write(
+                style(
+                    f"{symbol} {timeframe.value}: {report.covered_bars}/{report.expected_bars} expected bars "
+                    f"({report.completeness:.2%}), {len(report.holes)} holes, {report.missing_bars} missing."
+                )
+            )
+            for hole in report.holes[: options["max_holes"]]:
+                self.stdout.write(f"  {hole.start:%Y-%m-%d %H:%M} -> {hole.end:%Y-%m-%d %H:%M}  ({hole.expected_bars} bars)")
+            if len(report.holes) > options["max_holes"]:
+                self.stdout.write(f"  ... {len(report.holes) - options['max_holes']} more")
@@ -0,0 +1,110 @@
+# apps/market_data/management/commands/run_live_bars.py
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.common.enums import Timeframe
+from apps.market_data.connectors.base import get_connector
+from apps.market_data.live import AsyncBarWriter, BarAggregator, DecisionTrigger, FrameCacheFeeder
+from apps.market_data.resampling import SessionCalendar, bucket_floor
+from apps.market_data.storage.backends import get_market_data_config
+from apps.market_data.storage.frame_cache import get_frame_cache
+
+
+def _timeframe(value: str) -> Timeframe:
+    try:
+        return Timeframe(value)
+    except ValueError:
+        raise CommandError(f"Unknown timeframe '{value}'.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Polls the connector's forming base bars, builds the higher timeframes in memory and runs "
+        "the DecisionManager the moment a decision bar closes; bars are persisted in the background."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        config = get_market_data_config()
+        parser.add_argument("symbols", nargs="+", type=str, help="Trading symbols (e.g. EURUSD XAUUSD)")
+        parser.add_argument("--base", type=str, default=config.get("BASE_TIMEFRAME", "M1"), help="Polled timeframe.")
+        parser.add_argument(
+            "--timeframes",
+            nargs="+",
+            default=["H1", "D1"],
+            help="Timeframes built from the base bars and kept current in the frame cache.",
+        )
+        parser.add_argument("--decision-timeframe", type=str, default="H1")
+        parser.add_argument(
+            "--poll", type=float, default=config.get("LIVE_POLL_SECONDS", 0.5), help="Seconds between polls."
+        )
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=config.get("LIVE_CLOSE_GRACE_SECONDS", 2.0),
+            help="Seconds after a bar's end before it is closed without a newer bar.",
+        )
+        parser.add_argument("--no-decisions", action="store_true", help="Only build, cache and persist bars.")
+        parser.add_argument("--no-persist", action="store_true", help="Do not write closed bars to the database.")
+
+    def handle(self, *args, **options) -> None:
+        config = get_market_data_config()
+        cache = get_frame_cache()
+        if cache is None:
+            raise CommandError(
+                "The live feed hands bars to the analysis through the frame cache; enable FRAME_CACHE_ENABLED."
+            )
+
+        base = _timeframe(options["base"])
+        targets = [_timeframe(tf) for tf in options["timeframes"]]
+        decision = _timeframe(options["decision_timeframe"])
+        if decision != base and decision not in targets:
+            targets.append(decision)
+
+        session = SessionCalendar.from_config(config)
+        try:
+            aggregator = BarAggregator(base, targets, session)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        writer = None
+        if not options["no_persist"]:
+            writer = AsyncBarWriter().start()
+            aggregator.subscribe(writer)
+        warmup = datetime.timedelta(days=config.get("LIVE_WARMUP_DAYS", 100))
+        aggregator.subscribe(FrameCacheFeeder(cache, {tf: warmup for tf in [*targets, decision]}))
+        if not options["no_decisions"]:
+            aggregator.subscribe(DecisionTrigger([decision]))
+
+        connector = get_connector()
+        symbols = options["symbols"]
+        now = timezone.now()
+        prime_from = min(bucket_floor(now, tf, session) for tf in [base, *targets])
+        for symbol in symbols:
+            aggregator.prime(symbol, connector.fetch_ohlcv(symbol, base, prime_from, now))
+
+        self.stdout.write(
+            f"Live bars for {', '.join(symbols)}: {base.value} -> {', '.join(tf.value for tf in targets)}, "
+            f"decisions on {decision.value}{' (off)' if options['no_decisions'] else ''}."
+        )
+        lookback = base.to_timedelta() * 2
+        grace = datetime.timedelta(seconds=options["grace"])
+        try:
+            while True:
+                started = time.monotonic()
+                now = timezone.now()
+                for symbol in symbols:
+                    since = aggregator.last_closed(symbol, base) or now - lookback
+                    try:
+                        aggregator.on_bars(symbol, connector.fetch_ohlcv(symbol, base, since, now))
+                    except Exception as exc:
+                        self.stderr.write(f"{symbol}: poll failed: {exc}")
+                aggregator.flush(now - grace)
+                time.sleep(max(0.0, options["poll"] - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping live bars.")
+        finally:
+            if writer is not None:
+                writer.stop()
@@ -0,0 +1,42 @@
+# apps/market_data/management/commands/snapshot_ohlcv.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.backends import get_ohlcv_store, get_snapshot_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports OHLCV series into memory-mapped snapshot files (MARKET_DATA_CONFIG['SNAPSHOT_DIR']) "
+        "that research commands read with --from-snapshot."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--symbol", type=str, help="Only export this symbol (default: all assets).")
+        parser.add_argument("--timeframe", type=str, help="Only export this timeframe (default: all stored).")
+
+    def handle(self, *args, **options) -> None:
+        source = get_ohlcv_store(shared_cache=False)
+        snapshots = get_snapshot_store()
+
+        assets = Asset.objects.all()
+        if options["symbol"]:
+            assets = assets.filter(symbol=options["symbol"])
+
+        # Wide enough for the archive tier too; the bars themselves bound the export.
+        start_utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        end_utc = timezone.now() + datetime.timedelta(days=1)
+        for asset in assets:
+            timeframes = OHLCV.objects.filter(asset=asset).values_list("timeframe", flat=True).distinct()
+            if options["timeframe"]:
+                timeframes = [tf for tf in timeframes if tf == options["timeframe"]]
+
+            for timeframe in timeframes:
+                rows = snapshots.write(asset, timeframe, source.load(asset, timeframe, start_utc, end_utc))
+                path = snapshots.path_for(asset.symbol, timeframe)
+                self.stdout.write(
+                    self.style.SUCCESS(f"Snapshot {asset.symbol} {timeframe}: {rows} bars -> {path}")
+                )
@@ -0,0 +1,129 @@
+# apps/market_data/management/commands/stress_sqlite_chains.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+
+def _init_worker(settings_env: Dict[str, str]) -> None:
+    os.environ.update(settings_env)
+    import django
+
+    django.setup()
+
+
+def _run_chain(symbol: str, timeframe: str, days: int) -> Dict:
+    """One analysis chain (ingest -> regime -> patterns -> features), like a Celery worker runs it."""
+    from celery import chain
+
+    from apps.analytics.tasks import (
+        generate_feature_vectors_task,
+        scan_for_candidate_patterns,
+        update_asset_regime_task,
+    )
+    from apps.market_data.tasks import ingest_historical_data_task
+
+    started = time.perf_counter()
+    result = chain(
+        ingest_historical_data_task.s(symbol=symbol, timeframe_str=timeframe, days_back=days),
+        update_asset_regime_task.s(),
+        scan_for_candidate_patterns.s(),
+        generate_feature_vectors_task.s(),
+    ).apply()
+    error = "" if result.successful() else repr(result.result)
+    return {"symbol": symbol, "seconds": time.perf_counter() - started, "error": error}
+
+
+def _run_reader(symbol: str, timeframe: str, days: int, duration: float) -> Dict:
+    """Repeatedly load a series while the chains write, recording the slowest read."""
+    import datetime
+
+    from django.utils import timezone
+
+    from apps.analytics.services import OHLCVLoader
+    from apps.market_data.models import Asset
+
+    asset, _ = Asset.objects.get_or_create(symbol=symbol)
+    loader = OHLCVLoader()
+    slowest = 0.0
+    reads = 0
+    error = ""
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        end_utc = timezone.now()
+        started = time.perf_counter()
+        try:
+            loader.load_dataframe(asset, timeframe, end_utc - datetime.timedelta(days=days), end_utc)
+        except ValueError:
+            pass  # nothing stored yet
+        except Exception as exc:
+            error = repr(exc)
+            break
+        slowest = max(slowest, time.perf_counter() - started)
+        reads += 1
+    return {"symbol": f"reader:{symbol}", "seconds": slowest, "reads": reads, "error": error}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress-tests SQLite by running N analysis chains in parallel processes (synthetic data) "
+        "next to a reader, and reports 'database is locked' failures and the slowest read."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--chains", type=int, default=4, help="Parallel chains (one process each).")
+        parser.add_argument("--timeframe", type=str, default="H1")
+        parser.add_argument("--days", type=int, default=60, help="Days of synthetic bars per chain.")
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the STRESS* assets and their rows afterwards."
+        )
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != "sqlite":
+            raise CommandError("This stress test targets SQLite deployments.")
+        if connection.is_in_memory_db():
+            raise CommandError("An in-memory database cannot be shared between processes.")
+
+        chains = max(1, options["chains"])
+        symbols = [f"STRESS{i}" for i in range(chains)]
+        env = {"MARKET_DATA_CONNECTOR": "synthetic", "FRAME_CACHE_ENABLED": "False"}
+        self.stdout.write(
+            f"Running {chains} chains; SQLITE_PERFORMANCE_MODE={os.getenv('SQLITE_PERFORMANCE_MODE', 'False')}."
+        )
+
+        connection.close()
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=chains + 1, mp_context=get_context("spawn"), initializer=_init_worker, initargs=(env,)
+        ) as pool:
+            futures = [
+                pool.submit(_run_chain, symbol, options["timeframe"], options["days"]) for symbol in symbols
+            ]
+            futures.append(pool.submit(_run_reader, symbols[0], options["timeframe"], options["days"], 10.0))
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        locked = 0
+        for outcome in sorted(results, key=lambda r: r["symbol"]):
+            if "locked" in outcome["error"]:
+                locked += 1
+            if outcome["symbol"].startswith("reader:"):
+                line = f"{outcome['symbol']:<16} {outcome['reads']} reads, slowest {outcome['seconds'] * 1000:.1f} ms"
+            else:
+                line = f"{outcome['symbol']:<16} {outcome['seconds']:.2f}s"
+            if outcome["error"]:
+                self.stdout.write(self.style.ERROR(f"{line}  FAILED: {outcome['error'][:200]}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+
+        style = self.style.SUCCESS if locked == 0 else self.style.ERROR
+        self.stdout.write(style(f"{locked} 'database is locked' failures across {chains} chains."))
+
+        if not options["keep"]:
+            from apps.market_data.models import Asset
+
+            Asset.objects.filter(symbol__in=symbols).delete()
@@ -0,0 +1,54 @@
+# apps/market_data/management/commands/sync_ohlcv_store.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.backends import get_ohlcv_store
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+
+
+class Command(BaseCommand):
+    help = "Copies OHLCV rows from the database into the configured columnar store (e.g. Parquet)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--symbol", type=str, help="Only sync this symbol (default: all assets).")
+        parser.add_argument("--timeframe", type=str, help="Only sync this timeframe (default: all stored).")
+        parser.add_argument(
+            "--backend",
+            type=str,
+            default=None,
+            help="Target backend name. Defaults to MARKET_DATA_CONFIG['OHLCV_BACKEND'].",
+        )
+
+    def handle(self, *args, **options) -> None:
+        store = get_ohlcv_store(options["backend"])
+        if not store.mirrors_database:
+            raise CommandError("The selected backend reads the OHLCV table directly; nothing to sync.")
+
+        assets = Asset.objects.all()
+        if options["symbol"]:
+            assets = assets.filter(symbol=options["symbol"])
+
+        source = ORMOHLCVStore()
+        for asset in assets:
+            timeframes = OHLCV.objects.filter(asset=asset).values_list("timeframe", flat=True).distinct()
+            if options["timeframe"]:
+                timeframes = [tf for tf in timeframes if tf == options["timeframe"]]
+
+            for timeframe in timeframes:
+                bounds = OHLCV.objects.filter(asset=asset, timeframe=timeframe).order_by("timestamp")
+                first, last = bounds.first(), bounds.last()
+                if first is None:
+                    continue
+
+                # Copy month by month so memory stays bounded on long histories.
+                written = 0
+                month_start = first.timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+                while month_start <= last.timestamp:
+                    next_month = (month_start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+                    df = source.load(asset, timeframe, month_start, next_month - datetime.timedelta(microseconds=1))
+                    written += store.write(asset, timeframe, df)
+                    month_start = next_month
+
+                self.stdout.write(self.style.SUCCESS(f"Synced {written} bars for {asset.symbol} {timeframe}."))
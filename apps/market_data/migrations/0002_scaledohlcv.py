@@ -0,0 +1,53 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="price_scale",
+            field=models.PositiveSmallIntegerField(
+                default=8,
+                help_text="Decimal places kept by fixed-point OHLCV storage (price * 10**price_scale).",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ScaledOHLCV",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("timeframe", models.CharField(help_text="e.g., M1, H1, D1", max_length=5)),
+                ("timestamp", models.DateTimeField(help_text="Candle open timestamp (UTC)")),
+                ("open", models.BigIntegerField()),
+                ("high", models.BigIntegerField()),
+                ("low", models.BigIntegerField()),
+                ("close", models.BigIntegerField()),
+                ("volume", models.BigIntegerField()),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scaled_ohlcv_data",
+                        to="market_data.asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Scaled OHLCV",
+                "verbose_name_plural": "Scaled OHLCV",
+                "unique_together": {("asset", "timeframe", "timestamp")},
+            },
+        ),
+    ]
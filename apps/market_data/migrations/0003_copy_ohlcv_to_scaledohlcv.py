@@ -0,0 +1,58 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+
+def _to_fixed(value, factor: Decimal) -> int:
+    return int((Decimal(value) * factor).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def copy_ohlcv_to_scaled(apps, schema_editor):
+    """Backfill ScaledOHLCV from the existing Decimal OHLCV rows, asset by asset."""
+    Asset = apps.get_model("market_data", "Asset")
+    OHLCV = apps.get_model("market_data", "OHLCV")
+    ScaledOHLCV = apps.get_model("market_data", "ScaledOHLCV")
+
+    for asset in Asset.objects.all():
+        factor = Decimal(10) ** asset.price_scale
+        rows = (
+            OHLCV.objects.filter(asset_id=asset.pk)
+            .order_by("pk")
+            .values_list("timeframe", "timestamp", "open", "high", "low", "close", "volume")
+        )
+        batch = []
+        for timeframe, timestamp, o, h, l, c, v in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(
+                ScaledOHLCV(
+                    asset_id=asset.pk,
+                    timeframe=timeframe,
+                    timestamp=timestamp,
+                    open=_to_fixed(o, factor),
+                    high=_to_fixed(h, factor),
+                    low=_to_fixed(l, factor),
+                    close=_to_fixed(c, factor),
+                    volume=v,
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                ScaledOHLCV.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            ScaledOHLCV.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def clear_scaled(apps, schema_editor):
+    apps.get_model("market_data", "ScaledOHLCV").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0002_scaledohlcv"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_ohlcv_to_scaled, clear_scaled),
+    ]
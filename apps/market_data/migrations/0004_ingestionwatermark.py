@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0003_copy_ohlcv_to_scaledohlcv"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("timeframe", models.CharField(help_text="e.g., M1, H1, D1", max_length=5)),
+                (
+                    "covered_from",
+                    models.DateTimeField(
+                        help_text="Start of the contiguous range already fetched (UTC)"
+                    ),
+                ),
+                ("last_timestamp", models.DateTimeField(help_text="Newest stored bar (UTC)")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingestion_watermarks",
+                        to="market_data.asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ingestion Watermark",
+                "verbose_name_plural": "Ingestion Watermarks",
+                "unique_together": {("asset", "timeframe")},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0004_ingestionwatermark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackfillCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("timeframe", models.CharField(help_text="e.g., M1, H1, D1", max_length=5)),
+                ("chunk_start", models.DateTimeField(help_text="Inclusive chunk start (UTC)")),
+                ("chunk_end", models.DateTimeField(help_text="Exclusive chunk end (UTC)")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("DONE", "Done"), ("FAILED", "Failed")], max_length=10
+                    ),
+                ),
+                ("rows", models.IntegerField(default=0)),
+                ("duration_seconds", models.FloatField(default=0.0)),
+                ("error", models.TextField(blank=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="backfill_checkpoints",
+                        to="market_data.asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Backfill Checkpoint",
+                "verbose_name_plural": "Backfill Checkpoints",
+                "unique_together": {("asset", "timeframe", "chunk_start", "chunk_end")},
+            },
+        ),
+    ]
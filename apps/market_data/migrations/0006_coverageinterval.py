@@ -0,0 +1,49 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0005_backfillcheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CoverageInterval",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("timeframe", models.CharField(help_text="e.g., M1, H1, D1", max_length=5)),
+                ("start", models.DateTimeField(help_text="First stored bar of the run (UTC)")),
+                ("end", models.DateTimeField(help_text="Last stored bar of the run (UTC)")),
+                ("bars", models.IntegerField(default=0, help_text="Stored bars in [start, end]")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="coverage_intervals",
+                        to="market_data.asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Coverage Interval",
+                "verbose_name_plural": "Coverage Intervals",
+                "ordering": ["start"],
+                "indexes": [
+                    models.Index(
+                        fields=["asset", "timeframe", "end"], name="market_data_asset_i_fce2f5_idx"
+                    )
+                ],
+                "unique_together": {("asset", "timeframe", "start")},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0006_coverageinterval"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="ohlcv",
+            options={},
+        ),
+        migrations.AlterField(
+            model_name="ohlcv",
+            name="timestamp",
+            field=models.DateTimeField(help_text="Candle open timestamp (UTC)"),
+        ),
+        migrations.AddIndex(
+            model_name="ohlcv",
+            index=models.Index(
+                fields=["asset", "timeframe", "timestamp", "open", "high", "low", "close", "volume"],
+                name="ohlcv_series_range_cover",
+            ),
+        ),
+    ]
@@ -11,6 +11,10 @@ class Asset(models.Model):
         default="FOREX",
     )
     description = models.CharField(max_length=100, blank=True)
+    price_scale = models.PositiveSmallIntegerField(
+        default=8,
+        help_text="Decimal places kept by fixed-point OHLCV storage (price * 10**price_scale).",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -23,9 +27,7 @@ class OHLCV(models.Model):
         Asset, on_delete=models.CASCADE, related_name="ohlcv_data"
     )
     timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
-    timestamp = models.DateTimeField(
-        db_index=True, help_text="Candle open timestamp (UTC)"
-    )
+    timestamp = models.DateTimeField(help_text="Candle open timestamp (UTC)")
     open = models.DecimalField(max_digits=18, decimal_places=8)
     high = models.DecimalField(max_digits=18, decimal_places=8)
     low = models.DecimalField(max_digits=18, decimal_places=8)
@@ -34,13 +36,81 @@ class OHLCV(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
+        # The unique index serves upserts and point lookups. Loader range scans
+        # (asset, timeframe, timestamp range, ordered by timestamp, bar columns
+        # only) are answered from the covering index without touching the table;
+        # `audit_ohlcv_queries` prints the plans. There is deliberately no default
+        # ordering: it would add a sort to every query that does not ask for one.
         unique_together = ("asset", "timeframe", "timestamp")
-        ordering = ["-timestamp"]
+        indexes = [
+            models.Index(
+                fields=["asset", "timeframe", "timestamp", "open", "high", "low", "close", "volume"],
+                name="ohlcv_series_range_cover",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.asset.symbol} ({self.timeframe}) @ {self.timestamp}"
 
 
+class IngestionWatermark(models.Model):
+    """
+    High-watermark of OHLCV ingestion for one (asset, timeframe) series.
+
+    Bars between `covered_from` and `last_timestamp` have already been fetched
+    from the broker, so the next ingestion only needs to ask for bars newer than
+    `last_timestamp` (minus a small overlap that repairs the still-forming bar).
+    """
+
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="ingestion_watermarks"
+    )
+    timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
+    covered_from = models.DateTimeField(
+        help_text="Start of the contiguous range already fetched (UTC)"
+    )
+    last_timestamp = models.DateTimeField(help_text="Newest stored bar (UTC)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("asset", "timeframe")
+        verbose_name = "Ingestion Watermark"
+        verbose_name_plural = "Ingestion Watermarks"
+
+    def __str__(self) -> str:
+        return f"{self.asset.symbol} ({self.timeframe}) ingested up to {self.last_timestamp}"
+
+
+class ScaledOHLCV(models.Model):
+    """
+    Compact fixed-point copy of OHLCV bars.
+
+    Prices are stored as int64 = round(price * 10**asset.price_scale), so a bar is
+    a handful of native integers instead of four text-ish NUMERIC values, and the
+    loader can rescale whole columns at once. Changing `Asset.price_scale` requires
+    re-syncing the asset's rows.
+    """
+
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="scaled_ohlcv_data"
+    )
+    timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
+    timestamp = models.DateTimeField(help_text="Candle open timestamp (UTC)")
+    open = models.BigIntegerField()
+    high = models.BigIntegerField()
+    low = models.BigIntegerField()
+    close = models.BigIntegerField()
+    volume = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ("asset", "timeframe", "timestamp")
+        verbose_name = "Scaled OHLCV"
+        verbose_name_plural = "Scaled OHLCV"
+
+    def __str__(self) -> str:
+        return f"{self.asset.symbol} ({self.timeframe}) @ {self.timestamp} [fixed-point]"
+
+
 from django.db import models
 
 # ... (نموذج Asset و OHLCV من Sprint 0) ...
@@ -87,4 +157,65 @@ class MarketRegime(models.Model):
    
         # hurst_value = models.FloatField(null=True)
         # atr_value = models.FloatField(null=True)
-   
\ No newline at end of file
+   
+
+class BackfillCheckpoint(models.Model):
+    """
+    One finished (or failed) chunk of a historical backfill.
+
+    Chunk boundaries sit on a fixed calendar grid, so re-running a backfill over an
+    overlapping range skips every chunk already marked DONE.
+    """
+
+    STATUS_CHOICES = [("DONE", "Done"), ("FAILED", "Failed")]
+
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="backfill_checkpoints"
+    )
+    timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
+    chunk_start = models.DateTimeField(help_text="Inclusive chunk start (UTC)")
+    chunk_end = models.DateTimeField(help_text="Exclusive chunk end (UTC)")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    rows = models.IntegerField(default=0)
+    duration_seconds = models.FloatField(default=0.0)
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("asset", "timeframe", "chunk_start", "chunk_end")
+        verbose_name = "Backfill Checkpoint"
+        verbose_name_plural = "Backfill Checkpoints"
+
+    def __str__(self) -> str:
+        return f"{self.asset.symbol} ({self.timeframe}) {self.chunk_start:%Y-%m-%d}: {self.status}"
+
+
+class CoverageInterval(models.Model):
+    """
+    One contiguous run of stored bars of an (asset, timeframe) series.
+
+    Maintained on every OHLCV write (see `apps.market_data.coverage`): bars are
+    contiguous when no bar expected by the trading calendar is missing between
+    them, so weekend closures do not split a run but a missing weekday hour does.
+    The complement of these intervals over a window is exactly what still has to
+    be fetched.
+    """
+
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="coverage_intervals"
+    )
+    timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
+    start = models.DateTimeField(help_text="First stored bar of the run (UTC)")
+    end = models.DateTimeField(help_text="Last stored bar of the run (UTC)")
+    bars = models.IntegerField(default=0, help_text="Stored bars in [start, end]")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("asset", "timeframe", "start")
+        indexes = [models.Index(fields=["asset", "timeframe", "end"])]
+        ordering = ["start"]
+        verbose_name = "Coverage Interval"
+        verbose_name_plural = "Coverage Intervals"
+
+    def __str__(self) -> str:
+        return f"{self.asset.symbol} ({self.timeframe}) {self.start:%Y-%m-%d %H:%M} -> {self.end:%Y-%m-%d %H:%M}"
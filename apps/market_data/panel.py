@@ -0,0 +1,171 @@
+# apps/market_data/panel.py
+"""
+Multi-asset aligned panels for cross-sectional analytics.
+
+`load_panel` loads the bars of several symbols for one timeframe and returns a
+wide frame indexed by timestamp with `(field, symbol)` column pairs, so
+`panel["close"]` is a timestamp x symbol matrix ready for correlations, spreads
+or pairs/basket models:
+
+    panel = load_panel(["XAUUSD", "XAGUSD"], "H1", start_utc, end_utc, align="ffill", max_staleness_bars=3)
+    closes = panel["close"]
+
+Stores that implement `load_many` (ORM, Parquet) serve the whole panel from one
+query or one columnar scan; other stores are read series by series. The cube is
+then built with a single scatter into a preallocated array instead of chained
+joins.
+
+Alignment modes:
+  - "inner": keep only timestamps where every symbol has a bar
+  - "outer": keep the union of timestamps, gaps stay NaN
+  - "ffill": union of timestamps; a symbol without a bar repeats its last close
+    as a flat, zero-volume bar while that close is at most `max_staleness_bars`
+    bars old, and stays NaN beyond it
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset
+from apps.market_data.storage.backends import get_ohlcv_store
+from apps.market_data.storage.base import OHLCV_COLUMNS, OHLCVStore, PRICE_COLUMNS, ensure_utc
+
+logger = structlog.get_logger(__name__)
+
+PANEL_ALIGNMENTS = ("inner", "outer", "ffill")
+
+
+def load_panel(
+    symbols: Sequence[str],
+    timeframe: str,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+    fields: Sequence[str] = tuple(OHLCV_COLUMNS),
+    align: str = "inner",
+    max_staleness_bars: Optional[int] = None,
+    store: Optional[OHLCVStore] = None,
+) -> pd.DataFrame:
+    """
+    Load an aligned timestamp x (field, symbol) panel.
+
+    Args:
+        symbols: Symbols in the desired column order; unknown symbols are logged
+            and come back as all-NaN columns.
+        fields: Subset of OHLCV_COLUMNS to keep.
+        align: One of PANEL_ALIGNMENTS.
+        max_staleness_bars: For align="ffill", how many bars old a carried close
+            may be (None = unlimited).
+        store: OHLCV store to read from (defaults to `get_ohlcv_store()`).
+
+    Returns:
+        float64 frame (volume included, so gaps can be NaN) with a UTC
+        DatetimeIndex and MultiIndex columns named ("field", "symbol").
+    """
+    timeframe = Timeframe(timeframe)
+    symbols = list(dict.fromkeys(symbols))
+    fields = list(fields)
+    if align not in PANEL_ALIGNMENTS:
+        raise ValueError(f"Unknown panel alignment '{align}', expected one of {PANEL_ALIGNMENTS}.")
+    unknown_fields = [f for f in fields if f not in OHLCV_COLUMNS]
+    if unknown_fields:
+        raise ValueError(f"Unknown OHLCV fields: {unknown_fields}")
+
+    assets = list(Asset.objects.filter(symbol__in=symbols))
+    missing = set(symbols) - {asset.symbol for asset in assets}
+    if missing:
+        logger.warning("Panel symbols not found", symbols=sorted(missing))
+
+    store = store or get_ohlcv_store()
+    bars = load_long_frame(store, assets, timeframe.value, ensure_utc(start_utc), ensure_utc(end_utc))
+    return build_panel(bars, symbols, timeframe, fields, align, max_staleness_bars)
+
+
+def load_long_frame(
+    store: OHLCVStore,
+    assets: Sequence[Asset],
+    timeframe: str,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+) -> pd.DataFrame:
+    """Return the long (timestamp, symbol, OHLCV...) frame for `assets`, in as few reads as the store allows."""
+    load_many = getattr(store, "load_many", None)
+    if load_many is not None:
+        return load_many(assets, timeframe, start_utc, end_utc)
+
+    frames = []
+    for asset in assets:
+        df = store.load(asset, timeframe, start_utc, end_utc)
+        frames.append(df.assign(symbol=asset.symbol)[["symbol", *OHLCV_COLUMNS]])
+    if not frames:
+        return pd.DataFrame(columns=["symbol", *OHLCV_COLUMNS], index=pd.DatetimeIndex([], tz="UTC", name="timestamp"))
+    return pd.concat(frames)
+
+
+def build_panel(
+    bars: pd.DataFrame,
+    symbols: Sequence[str],
+    timeframe: Timeframe,
+    fields: Sequence[str],
+    align: str = "inner",
+    max_staleness_bars: Optional[int] = None,
+) -> pd.DataFrame:
+    """Scatter a long bar frame into the aligned wide panel (see `load_panel`)."""
+    symbols = list(symbols)
+    fields = list(fields)
+    columns = pd.MultiIndex.from_product([fields, symbols], names=["field", "symbol"])
+
+    row_of, index = pd.factorize(bars.index, sort=True)
+    index = pd.DatetimeIndex(index, name="timestamp")
+    col_of = pd.Categorical(bars["symbol"], categories=symbols).codes
+    known = col_of >= 0
+    row_of, col_of = row_of[known], col_of[known]
+
+    n_rows = len(index)
+    cube = np.full((n_rows, len(fields), len(symbols)), np.nan)
+    cube[row_of, :, col_of] = bars[fields].to_numpy(dtype=np.float64)[known]
+    observed = np.zeros((n_rows, len(symbols)), dtype=bool)
+    observed[row_of, col_of] = True
+
+    if align == "inner":
+        keep = observed.all(axis=1)
+        cube, index = cube[keep], index[keep]
+    elif align == "ffill" and n_rows:
+        _forward_fill(cube, observed, index, fields, timeframe, max_staleness_bars)
+
+    return pd.DataFrame(cube.reshape(len(index), -1), index=index, columns=columns)
+
+
+def _forward_fill(
+    cube: np.ndarray,
+    observed: np.ndarray,
+    index: pd.DatetimeIndex,
+    fields: Sequence[str],
+    timeframe: Timeframe,
+    max_staleness_bars: Optional[int],
+) -> None:
+    """Fill the gaps of `cube` in place with flat bars at the last observed close."""
+    positions = np.arange(len(index))[:, None]
+    last_seen = np.maximum.accumulate(np.where(observed, positions, -1), axis=0)
+    fill = ~observed & (last_seen >= 0)
+    if max_staleness_bars is not None:
+        stamps = index.asi8
+        age = stamps[:, None] - stamps[np.maximum(last_seen, 0)]
+        limit = max_staleness_bars * int(timeframe.to_timedelta().total_seconds()) * 10**9
+        fill &= age <= limit
+
+    rows, cols = np.nonzero(fill)
+    sources = last_seen[rows, cols]
+    close = fields.index("close") if "close" in fields else None
+    for position, field in enumerate(fields):
+        if field == "volume":
+            cube[rows, position, cols] = 0.0
+        elif field in PRICE_COLUMNS:
+            source_field = position if close is None else close
+            cube[rows, position, cols] = cube[sources, source_field, cols]
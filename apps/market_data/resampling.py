@@ -0,0 +1,137 @@
+# apps/market_data/resampling.py
+"""
+Vectorised OHLCV resampling (e.g. M1 -> M5/M15/H1/H4/D1).
+
+Bars are grouped into buckets of the target timeframe aligned to a trading
+session: with the default calendar buckets start at UTC midnight; with e.g.
+`SessionCalendar("America/New_York", time(17, 0))` H4 and D1 bars roll at the
+New York 17:00 FX close, following DST. Aggregation is done with
+`np.*.reduceat` over the bucket boundaries of the (sorted) base series:
+open = first, high = max, low = min, close = last, volume = sum.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from apps.common.enums import Timeframe
+from apps.market_data.storage.base import (
+    PRICE_COLUMNS,
+    empty_ohlcv_frame,
+    normalize_ohlcv_frame,
+)
+
+PANDAS_RULES = {
+    "M": "min",
+    "H": "h",
+    "D": "D",
+}
+
+
+@dataclass(frozen=True)
+class SessionCalendar:
+    """Where the trading day starts; intraday buckets are aligned to the same origin."""
+
+    timezone: str = "UTC"
+    start: datetime.time = datetime.time(0, 0)
+
+    @property
+    def offset(self) -> pd.Timedelta:
+        return pd.Timedelta(hours=self.start.hour, minutes=self.start.minute)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SessionCalendar":
+        hour, minute = (int(part) for part in config.get("SESSION_START", "00:00").split(":"))
+        return cls(config.get("SESSION_TIMEZONE", "UTC"), datetime.time(hour, minute))
+
+
+def _rule(timeframe: Timeframe) -> str:
+    unit, value = timeframe.value[0], timeframe.value[1:]
+    return f"{value}{PANDAS_RULES[unit]}"
+
+
+def can_resample(source: Timeframe, target: Timeframe) -> bool:
+    """True when `target` bars can be built exactly from `source` bars."""
+    source_delta, target_delta = source.to_timedelta(), target.to_timedelta()
+    return target_delta > source_delta and target_delta % source_delta == datetime.timedelta(0)
+
+
+def bucket_labels(
+    index: pd.DatetimeIndex, target: Timeframe, session: Optional[SessionCalendar] = None
+) -> pd.DatetimeIndex:
+    """Map UTC timestamps to the UTC open time of their `target` bucket."""
+    session = session or SessionCalendar()
+    local = index.tz_convert(session.timezone).tz_localize(None)
+    floored = (local - session.offset).floor(_rule(target)) + session.offset
+    return floored.tz_localize(
+        session.timezone,
+        ambiguous=np.zeros(len(floored), dtype=bool),
+        nonexistent="shift_forward",
+    ).tz_convert("UTC")
+
+
+def bucket_floor(
+    ts: datetime.datetime, target: Timeframe, session: Optional[SessionCalendar] = None
+) -> datetime.datetime:
+    """Open time of the `target` bucket containing `ts`."""
+    index = pd.DatetimeIndex([pd.Timestamp(ts)])
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return bucket_labels(index, target, session)[0].to_pydatetime()
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    target: Timeframe,
+    source: Optional[Timeframe] = None,
+    session: Optional[SessionCalendar] = None,
+    complete_only: bool = False,
+) -> pd.DataFrame:
+    """
+    Aggregate `df` into `target` bars.
+
+    Args:
+        df: base OHLCV frame (storage contract)
+        target: timeframe to build
+        source: timeframe of `df`; validated against `target` and used to decide
+            whether the last bucket is complete
+        session: bucket alignment (default: UTC midnight)
+        complete_only: drop the trailing bucket if its base bars do not reach its end
+
+    Returns:
+        OHLCV frame indexed by bucket open time (UTC). Empty buckets are omitted.
+    """
+    if source is not None and not can_resample(source, target):
+        raise ValueError(f"Cannot build {target.value} bars from {source.value} bars.")
+
+    frame = normalize_ohlcv_frame(df).dropna(subset=PRICE_COLUMNS)
+    if frame.empty:
+        return empty_ohlcv_frame()
+
+    labels = bucket_labels(frame.index, target, session)
+    label_ns = labels.asi8
+    starts = np.flatnonzero(np.r_[True, label_ns[1:] != label_ns[:-1]])
+    ends = np.r_[starts[1:], len(frame)] - 1
+
+    prices = frame[PRICE_COLUMNS].to_numpy()
+    volumes = frame["volume"].to_numpy()
+    out = pd.DataFrame(
+        {
+            "open": prices[starts, 0],
+            "high": np.maximum.reduceat(prices[:, 1], starts),
+            "low": np.minimum.reduceat(prices[:, 2], starts),
+            "close": prices[ends, 3],
+            "volume": np.add.reduceat(volumes, starts),
+        },
+        index=pd.DatetimeIndex(labels[starts], name="timestamp"),
+    )
+
+    if complete_only and source is not None:
+        last_bar_end = frame.index[-1] + source.to_timedelta()
+        if last_bar_end < out.index[-1] + target.to_timedelta():
+            out = out.iloc[:-1]
+    return out
@@ -38,4 +38,10 @@ class OHLCVIngestRequestSerializer(serializers.Serializer):
     def validate(self, data: dict[str, Any]) -> dict[str, Any]:
         if data["start_date"] >= data["end_date"]:
             raise serializers.ValidationError("start_date must be before end_date.")
-        return data
\ No newline at end of file
+        return data
+
+
+class OHLCVCoverageRequestSerializer(OHLCVIngestRequestSerializer):
+    """
+    Serializer for OHLCV coverage queries (same window fields as ingestion).
+    """
@@ -3,45 +3,66 @@
 OHLCV loading and ingestion services for market data.
 
 Provides:
-- OHLCVLoader: load OHLCV rows from DB into a tz-aware pandas.DataFrame (UTC index)
-- ingest_ohlcv_data: fetch OHLCV from MT5Connector and persist into OHLCV model
+- OHLCVLoader: load OHLCV rows from the configured storage backend into a tz-aware pandas.DataFrame (UTC index)
+- ingest_ohlcv_data: fetch OHLCV from the configured connector (MT5 by default) and persist into OHLCV model,
+  resuming from the per-series IngestionWatermark instead of re-fetching whole windows
+- materialize_derived_timeframes: build higher timeframes (M5..D1) from freshly ingested base bars
+- fill_coverage_holes: fetch exactly the ranges the coverage index reports as missing
 
 Notes:
 - All DataFrame indexes returned by OHLCVLoader.load_dataframe are guaranteed to be timezone-aware (UTC).
 - ingest_ohlcv_data ensures timestamps saved to the DB are Python datetime objects.
-- bulk_create is used with ignore_conflicts=True for performance when duplicates are expected.
+- Bars are written by the columnar bulk writer (storage.bulk_writer), which upserts by default
+  and reports exact inserted/updated counts.
+- Backends that keep their own copy of the bars (e.g. the Parquet store) are fed on every ingest.
 """
 
 from __future__ import annotations
 
 import datetime
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import structlog
-from django.db import transaction
 from django.utils import timezone
 
 from apps.common.enums import Timeframe
-from apps.market_data.connectors.mt5_connector import MT5Connector
-from apps.market_data.models import Asset, OHLCV
+from apps.common.sqlite import single_writer
+from apps.market_data.connectors.base import get_connector
+from apps.market_data.coverage import find_holes, record_coverage
+from apps.market_data.models import Asset, IngestionWatermark
+from apps.market_data.resampling import SessionCalendar, bucket_floor, can_resample, resample_ohlcv
+from apps.market_data.storage.backends import get_market_data_config, get_ohlcv_store
+from apps.market_data.storage.base import PRICE_COLUMNS, ensure_utc
+from apps.market_data.storage.bulk_writer import BulkWriteResult, write_ohlcv_bars
+from apps.market_data.storage.frame_cache import OHLCVFrameCache, get_frame_cache
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+from apps.market_data.storage.redis_cache import get_shared_segment_cache
 
 logger = structlog.get_logger(__name__)
 
 
 class OHLCVLoader:
     """
-    Loader helper that reads OHLCV rows from the database and returns a pandas DataFrame.
+    Loader helper that reads OHLCV rows from the configured storage backend
+    (`MARKET_DATA_CONFIG["OHLCV_BACKEND"]`) and returns a pandas DataFrame.
 
     The returned DataFrame:
       - has index = timestamp (tz-aware, UTC)
       - columns: ['open','high','low','close','volume']
       - numeric price columns are floats
 
+    Pass a frame cache (see `get_frame_cache()`) to serve repeated loads of the
+    same series from memory.
+
     Example:
         df = OHLCVLoader().load_dataframe(asset, "M5", start_utc, end_utc)
+        df = OHLCVLoader(cache=get_frame_cache()).load_dataframe(asset, "H1", start_utc, end_utc)
     """
 
+    def __init__(self, cache: Optional[OHLCVFrameCache] = None) -> None:
+        self.cache = cache
+
     def load_dataframe(
         self,
         asset: Asset,
@@ -67,53 +88,161 @@ class OHLCVLoader:
         """
         logger.info("Loading OHLCV data for analysis", asset=asset.symbol, timeframe=timeframe)
 
-        # Normalize start/end to UTC-aware datetimes
-        def _ensure_utc(dt: datetime.datetime) -> datetime.datetime:
-            if dt is None:
-                return dt
-            if dt.tzinfo is None:
-                # assume provided naive datetimes are in UTC
-                return dt.replace(tzinfo=datetime.timezone.utc)
-            # convert to UTC
-            return dt.astimezone(datetime.timezone.utc)
-
-        start_utc = _ensure_utc(start_utc)
-        end_utc = _ensure_utc(end_utc)
-
-        # Query DB
-        queryset = OHLCV.objects.filter(
-            asset=asset, timeframe=timeframe, timestamp__range=(start_utc, end_utc)
-        ).order_by("timestamp")
-
-        if not queryset.exists():
+        if self.cache is not None:
+            df = self.cache.get(asset, timeframe, start_utc, end_utc)
+        else:
+            df = get_ohlcv_store().load(asset, timeframe, ensure_utc(start_utc), ensure_utc(end_utc))
+
+        if df.empty:
             raise ValueError(f"No OHLCV data found for {asset.symbol} in the given range.")
 
-        # Build DataFrame
-        df = pd.DataFrame.from_records(
-            queryset.values("timestamp", "open", "high", "low", "close", "volume")
-        )
+        return df
 
-        # Ensure proper dtypes
-        price_cols = ["open", "high", "low", "close"]
-        for col in price_cols + ["volume"]:
-            if col in df.columns:
-                # coerce to numeric (float for prices, int/float for volume)
-                df[col] = pd.to_numeric(df[col], errors="coerce")
 
-        # Parse timestamps and set index
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=False)
-        df.set_index("timestamp", inplace=True)
+def _overlap(timeframe: Timeframe) -> datetime.timedelta:
+    overlap_bars = get_market_data_config().get("INGEST_OVERLAP_BARS", 2)
+    return timeframe.to_timedelta() * overlap_bars
 
-        # Guarantee index is tz-aware UTC
-        if df.index.tz is None:
-            df.index = df.index.tz_localize("UTC")
-        else:
-            df.index = df.index.tz_convert("UTC")
 
-        # Reorder/keep only required columns
-        df = df[["open", "high", "low", "close", "volume"]]
+def resolve_fetch_start(
+    watermark: Optional[IngestionWatermark],
+    timeframe: Timeframe,
+    start_utc: datetime.datetime,
+) -> datetime.datetime:
+    """
+    Decide where the broker fetch has to start for a requested window.
 
-        return df
+    Only windows that continue the already-covered range are trimmed: they resume
+    from the newest stored bar minus a small overlap, so the last (possibly
+    unfinished) bar is fetched again and repaired. Windows that extend history
+    backwards or start after the watermark are fetched in full.
+    """
+    if watermark is None:
+        return start_utc
+    if start_utc < watermark.covered_from or start_utc > watermark.last_timestamp:
+        return start_utc
+    return max(start_utc, watermark.last_timestamp - _overlap(timeframe))
+
+
+def advance_watermark(
+    asset: Asset,
+    timeframe: Timeframe,
+    watermark: Optional[IngestionWatermark],
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+    newest_bar: Optional[datetime.datetime],
+) -> None:
+    """Record that [start_utc, end_utc] has been fetched for the series."""
+    if watermark is None:
+        if newest_bar is not None:
+            IngestionWatermark.objects.update_or_create(
+                asset=asset,
+                timeframe=timeframe.value,
+                defaults={"covered_from": start_utc, "last_timestamp": newest_bar},
+            )
+        return
+
+    if start_utc > watermark.last_timestamp:
+        # Disjoint window after the frontier: coverage restarts here.
+        if newest_bar is None:
+            return
+        watermark.covered_from = start_utc
+        watermark.last_timestamp = newest_bar
+    elif end_utc < watermark.covered_from:
+        # Disjoint window before the covered range: the frontier is unaffected.
+        return
+    else:
+        watermark.covered_from = min(watermark.covered_from, start_utc)
+        if newest_bar is not None:
+            watermark.last_timestamp = max(watermark.last_timestamp, newest_bar)
+    watermark.save(update_fields=["covered_from", "last_timestamp", "updated_at"])
+
+
+def publish_written_bars(asset: Asset, timeframe: str, df: pd.DataFrame, result: BulkWriteResult) -> None:
+    """Record coverage of freshly written bars, invalidate caches and feed mirroring backends."""
+    if result.written or result.skipped:
+        try:
+            record_coverage(asset, timeframe, df.dropna(subset=PRICE_COLUMNS).index)
+        except Exception:
+            logger.exception("Failed to update OHLCV coverage index", symbol=asset.symbol, timeframe=timeframe)
+    if result.written:
+        cache = get_frame_cache()
+        if cache is not None:
+            cache.truncate(asset, timeframe, result.first_timestamp)
+        segments = get_shared_segment_cache()
+        if segments is not None:
+            segments.invalidate(asset, timeframe, result.first_timestamp, result.last_timestamp)
+
+    store = get_ohlcv_store()
+    if store.mirrors_database:
+        try:
+            store.write(asset, timeframe, df)
+        except Exception:
+            logger.exception("Failed to mirror OHLCV into storage backend", symbol=asset.symbol)
+
+
+def materialize_derived_timeframes(
+    asset: Asset,
+    base: Timeframe,
+    targets: List[Timeframe],
+    since_utc: datetime.datetime,
+    until_utc: datetime.datetime,
+) -> Dict[str, BulkWriteResult]:
+    """
+    Rebuild the `targets` bars touched by base bars in [since_utc, until_utc].
+
+    Only the buckets containing new base bars are re-aggregated; the still-open
+    last bucket is written as well and upserted again on the next ingestion.
+    """
+    session = SessionCalendar.from_config(get_market_data_config())
+    source = ORMOHLCVStore(fast_path=True)
+    results: Dict[str, BulkWriteResult] = {}
+    for target in targets:
+        if not can_resample(base, target):
+            logger.warning("Skipping non-derivable timeframe", base=base.value, target=target.value)
+            continue
+        bucket_start = bucket_floor(since_utc, target, session)
+        bucket_end = bucket_floor(until_utc, target, session) + target.to_timedelta() - datetime.timedelta(microseconds=1)
+        base_df = source.load(asset, base.value, bucket_start, bucket_end)
+        bars = resample_ohlcv(base_df, target, base, session)
+        result = write_ohlcv_bars(asset, target.value, bars, upsert=True)
+        publish_written_bars(asset, target.value, bars, result)
+        results[target.value] = result
+        logger.info(
+            "Materialised derived timeframe",
+            symbol=asset.symbol,
+            timeframe=target.value,
+            inserted=result.inserted,
+            updated=result.updated,
+        )
+    return results
+
+
+def persist_ohlcv_frame(
+    asset: Asset, timeframe: Timeframe, df: pd.DataFrame, upsert: bool = True
+) -> BulkWriteResult:
+    """
+    Write fetched bars and run everything that follows a write: cache invalidation,
+    mirroring backends and, for the base timeframe, derived-timeframe materialisation.
+    All of it holds the SQLite writer slot (see `apps.common.sqlite`).
+    """
+    with single_writer():
+        result = write_ohlcv_bars(asset, timeframe.value, df, upsert=upsert)
+        publish_written_bars(asset, timeframe.value, df, result)
+
+        config = get_market_data_config()
+        if timeframe.value == config.get("BASE_TIMEFRAME") and result.written:
+            try:
+                materialize_derived_timeframes(
+                    asset,
+                    timeframe,
+                    [Timeframe(tf) for tf in config.get("DERIVED_TIMEFRAMES", [])],
+                    result.first_timestamp,
+                    result.last_timestamp,
+                )
+            except Exception:
+                logger.exception("Failed to materialise derived timeframes", symbol=asset.symbol)
+    return result
 
 
 def ingest_ohlcv_data(
@@ -121,18 +250,28 @@ def ingest_ohlcv_data(
     timeframe: Timeframe,
     start_utc: datetime.datetime,
     end_utc: datetime.datetime,
+    incremental: bool = True,
+    upsert: bool = True,
 ) -> int:
     """
-    Fetch OHLCV data from MT5Connector and persist into the OHLCV model.
+    Fetch OHLCV data from the configured connector and persist into the OHLCV model.
+
+    With `incremental=True` (default) only bars newer than the series'
+    IngestionWatermark are requested from the broker, plus
+    `MARKET_DATA_CONFIG["INGEST_OVERLAP_BARS"]` bars of overlap, so the cost of a
+    cycle scales with the number of new bars rather than with the window length.
 
     Args:
         symbol: market symbol (e.g. "EURUSD")
         timeframe: Timeframe enum value
         start_utc: start datetime (naive or tz-aware). If naive, treated as UTC.
         end_utc: end datetime (naive or tz-aware). If naive, treated as UTC.
+        incremental: resume from the watermark instead of re-fetching the full window.
+        upsert: overwrite bars that already exist (repairs the still-forming bar);
+            with False existing bars are left untouched.
 
     Returns:
-        Number of persisted OHLCV rows.
+        Number of persisted OHLCV rows (inserted + updated).
     """
     logger.info("Starting OHLCV ingestion", symbol=symbol, timeframe=timeframe.value)
 
@@ -140,25 +279,29 @@ def ingest_ohlcv_data(
     asset, _ = Asset.objects.get_or_create(symbol=symbol)
 
     # Normalize start/end to timezone-aware UTC for connector usage
-    def _ensure_utc(dt: datetime.datetime) -> datetime.datetime:
-        if dt is None:
-            return dt
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=datetime.timezone.utc)
-        return dt.astimezone(datetime.timezone.utc)
-
-    start_utc = _ensure_utc(start_utc)
-    end_utc = _ensure_utc(end_utc)
-
-    # Fetch dataframe from MT5 connector
+    start_utc = ensure_utc(start_utc)
+    end_utc = ensure_utc(end_utc)
+
+    watermark = None
+    fetch_start = start_utc
+    if incremental:
+        watermark = IngestionWatermark.objects.filter(asset=asset, timeframe=timeframe.value).first()
+        fetch_start = resolve_fetch_start(watermark, timeframe, start_utc)
+        if fetch_start > end_utc:
+            logger.info("Requested window already ingested", symbol=symbol, timeframe=timeframe.value)
+            return 0
+
+    # Fetch dataframe from the configured connector (MT5, replay or synthetic)
     try:
-        df: pd.DataFrame = MT5Connector.fetch_ohlcv(symbol, timeframe, start_utc, end_utc)
+        df: pd.DataFrame = get_connector().fetch_ohlcv(symbol, timeframe, fetch_start, end_utc)
     except Exception:
-        logger.exception("Failed to fetch OHLCV from MT5Connector", symbol=symbol, timeframe=timeframe.value)
+        logger.exception("Failed to fetch OHLCV from connector", symbol=symbol, timeframe=timeframe.value)
         return 0
 
     if df is None or df.empty:
         logger.info("No OHLCV returned from connector", symbol=symbol, timeframe=timeframe.value)
+        if incremental:
+            advance_watermark(asset, timeframe, watermark, start_utc, end_utc, None)
         return 0
 
     # Ensure index is datetime and tz-aware in UTC
@@ -181,43 +324,46 @@ def ingest_ohlcv_data(
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Prepare model instances for bulk insert
-    ohlcv_records = []
-    for ts, row in df.iterrows():
-        try:
-            # ensure timestamp is a Python datetime (naive or aware acceptable for DB)
-            ts_py = ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else ts
-            record = OHLCV(
-                asset=asset,
-                timeframe=timeframe.value,
-                timestamp=ts_py,
-                open=row.get("open"),
-                high=row.get("high"),
-                low=row.get("low"),
-                close=row.get("close"),
-                volume=row.get("volume"),
-            )
-            ohlcv_records.append(record)
-        except Exception:
-            logger.exception("Failed to convert DataFrame row to OHLCV model", symbol=symbol, index=ts)
+    try:
+        result = persist_ohlcv_frame(asset, timeframe, df, upsert=upsert)
+    except Exception:
+        logger.exception("Bulk write failed for OHLCV records", symbol=symbol)
+        return 0
 
-    if not ohlcv_records:
+    if result.written == 0 and result.skipped == 0:
         logger.info("No valid OHLCV records prepared for insertion", symbol=symbol)
         return 0
 
-    try:
-        with transaction.atomic():
-            created_objects = OHLCV.objects.bulk_create(ohlcv_records, ignore_conflicts=True)
-    except Exception:
-        logger.exception("Bulk create failed for OHLCV records", symbol=symbol)
-        return 0
+    ingested_count = result.written
+
+    if incremental:
+        advance_watermark(asset, timeframe, watermark, start_utc, end_utc, df.index.max().to_pydatetime())
 
-    ingested_count = len(created_objects) if created_objects is not None else 0
     logger.info(
         "OHLCV data ingestion complete",
         symbol=symbol,
         timeframe=timeframe.value,
         count=ingested_count,
+        inserted=result.inserted,
+        updated=result.updated,
+        skipped=result.skipped,
     )
     return ingested_count
 
+
+def fill_coverage_holes(
+    symbol: str,
+    timeframe: Timeframe,
+    start_utc: datetime.datetime,
+    end_utc: datetime.datetime,
+) -> int:
+    """
+    Fetch only the bars the coverage index reports as missing in [start_utc, end_utc].
+
+    Returns:
+        Number of persisted OHLCV rows.
+    """
+    asset, _ = Asset.objects.get_or_create(symbol=symbol)
+    holes = find_holes(asset, timeframe.value, ensure_utc(start_utc), ensure_utc(end_utc))
+    logger.info("Filling OHLCV coverage holes", symbol=symbol, timeframe=timeframe.value, holes=len(holes))
+    return sum(ingest_ohlcv_data(symbol, timeframe, hole.start, hole.end, incremental=False) for hole in holes)
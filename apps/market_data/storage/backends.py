@@ -0,0 +1,106 @@
+# apps/market_data/storage/backends.py
+"""
+Backend selection for OHLCV storage.
+
+The active backend is chosen by `settings.MARKET_DATA_CONFIG["OHLCV_BACKEND"]`:
+  - "orm":     read from the relational OHLCV table (default); with
+               `ORM_FAST_PATH` (on unless disabled) rows are streamed into NumPy arrays
+  - "parquet": read from the month-partitioned Parquet store, which is kept in
+               sync with the OHLCV table by `ingest_ohlcv_data`
+  - "fixed_point": read from the `ScaledOHLCV` table (int64 prices with a
+               per-asset scale), also kept in sync on ingest
+
+With `ARCHIVE_ENABLED` the "orm" backend also reads the Parquet archive that
+`compact_ohlcv` moves old bars into (see `tiered_store`).
+
+Research commands run with `--from-snapshot` read the memory-mapped files
+`snapshot_ohlcv` exports to `SNAPSHOT_DIR` instead (see `snapshot_store`).
+
+With `RESAMPLE_ON_READ` timeframes that are not stored are built from
+`BASE_TIMEFRAME` bars on read. With `REDIS_CACHE_ENABLED` the chosen backend is wrapped in a read-through
+Redis day-bucket cache shared by all workers (see `redis_cache`).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.market_data.storage.base import OHLCVStore
+
+if TYPE_CHECKING:
+    from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+    from apps.market_data.storage.snapshot_store import SnapshotOHLCVStore
+
+
+def get_market_data_config() -> Dict[str, Any]:
+    return getattr(settings, "MARKET_DATA_CONFIG", {})
+
+
+def get_ohlcv_store(backend: Optional[str] = None, shared_cache: bool = True) -> OHLCVStore:
+    """
+    Build the OHLCV store named by `backend` (or the configured default).
+
+    The store is wrapped in the resample-on-read fallback and, unless
+    `shared_cache` is False, in the Redis segment cache when those are enabled.
+    """
+    store = _build_store(backend)
+    config = get_market_data_config()
+    if config.get("RESAMPLE_ON_READ", False):
+        from apps.common.enums import Timeframe
+        from apps.market_data.resampling import SessionCalendar
+        from apps.market_data.storage.resampled_store import ResamplingOHLCVStore
+
+        store = ResamplingOHLCVStore(
+            store, Timeframe(config.get("BASE_TIMEFRAME", "M1")), SessionCalendar.from_config(config)
+        )
+    if shared_cache:
+        from apps.market_data.storage.redis_cache import SharedCacheOHLCVStore, get_shared_segment_cache
+
+        segments = get_shared_segment_cache()
+        if segments is not None:
+            return SharedCacheOHLCVStore(store, segments)
+    return store
+
+
+def get_archive_store() -> ParquetOHLCVStore:
+    """The cold tier: Parquet partitions that old OHLCV bars are compacted into."""
+    from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+
+    return ParquetOHLCVStore(get_market_data_config().get("ARCHIVE_DIR", "data/ohlcv_archive"))
+
+
+def get_snapshot_store() -> SnapshotOHLCVStore:
+    """Memory-mapped series exported by `snapshot_ohlcv`, read by research commands with `--from-snapshot`."""
+    from apps.market_data.storage.snapshot_store import SnapshotOHLCVStore
+
+    return SnapshotOHLCVStore(get_market_data_config().get("SNAPSHOT_DIR", "data/ohlcv_snapshots"))
+
+
+def _build_store(backend: Optional[str]) -> OHLCVStore:
+    config = get_market_data_config()
+    backend = (backend or config.get("OHLCV_BACKEND", "orm")).lower()
+
+    if backend == "orm":
+        from apps.market_data.storage.orm_store import ORMOHLCVStore
+
+        hot = ORMOHLCVStore(fast_path=config.get("ORM_FAST_PATH", True))
+        if config.get("ARCHIVE_ENABLED", False):
+            from apps.market_data.storage.tiered_store import TieredOHLCVStore
+
+            return TieredOHLCVStore(hot, get_archive_store())
+        return hot
+
+    if backend == "parquet":
+        from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+
+        return ParquetOHLCVStore(config.get("PARQUET_STORE_DIR", "data/ohlcv_parquet"))
+
+    if backend == "fixed_point":
+        from apps.market_data.storage.fixed_point_store import FixedPointOHLCVStore
+
+        return FixedPointOHLCVStore()
+
+    raise ImproperlyConfigured(f"Unknown OHLCV_BACKEND '{backend}'.")
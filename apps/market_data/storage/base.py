@@ -0,0 +1,94 @@
+# apps/market_data/storage/base.py
+"""
+Shared contract for OHLCV storage backends.
+
+Every backend returns frames with the same shape so callers never need to
+know where the bars came from:
+  - index = timestamp (tz-aware, UTC), named "timestamp", sorted ascending
+  - columns: ['open','high','low','close','volume']
+  - prices are float64, volume is int64
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Optional, Protocol
+
+import numpy as np
+import pandas as pd
+
+from apps.market_data.models import Asset
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+class OHLCVStore(Protocol):
+    """Interface implemented by every OHLCV storage backend."""
+
+    #: True when the backend keeps its own copy of the bars and must be fed on ingest.
+    mirrors_database: bool
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        ...
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        ...
+
+
+def ensure_utc(dt: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """Interpret naive datetimes as UTC and convert aware ones to UTC."""
+    if dt is None:
+        return dt
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc)
+
+
+def empty_ohlcv_frame() -> pd.DataFrame:
+    """Return an empty frame that still honours the OHLCV column/dtype contract."""
+    index = pd.DatetimeIndex([], tz="UTC", name="timestamp")
+    df = pd.DataFrame(
+        {col: np.array([], dtype=np.float64) for col in PRICE_COLUMNS}, index=index
+    )
+    df["volume"] = np.array([], dtype=np.int64)
+    return df
+
+
+def normalize_ohlcv_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce an arbitrary OHLCV frame (connector output, DB export, ...) into the
+    storage contract: UTC DatetimeIndex, float64 prices, int64 volume, no duplicates.
+    """
+    if df is None or df.empty:
+        return empty_ohlcv_frame()
+
+    frame = df.copy()
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        if "timestamp" in frame.columns:
+            frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+            frame.set_index("timestamp", inplace=True)
+        else:
+            frame.index = pd.to_datetime(frame.index, utc=True)
+
+    if frame.index.tz is None:
+        frame.index = frame.index.tz_localize("UTC")
+    else:
+        frame.index = frame.index.tz_convert("UTC")
+    frame.index.name = "timestamp"
+
+    for col in PRICE_COLUMNS:
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype(np.float64)
+    frame["volume"] = (
+        pd.to_numeric(frame["volume"], errors="coerce").fillna(0).astype(np.int64)
+    )
+
+    frame = frame[OHLCV_COLUMNS]
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame
@@ -0,0 +1,155 @@
+# apps/market_data/storage/bulk_writer.py
+"""
+Columnar bulk writer for the relational OHLCV table.
+
+Batches are built straight from the DataFrame's column arrays (no `iterrows()`
+and no per-row `Series`), written with `bulk_create(batch_size=...)` and, in
+upsert mode, conflicting bars are updated in place so the still-forming last
+bar is repaired on the next ingestion instead of being silently ignored.
+
+`bulk_create(ignore_conflicts=True)` returns every object it was given on most
+backends, so its length is not a row count. The writer counts the rows in each
+batch's timestamp range before and after the write instead, which yields exact
+inserted/updated figures on every database with two indexed COUNT queries.
+
+On PostgreSQL, large frames skip all of that and go through `COPY FROM STDIN`
+into a staging table plus one `INSERT ... ON CONFLICT` (see `apps.common.pg_copy`).
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.pg_copy import copy_enabled, copy_rows
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.base import PRICE_COLUMNS, normalize_ohlcv_frame
+
+WRITE_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class BulkWriteResult:
+    """Outcome of a bulk OHLCV write."""
+
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    first_timestamp: Optional[datetime.datetime] = None
+    last_timestamp: Optional[datetime.datetime] = None
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+
+def write_ohlcv_bars(
+    asset: Asset,
+    timeframe: str,
+    df: pd.DataFrame,
+    upsert: bool = True,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> BulkWriteResult:
+    """
+    Persist `df` into the OHLCV table.
+
+    Args:
+        asset: owning Asset
+        timeframe: timeframe code (e.g. "H1")
+        df: OHLCV frame; normalised to the storage contract first
+        upsert: update prices/volume of bars that already exist (otherwise they are skipped)
+        batch_size: rows per INSERT statement and per counting window
+
+    Returns:
+        BulkWriteResult with exact inserted/updated/skipped counts.
+    """
+    frame = normalize_ohlcv_frame(df).dropna(subset=PRICE_COLUMNS)
+    if frame.empty:
+        return BulkWriteResult()
+
+    if copy_enabled(len(frame)):
+        return _copy_ohlcv_bars(asset, timeframe, frame, upsert)
+
+    timestamps = frame.index.to_pydatetime()
+    prices = frame[PRICE_COLUMNS].to_numpy().tolist()
+    volumes = frame["volume"].to_numpy().tolist()
+    series = OHLCV.objects.filter(asset=asset, timeframe=timeframe)
+
+    conflict_options = (
+        {
+            "update_conflicts": True,
+            "unique_fields": ["asset", "timeframe", "timestamp"],
+            "update_fields": [*PRICE_COLUMNS, "volume"],
+        }
+        if upsert
+        else {"ignore_conflicts": True}
+    )
+
+    inserted = 0
+    total = len(timestamps)
+    with transaction.atomic():
+        for offset in range(0, total, batch_size):
+            window = slice(offset, offset + batch_size)
+            batch_ts = timestamps[window]
+            in_range = series.filter(timestamp__range=(batch_ts[0], batch_ts[-1]))
+            before = in_range.count()
+
+            records = [
+                OHLCV(
+                    asset=asset,
+                    timeframe=timeframe,
+                    timestamp=ts,
+                    open=o,
+                    high=h,
+                    low=l,
+                    close=c,
+                    volume=v,
+                )
+                for ts, (o, h, l, c), v in zip(batch_ts, prices[window], volumes[window])
+            ]
+            OHLCV.objects.bulk_create(records, batch_size=batch_size, **conflict_options)
+            inserted += in_range.count() - before
+
+    existing = total - inserted
+    return BulkWriteResult(
+        inserted=inserted,
+        updated=existing if upsert else 0,
+        skipped=0 if upsert else existing,
+        first_timestamp=timestamps[0],
+        last_timestamp=timestamps[-1],
+    )
+
+
+def _copy_ohlcv_bars(
+    asset: Asset, timeframe: str, frame: pd.DataFrame, upsert: bool
+) -> BulkWriteResult:
+    """PostgreSQL path of `write_ohlcv_bars`: one COPY and one merge for the whole frame."""
+    created_at = timezone.now().isoformat()
+    rows = zip(
+        [asset.pk] * len(frame),
+        [timeframe] * len(frame),
+        frame.index.map(pd.Timestamp.isoformat),
+        *(frame[col].to_numpy().tolist() for col in PRICE_COLUMNS),
+        frame["volume"].to_numpy().tolist(),
+        [created_at] * len(frame),
+    )
+    result = copy_rows(
+        OHLCV,
+        ["asset", "timeframe", "timestamp", *PRICE_COLUMNS, "volume", "created_at"],
+        rows,
+        unique_fields=["asset", "timeframe", "timestamp"],
+        update_fields=[*PRICE_COLUMNS, "volume"] if upsert else None,
+    )
+    existing = len(frame) - result.inserted
+    return BulkWriteResult(
+        inserted=result.inserted,
+        updated=existing if upsert else 0,
+        skipped=0 if upsert else existing,
+        first_timestamp=frame.index[0].to_pydatetime(),
+        last_timestamp=frame.index[-1].to_pydatetime(),
+    )
@@ -0,0 +1,114 @@
+# apps/market_data/storage/fixed_point_store.py
+"""
+Fixed-point OHLCV backend backed by the `ScaledOHLCV` table.
+
+Prices live in the database as int64 scaled by `10**asset.price_scale`. Reads
+stream the integers into an int64 matrix and rescale every column in a single
+vectorised division; writes round whole columns back to integers and upsert
+them in batches.
+"""
+
+from __future__ import annotations
+
+import datetime
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import F
+
+from apps.market_data.models import Asset, ScaledOHLCV
+from apps.market_data.storage.base import (
+    PRICE_COLUMNS,
+    empty_ohlcv_frame,
+    ensure_utc,
+    normalize_ohlcv_frame,
+)
+from apps.market_data.storage.orm_store import estimate_capacity, fetch_bar_arrays
+
+WRITE_BATCH_SIZE = 5000
+
+
+class FixedPointOHLCVStore:
+    """
+    Reads and writes OHLCV bars as scaled integers.
+
+    Example:
+        store = FixedPointOHLCVStore()
+        store.write(asset, "H1", df)        # e.g. 1.16622 -> 116622000 at scale 8
+        df = store.load(asset, "H1", start_utc, end_utc)
+    """
+
+    mirrors_database = True
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+
+        queryset = (
+            ScaledOHLCV.objects.filter(
+                asset=asset, timeframe=timeframe, timestamp__range=(start_utc, end_utc)
+            )
+            .order_by("timestamp")
+            .annotate(
+                bar_timestamp=F("timestamp"),
+                **{f"bar_{col}": F(col) for col in PRICE_COLUMNS},
+                bar_volume=F("volume"),
+            )
+            .values_list("bar_timestamp", *(f"bar_{col}" for col in PRICE_COLUMNS), "bar_volume")
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        capacity = estimate_capacity(timeframe, start_utc, end_utc)
+        timestamps, scaled, volumes = fetch_bar_arrays(sql, params, capacity, np.int64)
+        if len(volumes) == 0:
+            return empty_ohlcv_frame()
+
+        prices = scaled / float(10 ** asset.price_scale)
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True), name="timestamp")
+        df = pd.DataFrame(prices, index=index, columns=PRICE_COLUMNS, copy=False)
+        df["volume"] = volumes
+        return df
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        """Upsert `df` into ScaledOHLCV. Returns the number of rows written."""
+        frame = normalize_ohlcv_frame(df).dropna(subset=PRICE_COLUMNS)
+        if frame.empty:
+            return 0
+
+        factor = float(10 ** asset.price_scale)
+        scaled = np.rint(frame[PRICE_COLUMNS].to_numpy(dtype=np.float64) * factor).astype(np.int64)
+        timestamps = frame.index.to_pydatetime()
+        volumes = frame["volume"].to_numpy(dtype=np.int64)
+
+        records = [
+            ScaledOHLCV(
+                asset=asset,
+                timeframe=timeframe,
+                timestamp=ts,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v,
+            )
+            for ts, (o, h, l, c), v in zip(timestamps, scaled.tolist(), volumes.tolist())
+        ]
+        with transaction.atomic():
+            ScaledOHLCV.objects.bulk_create(
+                records,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=["asset", "timeframe", "timestamp"],
+                update_fields=[*PRICE_COLUMNS, "volume"],
+            )
+        return len(records)
@@ -0,0 +1,265 @@
+# apps/market_data/storage/frame_cache.py
+"""
+Process-local cache of OHLCV frames.
+
+One chain run loads the same (asset, timeframe) history several times (regime,
+scan, verification, features, DecisionManager), each with a slightly different
+window ending at `timezone.now()`. The cache keeps ONE contiguous frame per
+series and:
+  - serves any sub-range of what it holds by slicing;
+  - extends itself backwards with a single prefix load when an older start is asked for;
+  - appends only the bars from its last cached bar onwards (the last bar is
+    re-read because it may still have been forming when it was cached);
+  - evicts least-recently-used series once `max_entries` or `max_bytes` is exceeded.
+
+Ingestion calls `truncate` after writing so bars rewritten behind the cached
+tail are re-read on the next access. Writes by other processes (Celery
+workers filling holes, backfills, seeding) cannot reach this cache, so every
+lookup also compares the series' newest `CoverageInterval.updated_at`, which
+each write bumps, with the one seen when the entry was loaded and reloads the
+series when it moved. The live bar feed (`apps.market_data.live`)
+`append`s bars as they close, before they reach the database; those bars are
+final, so tail re-reads start after them instead of replacing them with a
+still-forming copy the store may hold.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import pandas as pd
+import structlog
+
+from django.db.models import Max
+
+from apps.market_data.models import Asset, CoverageInterval
+from apps.market_data.storage.backends import get_market_data_config, get_ohlcv_store
+from apps.market_data.storage.base import OHLCVStore, empty_ohlcv_frame, ensure_utc
+
+logger = structlog.get_logger(__name__)
+
+_EPSILON = datetime.timedelta(microseconds=1)
+
+CacheKey = Tuple[int, str]
+
+
+@dataclass
+class _CachedSeries:
+    frame: pd.DataFrame
+    covered_from: datetime.datetime
+    covered_to: datetime.datetime
+    nbytes: int = 0
+    # last bar known to be closed (appended by the live feed); never re-read
+    closed_to: Optional[datetime.datetime] = None
+    # newest coverage update of the series when the frame was loaded (see `_write_marker`)
+    marker: Optional[datetime.datetime] = None
+
+
+class OHLCVFrameCache:
+    """
+    LRU cache of contiguous OHLCV frames keyed by (asset id, timeframe).
+
+    Example:
+        cache = OHLCVFrameCache(max_entries=32, max_bytes=256 * 1024 ** 2)
+        df = cache.get(asset, "H1", now - timedelta(days=45), now)  # one load
+        df = cache.get(asset, "H1", now - timedelta(days=10), now)  # sliced, no query
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        max_bytes: int = 256 * 1024 ** 2,
+        store: Optional[OHLCVStore] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._store = store
+        self._entries: "OrderedDict[CacheKey, _CachedSeries]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def store(self) -> OHLCVStore:
+        return self._store if self._store is not None else get_ohlcv_store()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        """Return bars in [start_utc, end_utc] (inclusive), loading only what is missing."""
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+        if start_utc > end_utc:
+            return empty_ohlcv_frame()
+
+        key = (asset.pk, timeframe)
+        # Read before loading: a write that lands during the load moves it again.
+        marker = _write_marker(asset, timeframe)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.marker != marker:
+                logger.debug("OHLCV series written elsewhere, reloading", asset=asset.symbol, timeframe=timeframe)
+                self._bytes -= self._entries.pop(key).nbytes
+                entry = None
+            if entry is None:
+                frame = self.store.load(asset, timeframe, start_utc, end_utc)
+                entry = _CachedSeries(frame, start_utc, end_utc, marker=marker)
+            else:
+                entry = self._extend(asset, timeframe, entry, start_utc, end_utc)
+            self._put(key, entry)
+            return entry.frame.loc[start_utc:end_utc].copy()
+
+    def _extend(
+        self,
+        asset: Asset,
+        timeframe: str,
+        entry: _CachedSeries,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> _CachedSeries:
+        parts = []
+        covered_from, covered_to = entry.covered_from, entry.covered_to
+        frame = entry.frame
+
+        if start_utc < covered_from:
+            parts.append(self.store.load(asset, timeframe, start_utc, covered_from - _EPSILON))
+            covered_from = start_utc
+
+        if end_utc > covered_to:
+            # Re-read from the last cached bar: it may have been forming when cached.
+            tail_from = frame.index[-1].to_pydatetime() if not frame.empty else covered_to
+            if entry.closed_to is not None and entry.closed_to >= tail_from:
+                tail_from = entry.closed_to + _EPSILON
+            tail = self.store.load(asset, timeframe, tail_from, end_utc)
+            frame = frame.loc[: tail_from - _EPSILON]
+            covered_to = end_utc
+            logger.debug("Appending OHLCV tail to cache", asset=asset.symbol, timeframe=timeframe, bars=len(tail))
+            parts.extend([frame, tail])
+        else:
+            parts.append(frame)
+
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            merged = empty_ohlcv_frame()
+        elif len(parts) == 1:
+            merged = parts[0]
+        else:
+            merged = pd.concat(parts)
+            merged = merged[~merged.index.duplicated(keep="last")]
+        return _CachedSeries(merged, covered_from, covered_to, closed_to=entry.closed_to, marker=entry.marker)
+
+    def _put(self, key: CacheKey, entry: _CachedSeries) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        entry.nbytes = int(entry.frame.memory_usage(index=True, deep=False).sum())
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        # Always keep the most recent entry, even if it alone exceeds the budget.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            logger.debug("Evicted OHLCV series from cache", key=key, nbytes=evicted.nbytes)
+
+    def append(self, asset: Asset, timeframe: str, bars: pd.DataFrame) -> bool:
+        """
+        Add closed bars from the live feed to a cached series, ahead of their
+        (asynchronous) write to the store.
+
+        Returns:
+            False when the series is not cached; warm it with `get` first.
+        """
+        if bars.empty:
+            return True
+        key = (asset.pk, timeframe)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            merged = pd.concat([entry.frame, bars])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            last = bars.index[-1].to_pydatetime()
+            self._put(
+                key,
+                _CachedSeries(
+                    merged,
+                    entry.covered_from,
+                    max(entry.covered_to, last),
+                    closed_to=max(entry.closed_to or last, last),
+                    marker=entry.marker,
+                ),
+            )
+            return True
+
+    def truncate(self, asset: Asset, timeframe: str, from_utc: datetime.datetime) -> None:
+        """Forget cached bars at or after `from_utc` (they were rewritten by ingestion)."""
+        from_utc = ensure_utc(from_utc)
+        key = (asset.pk, timeframe)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or from_utc > entry.covered_to:
+                return
+            if from_utc <= entry.covered_from:
+                self._bytes -= self._entries.pop(key).nbytes
+                return
+            closed_to = entry.closed_to if entry.closed_to is not None and entry.closed_to < from_utc else None
+            self._put(
+                key,
+                _CachedSeries(
+                    entry.frame.loc[: from_utc - _EPSILON],
+                    entry.covered_from,
+                    from_utc - _EPSILON,
+                    closed_to=closed_to,
+                    marker=entry.marker,
+                ),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _write_marker(asset: Asset, timeframe: str) -> Optional[datetime.datetime]:
+    """Newest `CoverageInterval.updated_at` of the series: every write through `publish_written_bars` moves it."""
+    return CoverageInterval.objects.filter(asset=asset, timeframe=timeframe).aggregate(
+        marker=Max("updated_at")
+    )["marker"]
+
+
+_frame_cache: Optional[OHLCVFrameCache] = None
+_frame_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> Optional[OHLCVFrameCache]:
+    """Return the process-wide cache, or None when `FRAME_CACHE_ENABLED` is off."""
+    global _frame_cache
+    config = get_market_data_config()
+    if not config.get("FRAME_CACHE_ENABLED", False):
+        return None
+    with _frame_cache_lock:
+        if _frame_cache is None:
+            _frame_cache = OHLCVFrameCache(
+                max_entries=config.get("FRAME_CACHE_MAX_ENTRIES", 32),
+                max_bytes=config.get("FRAME_CACHE_MAX_BYTES", 256 * 1024 ** 2),
+            )
+        return _frame_cache
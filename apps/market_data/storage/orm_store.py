@@ -0,0 +1,283 @@
+# apps/market_data/storage/orm_store.py
+"""
+Default OHLCV backend: reads bars straight from the relational `OHLCV` table.
+
+Two read modes are available:
+  - the classic path (`queryset.values(...)` -> DataFrame -> `pd.to_numeric`),
+    which materialises one dict and four `Decimal` objects per bar;
+  - the NumPy fast path, which casts prices to double precision in SQL, streams
+    flat tuples from a raw cursor and copies them into preallocated
+    float64/int64 arrays. No per-row dicts, no `Decimal`s and no `exists()`
+    round trip before the load.
+
+`load_many` serves multi-asset panels (see `apps.market_data.panel`) from one
+query on the fast path, with the asset id as an extra leading column.
+
+All of these are range scans on (asset, timeframe, timestamp) that only read
+bar columns, which the `ohlcv_series_range_cover` index answers on its own.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.base import (
+    OHLCV_COLUMNS,
+    PRICE_COLUMNS,
+    empty_ohlcv_frame,
+    ensure_utc,
+)
+
+# Rows pulled from the cursor per round trip on the fast path.
+FETCH_CHUNK_SIZE = 10_000
+# Upper bound for the up-front allocation when the range is open-ended.
+MAX_INITIAL_CAPACITY = 1_000_000
+
+
+def estimate_capacity(
+    timeframe: str, start_utc: datetime.datetime, end_utc: datetime.datetime
+) -> int:
+    """Guess how many bars fit in [start, end] so arrays rarely need to grow."""
+    try:
+        bar = Timeframe(timeframe).to_timedelta()
+        estimate = int((end_utc - start_utc) / bar) + 1
+    except (ValueError, OverflowError):
+        estimate = FETCH_CHUNK_SIZE
+    return max(1, min(estimate, MAX_INITIAL_CAPACITY))
+
+
+def fetch_bar_arrays(
+    sql: str, params: Sequence[Any], capacity: int, price_dtype: Any
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Execute `sql` (selecting timestamp, open, high, low, close, volume in that
+    order) and copy the rows into preallocated arrays, growing them geometrically
+    when the capacity estimate was too small.
+
+    Returns:
+        (timestamps as object array, prices as (n, 4) array of `price_dtype`, volumes as int64)
+    """
+    _, timestamps, prices, volumes = _stream_bar_arrays(sql, params, capacity, price_dtype, keyed=False)
+    return timestamps, prices, volumes
+
+
+def fetch_keyed_bar_arrays(
+    sql: str, params: Sequence[Any], capacity: int, price_dtype: Any
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Like `fetch_bar_arrays`, for SQL that selects an integer key (e.g. the
+    asset id) in front of the six bar columns.
+
+    Returns:
+        (keys as int64, timestamps, prices, volumes)
+    """
+    return _stream_bar_arrays(sql, params, capacity, price_dtype, keyed=True)
+
+
+def _stream_bar_arrays(
+    sql: str, params: Sequence[Any], capacity: int, price_dtype: Any, keyed: bool
+) -> Tuple[Optional[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+    keys = np.empty(capacity, dtype=np.int64) if keyed else None
+    timestamps = np.empty(capacity, dtype=object)
+    prices = np.empty((capacity, len(PRICE_COLUMNS)), dtype=price_dtype)
+    volumes = np.empty(capacity, dtype=np.int64)
+    n_rows = 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            chunk = cursor.fetchmany(FETCH_CHUNK_SIZE)
+            if not chunk:
+                break
+            size = len(chunk)
+            if n_rows + size > capacity:
+                capacity = max(capacity * 2, n_rows + size)
+                if keyed:
+                    keys = np.resize(keys, capacity)
+                timestamps = np.resize(timestamps, capacity)
+                prices = np.resize(prices, (capacity, len(PRICE_COLUMNS)))
+                volumes = np.resize(volumes, capacity)
+
+            columns = zip(*chunk)
+            window = slice(n_rows, n_rows + size)
+            if keyed:
+                keys[window] = next(columns)
+            ts_col, o_col, h_col, l_col, c_col, v_col = columns
+            timestamps[window] = ts_col
+            prices[window, 0] = o_col
+            prices[window, 1] = h_col
+            prices[window, 2] = l_col
+            prices[window, 3] = c_col
+            volumes[window] = v_col
+            n_rows += size
+
+    if keyed:
+        keys = keys[:n_rows]
+    return keys, timestamps[:n_rows], prices[:n_rows], volumes[:n_rows]
+
+
+class ORMOHLCVStore:
+    """
+    Reads OHLCV rows through the Django ORM.
+
+    The OHLCV table is the system of record, so this backend never needs to be
+    fed on ingest (`mirrors_database = False`); `write` is a no-op.
+    """
+
+    mirrors_database = False
+
+    def __init__(self, fast_path: bool = False) -> None:
+        self.fast_path = fast_path
+
+    def _queryset(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ):
+        return OHLCV.objects.filter(
+            asset=asset,
+            timeframe=timeframe,
+            timestamp__range=(start_utc, end_utc),
+        ).order_by("timestamp")
+
+    def _many_queryset(
+        self,
+        assets: Sequence[Asset],
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ):
+        return OHLCV.objects.filter(
+            asset_id__in=[asset.pk for asset in assets],
+            timeframe=timeframe,
+            timestamp__range=(start_utc, end_utc),
+        ).order_by("timestamp", "asset_id")
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+        if self.fast_path:
+            return self._load_numpy(asset, timeframe, start_utc, end_utc)
+
+        queryset = self._queryset(asset, timeframe, start_utc, end_utc)
+        if not queryset.exists():
+            return empty_ohlcv_frame()
+
+        df = pd.DataFrame.from_records(queryset.values("timestamp", *OHLCV_COLUMNS))
+
+        for col in OHLCV_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        df.set_index("timestamp", inplace=True)
+        return df[OHLCV_COLUMNS]
+
+    def _load_numpy(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        queryset = _bar_values(self._queryset(asset, timeframe, start_utc, end_utc))
+        sql, params = queryset.query.sql_with_params()
+
+        capacity = estimate_capacity(timeframe, start_utc, end_utc)
+        timestamps, prices, volumes = fetch_bar_arrays(sql, params, capacity, np.float64)
+        if len(volumes) == 0:
+            return empty_ohlcv_frame()
+
+        # SQLite hands back ISO strings, PostgreSQL aware datetimes; both parse vectorised.
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True), name="timestamp")
+        df = pd.DataFrame(prices, index=index, columns=PRICE_COLUMNS, copy=False)
+        df["volume"] = volumes
+        return df
+
+    def load_many(
+        self,
+        assets: Sequence[Asset],
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        """
+        Load the bars of several assets with a single query (always on the NumPy path).
+
+        Returns:
+            Long frame indexed by timestamp with a `symbol` column followed by
+            the OHLCV columns, sorted by (timestamp, asset).
+        """
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+        symbols = {asset.pk: asset.symbol for asset in assets}
+
+        queryset = _bar_values(
+            self._many_queryset(assets, timeframe, start_utc, end_utc), key="asset_id"
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        capacity = estimate_capacity(timeframe, start_utc, end_utc) * max(1, len(symbols))
+        asset_ids, timestamps, prices, volumes = fetch_keyed_bar_arrays(
+            sql, params, min(capacity, MAX_INITIAL_CAPACITY), np.float64
+        )
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True), name="timestamp")
+        df = pd.DataFrame(prices, index=index, columns=PRICE_COLUMNS, copy=False)
+        df.insert(0, "symbol", pd.Series(asset_ids, index=index).map(symbols).to_numpy(dtype=object))
+        df["volume"] = volumes
+        return df
+
+    def loader_querysets(
+        self,
+        assets: Sequence[Asset],
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> Dict[str, Any]:
+        """The querysets `load` and `load_many` execute, by name (for plan audits)."""
+        single = self._queryset(assets[0], timeframe, start_utc, end_utc)
+        return {
+            "load (fast path)": _bar_values(single),
+            "load (classic)": single.values("timestamp", *OHLCV_COLUMNS),
+            "load_many": _bar_values(
+                self._many_queryset(assets, timeframe, start_utc, end_utc), key="asset_id"
+            ),
+        }
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        return 0
+
+
+def _bar_values(queryset, key: Optional[str] = None):
+    """
+    Project `queryset` onto the raw-cursor column layout: [key,] timestamp, the
+    four prices cast to double precision, volume.
+    """
+    # Select only annotations so the SQL column order is exactly the one below
+    # (values_list reorders mixed field/expression columns in Python, not in SQL).
+    columns = ["bar_timestamp", *(f"bar_{col}" for col in PRICE_COLUMNS), "bar_volume"]
+    annotations = {
+        "bar_timestamp": F("timestamp"),
+        **{f"bar_{col}": Cast(col, FloatField()) for col in PRICE_COLUMNS},
+        "bar_volume": F("volume"),
+    }
+    if key is not None:
+        annotations = {"bar_key": F(key), **annotations}
+        columns.insert(0, "bar_key")
+    return queryset.annotate(**annotations).values_list(*columns)
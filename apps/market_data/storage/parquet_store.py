@@ -0,0 +1,245 @@
+# apps/market_data/storage/parquet_store.py
+"""
+Columnar OHLCV backend built on Parquet/Arrow.
+
+Layout (hive-style, one file per calendar month):
+
+    <root>/asset=XAUUSD/timeframe=H1/2024-01.parquet
+
+Reads prune partitions by month from the file names and push the exact
+timestamp predicate down to the Parquet row groups, so a 45-day window touches
+at most two or three small files regardless of how much history is stored.
+Frames come back as float64/int64 columns without any Decimal round trip.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import structlog
+
+from apps.common.sqlite import file_lock
+from apps.market_data.models import Asset
+from apps.market_data.storage.base import (
+    OHLCV_COLUMNS,
+    empty_ohlcv_frame,
+    ensure_utc,
+    normalize_ohlcv_frame,
+)
+
+logger = structlog.get_logger(__name__)
+
+OHLCV_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ns", tz="UTC")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.int64()),
+    ]
+)
+# Hive partition keys, and the file columns plus those keys for scans spanning several series.
+PARTITION_SCHEMA = pa.schema([("asset", pa.string()), ("timeframe", pa.string())])
+PANEL_SCHEMA = pa.unify_schemas([OHLCV_SCHEMA, PARTITION_SCHEMA])
+
+
+class ParquetOHLCVStore:
+    """
+    Month-partitioned Parquet store for OHLCV bars.
+
+    Example:
+        store = ParquetOHLCVStore("/srv/trady2/ohlcv")
+        store.write(asset, "H1", df)
+        df = store.load(asset, "H1", start_utc, end_utc)
+    """
+
+    mirrors_database = True
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        compression: str = "zstd",
+        row_group_size: int = 50_000,
+    ) -> None:
+        self.root = Path(root)
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+    def series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"asset={symbol}" / f"timeframe={timeframe}"
+
+    def partition_path(self, symbol: str, timeframe: str, month: pd.Period) -> Path:
+        return self.series_dir(symbol, timeframe) / f"{month.strftime('%Y-%m')}.parquet"
+
+    def _partitions_in_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_utc: Optional[datetime.datetime],
+        end_utc: Optional[datetime.datetime],
+    ) -> List[Path]:
+        series_dir = self.series_dir(symbol, timeframe)
+        if not series_dir.is_dir():
+            return []
+
+        first = f"{start_utc:%Y-%m}" if start_utc is not None else None
+        last = f"{end_utc:%Y-%m}" if end_utc is not None else None
+        paths = []
+        for path in sorted(series_dir.glob("*.parquet")):
+            month = path.stem
+            if first is not None and month < first:
+                continue
+            if last is not None and month > last:
+                continue
+            paths.append(path)
+        return paths
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        return self.load_symbol(asset.symbol, timeframe, start_utc, end_utc)
+
+    def load_symbol(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_utc: Optional[datetime.datetime] = None,
+        end_utc: Optional[datetime.datetime] = None,
+    ) -> pd.DataFrame:
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+
+        paths = self._partitions_in_range(symbol, timeframe, start_utc, end_utc)
+        if not paths:
+            return empty_ohlcv_frame()
+
+        predicate = None
+        if start_utc is not None:
+            predicate = ds.field("timestamp") >= pa.scalar(pd.Timestamp(start_utc), OHLCV_SCHEMA.field("timestamp").type)
+        if end_utc is not None:
+            upper = ds.field("timestamp") <= pa.scalar(pd.Timestamp(end_utc), OHLCV_SCHEMA.field("timestamp").type)
+            predicate = upper if predicate is None else predicate & upper
+
+        dataset = ds.dataset([str(p) for p in paths], schema=OHLCV_SCHEMA, format="parquet")
+        table = dataset.to_table(filter=predicate)
+        if table.num_rows == 0:
+            return empty_ohlcv_frame()
+
+        df = table.to_pandas()
+        df.set_index("timestamp", inplace=True)
+        df.sort_index(inplace=True)
+        return df[OHLCV_COLUMNS]
+
+    def load_many(
+        self,
+        assets: Sequence[Asset],
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        """
+        Load several series with one dataset scan; the symbol comes from the
+        `asset=` partition directory.
+
+        Returns:
+            Long frame indexed by timestamp with a `symbol` column followed by
+            the OHLCV columns, sorted by (timestamp, symbol).
+        """
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+
+        paths = [
+            str(path)
+            for asset in assets
+            for path in self._partitions_in_range(asset.symbol, timeframe, start_utc, end_utc)
+        ]
+        if not paths:
+            frame = empty_ohlcv_frame()
+            frame.insert(0, "symbol", pd.Series([], index=frame.index, dtype=object))
+            return frame
+
+        timestamp_type = OHLCV_SCHEMA.field("timestamp").type
+        predicate = (ds.field("timestamp") >= pa.scalar(pd.Timestamp(start_utc), timestamp_type)) & (
+            ds.field("timestamp") <= pa.scalar(pd.Timestamp(end_utc), timestamp_type)
+        )
+        dataset = ds.dataset(
+            paths,
+            schema=PANEL_SCHEMA,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            partition_base_dir=str(self.root),
+        )
+        table = dataset.to_table(columns=["asset", *OHLCV_SCHEMA.names], filter=predicate)
+
+        df = table.to_pandas().rename(columns={"asset": "symbol"})
+        df.sort_values(["timestamp", "symbol"], inplace=True, kind="stable")
+        df.set_index("timestamp", inplace=True)
+        return df[["symbol", *OHLCV_COLUMNS]]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        return self.write_symbol(asset.symbol, timeframe, df)
+
+    def write_symbol(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Merge `df` into the month partitions it touches. Rows already stored for
+        the same timestamp are replaced, so re-ingesting a window is idempotent.
+
+        Returns:
+            Number of rows written from `df`.
+        """
+        frame = normalize_ohlcv_frame(df)
+        if frame.empty:
+            return 0
+
+        months = frame.index.tz_convert(None).to_period("M")
+        for month, part in frame.groupby(months):
+            path = self.partition_path(symbol, timeframe, month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Read-modify-write of one partition: concurrent writers (backfill threads,
+            # other workers) take turns so neither loses the other's rows.
+            with file_lock(f"{path}.lock"):
+                if path.exists():
+                    existing = pq.read_table(path, schema=OHLCV_SCHEMA).to_pandas().set_index("timestamp")
+                    part = pd.concat([existing, part])
+                    part = part[~part.index.duplicated(keep="last")].sort_index()
+
+                table = pa.Table.from_pandas(part.reset_index(), schema=OHLCV_SCHEMA, preserve_index=False)
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                pq.write_table(
+                    table,
+                    tmp_path,
+                    compression=self.compression,
+                    row_group_size=self.row_group_size,
+                )
+                os.replace(tmp_path, path)
+
+        logger.info("Parquet OHLCV partitions updated", symbol=symbol, timeframe=timeframe, rows=len(frame))
+        return len(frame)
+
+    def delete_symbol(self, symbol: str, timeframe: str) -> None:
+        """Remove every partition of a series (used before a full re-sync)."""
+        for path in self._partitions_in_range(symbol, timeframe, None, None):
+            path.unlink()
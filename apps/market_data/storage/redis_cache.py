@@ -0,0 +1,301 @@
+# apps/market_data/storage/redis_cache.py
+"""
+Cross-worker OHLCV cache in Redis.
+
+Celery workers are separate processes, so the in-process frame cache only helps
+within one worker. This module keeps OHLCV segments in Redis (already our broker)
+so every worker can reuse bars another one has read:
+
+  - one key per (symbol, timeframe, UTC day): `ohlcv:v1:EURUSD:H1:2024-01-31`
+  - values are compact binary arrays (see `encode_segment`): int64 epoch-ns
+    timestamps, float64 prices stored column by column and int64 volumes,
+    ~40 bytes per bar, decoded with `np.frombuffer` and no parsing
+  - days without bars are cached too, so weekends are not re-queried
+  - a read fetches all buckets with one MGET and loads each run of consecutive
+    missing days from the underlying store in a single query
+  - ingestion calls `invalidate` for the days it wrote, which also bumps a
+    per-series generation counter. Readers note the generation before loading
+    from the store and only cache what they loaded if it is unchanged
+    (WATCH/MULTI), so a read that raced a write can't put the old bars back
+    for the full TTL. The current day also gets a short TTL.
+
+Any Redis error degrades to reading the underlying store directly.
+"""
+
+from __future__ import annotations
+
+import datetime
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import structlog
+from django.conf import settings
+
+from apps.market_data.models import Asset
+from apps.market_data.storage.base import (
+    OHLCVStore,
+    PRICE_COLUMNS,
+    empty_ohlcv_frame,
+    ensure_utc,
+    normalize_ohlcv_frame,
+)
+
+try:
+    import redis
+
+    _REDIS_AVAILABLE = True
+except ImportError:  # pragma: no cover - redis is a core requirement
+    _REDIS_AVAILABLE = False
+
+logger = structlog.get_logger(__name__)
+
+_HEADER = struct.Struct("<4sI")
+_MAGIC = b"OHL1"
+_ONE_DAY = datetime.timedelta(days=1)
+_EPSILON = datetime.timedelta(microseconds=1)
+
+
+def encode_segment(df: pd.DataFrame) -> bytes:
+    """Pack an OHLCV frame (storage contract) into a compact columnar byte string."""
+    n_rows = len(df)
+    if n_rows == 0:
+        return _HEADER.pack(_MAGIC, 0)
+    timestamps = df.index.as_unit("ns").asi8.astype("<i8", copy=False)
+    prices = np.ascontiguousarray(df[PRICE_COLUMNS].to_numpy(dtype="<f8").T)
+    volumes = df["volume"].to_numpy(dtype="<i8")
+    return b"".join(
+        (_HEADER.pack(_MAGIC, n_rows), timestamps.tobytes(), prices.tobytes(), volumes.tobytes())
+    )
+
+
+def decode_segment(payload: bytes) -> pd.DataFrame:
+    """Inverse of `encode_segment`."""
+    magic, n_rows = _HEADER.unpack_from(payload)
+    if magic != _MAGIC:
+        raise ValueError("Unrecognised OHLCV segment encoding.")
+    if n_rows == 0:
+        return empty_ohlcv_frame()
+
+    offset = _HEADER.size
+    timestamps = np.frombuffer(payload, dtype="<i8", count=n_rows, offset=offset)
+    offset += 8 * n_rows
+    prices = np.frombuffer(payload, dtype="<f8", count=4 * n_rows, offset=offset).reshape(4, n_rows)
+    offset += 32 * n_rows
+    volumes = np.frombuffer(payload, dtype="<i8", count=n_rows, offset=offset)
+
+    index = pd.DatetimeIndex(timestamps.view("M8[ns]"), name="timestamp").tz_localize("UTC")
+    df = pd.DataFrame(dict(zip(PRICE_COLUMNS, prices)), index=index)
+    df["volume"] = volumes
+    return df
+
+
+def _day_start(dt: datetime.datetime) -> datetime.datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RedisSegmentCache:
+    """
+    Day-bucketed OHLCV segments in Redis.
+
+    Example:
+        cache = RedisSegmentCache(redis.Redis.from_url(settings.REDIS_URL))
+        store = SharedCacheOHLCVStore(ORMOHLCVStore(), cache)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: int = 7 * 24 * 3600,
+        live_ttl: int = 300,
+        prefix: str = "ohlcv:v1",
+    ) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.live_ttl = live_ttl
+        self.prefix = prefix
+
+    def key(self, symbol: str, timeframe: str, day: datetime.datetime) -> str:
+        return f"{self.prefix}:{symbol}:{timeframe}:{day:%Y-%m-%d}"
+
+    def generation_key(self, symbol: str, timeframe: str) -> str:
+        return f"{self.prefix}:{symbol}:{timeframe}:generation"
+
+    def get_days(
+        self, symbol: str, timeframe: str, days: List[datetime.datetime]
+    ) -> Tuple[int, List[Optional[bytes]]]:
+        """(series generation, payload or None per day), in one MGET."""
+        values = self.client.mget(
+            [self.generation_key(symbol, timeframe)] + [self.key(symbol, timeframe, day) for day in days]
+        )
+        return int(values[0] or 0), values[1:]
+
+    def put_days(
+        self, symbol: str, timeframe: str, segments: Dict[datetime.datetime, bytes], generation: int
+    ) -> bool:
+        """
+        Cache `segments` unless the series was invalidated since `generation` was
+        read (the segments may predate that write). Returns whether they were stored.
+        """
+        generation_key = self.generation_key(symbol, timeframe)
+        today = _day_start(datetime.datetime.now(datetime.timezone.utc))
+        with self.client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(generation_key)
+                if int(pipe.get(generation_key) or 0) != generation:
+                    return False
+                pipe.multi()
+                for day, payload in segments.items():
+                    ttl = self.live_ttl if day >= today else self.ttl
+                    pipe.set(self.key(symbol, timeframe, day), payload, ex=ttl)
+                pipe.execute()
+            except redis.WatchError:
+                return False
+        return True
+
+    def invalidate(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> None:
+        """Drop every day bucket touched by [start_utc, end_utc]."""
+        day = _day_start(ensure_utc(start_utc))
+        last_day = _day_start(ensure_utc(end_utc))
+        keys = []
+        while day <= last_day:
+            keys.append(self.key(asset.symbol, timeframe, day))
+            day += _ONE_DAY
+        if not keys:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.incr(self.generation_key(asset.symbol, timeframe))
+            pipe.delete(*keys)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Failed to invalidate shared OHLCV cache", asset=asset.symbol, timeframe=timeframe)
+
+
+class SharedCacheOHLCVStore:
+    """
+    Read-through wrapper that serves `load` from Redis day buckets and falls back
+    to `inner` for missing days (or when Redis is unreachable).
+    """
+
+    def __init__(self, inner: OHLCVStore, cache: RedisSegmentCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def mirrors_database(self) -> bool:
+        return self.inner.mirrors_database
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+        if start_utc > end_utc:
+            return empty_ohlcv_frame()
+
+        days = []
+        day = _day_start(start_utc)
+        while day <= end_utc:
+            days.append(day)
+            day += _ONE_DAY
+
+        try:
+            generation, payloads = self.cache.get_days(asset.symbol, timeframe, days)
+        except redis.RedisError:
+            logger.warning("Shared OHLCV cache unavailable, reading store", asset=asset.symbol)
+            return self.inner.load(asset, timeframe, start_utc, end_utc)
+
+        segments: Dict[datetime.datetime, pd.DataFrame] = {}
+        missing: List[datetime.datetime] = []
+        for day, payload in zip(days, payloads):
+            if payload is None:
+                missing.append(day)
+            else:
+                segments[day] = decode_segment(payload)
+
+        if missing:
+            fetched = self._load_missing(asset, timeframe, missing)
+            segments.update(fetched)
+            try:
+                self.cache.put_days(
+                    asset.symbol,
+                    timeframe,
+                    {day: encode_segment(df) for day, df in fetched.items()},
+                    generation,
+                )
+            except redis.RedisError:
+                logger.warning("Failed to populate shared OHLCV cache", asset=asset.symbol)
+
+        frames = [segments[day] for day in days if not segments[day].empty]
+        if not frames:
+            return empty_ohlcv_frame()
+        df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        return df.loc[start_utc:end_utc]
+
+    def _load_missing(
+        self, asset: Asset, timeframe: str, missing: List[datetime.datetime]
+    ) -> Dict[datetime.datetime, pd.DataFrame]:
+        """Load whole days, one store query per run of consecutive missing days."""
+        runs: List[List[datetime.datetime]] = []
+        for day in missing:
+            if runs and day - runs[-1][-1] == _ONE_DAY:
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+
+        fetched: Dict[datetime.datetime, pd.DataFrame] = {}
+        for run in runs:
+            df = self.inner.load(asset, timeframe, run[0], run[-1] + _ONE_DAY - _EPSILON)
+            df = normalize_ohlcv_frame(df) if not df.empty else df
+            bucket_of = df.index.floor("D") if not df.empty else None
+            for day in run:
+                if bucket_of is None:
+                    fetched[day] = empty_ohlcv_frame()
+                else:
+                    fetched[day] = df[bucket_of == pd.Timestamp(day)]
+        return fetched
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        written = self.inner.write(asset, timeframe, df)
+        if df is not None and not df.empty:
+            index = normalize_ohlcv_frame(df).index
+            self.cache.invalidate(asset, timeframe, index[0].to_pydatetime(), index[-1].to_pydatetime())
+        return written
+
+
+_clients: Dict[str, Any] = {}
+
+
+def get_shared_segment_cache() -> Optional[RedisSegmentCache]:
+    """Return the Redis segment cache when `REDIS_CACHE_ENABLED` is set, else None."""
+    from apps.market_data.storage.backends import get_market_data_config
+
+    config = get_market_data_config()
+    if not config.get("REDIS_CACHE_ENABLED", False) or not _REDIS_AVAILABLE:
+        return None
+    url = config.get("REDIS_CACHE_URL") or settings.REDIS_URL
+    client = _clients.get(url)
+    if client is None:
+        # One client (and connection pool) per URL for the life of the process.
+        client = _clients[url] = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=config.get("REDIS_CACHE_TIMEOUT", 0.5),
+            socket_timeout=config.get("REDIS_CACHE_TIMEOUT", 0.5),
+        )
+    return RedisSegmentCache(
+        client,
+        ttl=config.get("REDIS_CACHE_TTL", 7 * 24 * 3600),
+        live_ttl=config.get("REDIS_CACHE_LIVE_TTL", 300),
+    )
@@ -0,0 +1,83 @@
+# apps/market_data/storage/resampled_store.py
+"""
+Resample-on-read fallback.
+
+Wraps a store so that a timeframe with no stored bars in the requested range is
+built on the fly from the base timeframe (`MARKET_DATA_CONFIG["BASE_TIMEFRAME"]`).
+Stored bars, e.g. ones materialised on ingest, always take precedence.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Optional
+
+import pandas as pd
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset
+from apps.market_data.resampling import (
+    SessionCalendar,
+    bucket_floor,
+    can_resample,
+    resample_ohlcv,
+)
+from apps.market_data.storage.base import OHLCVStore, ensure_utc
+
+_EPSILON = datetime.timedelta(microseconds=1)
+
+
+class ResamplingOHLCVStore:
+    """Serves higher timeframes from base bars when they are not stored."""
+
+    def __init__(
+        self,
+        inner: OHLCVStore,
+        base_timeframe: Timeframe,
+        session: Optional[SessionCalendar] = None,
+    ) -> None:
+        self.inner = inner
+        self.base_timeframe = base_timeframe
+        self.session = session or SessionCalendar()
+
+    @property
+    def mirrors_database(self) -> bool:
+        return self.inner.mirrors_database
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        df = self.inner.load(asset, timeframe, start_utc, end_utc)
+        if not df.empty:
+            return df
+        try:
+            target = Timeframe(timeframe)
+        except ValueError:
+            return df
+        if not can_resample(self.base_timeframe, target):
+            return df
+        return self.load_resampled(asset, target, start_utc, end_utc)
+
+    def load_resampled(
+        self,
+        asset: Asset,
+        target: Timeframe,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        """Build `target` bars in [start_utc, end_utc] from the base series."""
+        start_utc = ensure_utc(start_utc)
+        end_utc = ensure_utc(end_utc)
+        # Widen to whole buckets so the first and last bars aggregate every base bar.
+        base_start = bucket_floor(start_utc, target, self.session)
+        base_end = bucket_floor(end_utc, target, self.session) + target.to_timedelta() - _EPSILON
+        base = self.inner.load(asset, self.base_timeframe.value, base_start, base_end)
+        bars = resample_ohlcv(base, target, self.base_timeframe, self.session)
+        return bars.loc[start_utc:end_utc]
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        return self.inner.write(asset, timeframe, df)
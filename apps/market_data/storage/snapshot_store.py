@@ -0,0 +1,197 @@
+# apps/market_data/storage/snapshot_store.py
+"""
+Read-only, memory-mapped OHLCV snapshots for research and validation runs.
+
+`manage.py snapshot_ohlcv` exports each series to one fixed-layout file:
+
+    <root>/XAUUSD/H1.bars
+
+    header   128 bytes  magic, version, row count, first/last timestamp, symbol, timeframe
+    columns  rows x 8 bytes each, in order: timestamp (int64 ns UTC), open,
+             high, low, close (float64), volume (int64); little endian
+
+Readers `np.memmap` the file and binary-search the timestamp column, so a
+window costs two searches plus copying its own rows, and every process on the
+box reading the same snapshot shares one copy in the OS page cache instead of
+re-running the same multi-year query against the database.
+
+Snapshots are rewritten atomically (temp file + rename); mappings opened
+before a rewrite keep reading the old file until the store notices the change.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from apps.market_data.models import Asset
+from apps.market_data.storage.base import (
+    OHLCV_COLUMNS,
+    empty_ohlcv_frame,
+    ensure_utc,
+    normalize_ohlcv_frame,
+)
+
+logger = structlog.get_logger(__name__)
+
+MAGIC = b"TRDYBARS"
+VERSION = 1
+HEADER_SIZE = 128
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("header_size", "<u4"),
+        ("rows", "<u8"),
+        ("first", "<i8"),
+        ("last", "<i8"),
+        ("symbol", "S32"),
+        ("timeframe", "S8"),
+    ]
+)
+COLUMN_DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<i8"),
+}
+
+
+class SnapshotFormatError(ValueError):
+    """The file is not an OHLCV snapshot this version can read."""
+
+
+def write_snapshot(path: Union[str, Path], symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+    """Write `df` as a snapshot file at `path`, replacing any previous one. Returns the row count."""
+    frame = normalize_ohlcv_frame(df)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    columns = {col: frame[col].to_numpy() for col in OHLCV_COLUMNS}
+    columns["timestamp"] = frame.index.as_unit("ns").asi8
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["header_size"] = HEADER_SIZE
+    header["rows"] = len(frame)
+    header["first"] = columns["timestamp"][0] if len(frame) else 0
+    header["last"] = columns["timestamp"][-1] if len(frame) else 0
+    header["symbol"] = symbol.encode()
+    header["timeframe"] = timeframe.encode()
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+        for name, dtype in COLUMN_DTYPES.items():
+            fh.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+    os.replace(tmp, path)
+    return len(frame)
+
+
+class _MappedSeries:
+    """Column views over one memory-mapped snapshot file."""
+
+    def __init__(self, path: Path) -> None:
+        stat = path.stat()
+        self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        if raw.size < HEADER_SIZE:
+            raise SnapshotFormatError(f"{path} is too short to be an OHLCV snapshot.")
+        header = np.frombuffer(raw[: HEADER_DTYPE.itemsize].tobytes(), dtype=HEADER_DTYPE)[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise SnapshotFormatError(f"{path} is not a version {VERSION} OHLCV snapshot.")
+
+        self.rows = int(header["rows"])
+        offset = int(header["header_size"])
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            size = self.rows * dtype.itemsize
+            self.columns[name] = raw[offset : offset + size].view(dtype)
+            offset += size
+        if offset > raw.size:
+            raise SnapshotFormatError(f"{path} is truncated.")
+
+    def slice(self, start_ns: int, end_ns: int) -> pd.DataFrame:
+        timestamps = self.columns["timestamp"]
+        lo = int(np.searchsorted(timestamps, start_ns, side="left"))
+        hi = int(np.searchsorted(timestamps, end_ns, side="right"))
+        if lo >= hi:
+            return empty_ohlcv_frame()
+        index = pd.DatetimeIndex(np.array(timestamps[lo:hi]).view("datetime64[ns]"), name="timestamp")
+        return pd.DataFrame(
+            {col: np.array(self.columns[col][lo:hi]) for col in OHLCV_COLUMNS},
+            index=index.tz_localize("UTC"),
+        )
+
+
+class SnapshotOHLCVStore:
+    """
+    OHLCV store over a directory of snapshot files.
+
+    Example:
+        store = SnapshotOHLCVStore("/srv/trady2/snapshots")
+        store.write(asset, "H1", ORMOHLCVStore().load(asset, "H1", start, end))
+        df = store.load(asset, "H1", start_utc, end_utc)  # served from the mapping
+    """
+
+    #: Snapshots are exported on demand, never fed by ingestion.
+    mirrors_database = False
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._mapped: Dict[Tuple[str, str], _MappedSeries] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / f"{timeframe}.bars"
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        return self.load_symbol(asset.symbol, timeframe, start_utc, end_utc)
+
+    def load_symbol(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_utc: Optional[datetime.datetime] = None,
+        end_utc: Optional[datetime.datetime] = None,
+    ) -> pd.DataFrame:
+        series = self._series(symbol, timeframe)
+        if series is None:
+            return empty_ohlcv_frame()
+        start_ns = pd.Timestamp(ensure_utc(start_utc)).value if start_utc is not None else np.iinfo(np.int64).min
+        end_ns = pd.Timestamp(ensure_utc(end_utc)).value if end_utc is not None else np.iinfo(np.int64).max
+        return series.slice(start_ns, end_ns)
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        """Replace the snapshot of the series with `df` (a full export, not an append)."""
+        rows = write_snapshot(self.path_for(asset.symbol, timeframe), asset.symbol, timeframe, df)
+        logger.info("Wrote OHLCV snapshot", symbol=asset.symbol, timeframe=timeframe, rows=rows)
+        return rows
+
+    def _series(self, symbol: str, timeframe: str) -> Optional[_MappedSeries]:
+        path = self.path_for(symbol, timeframe)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = (symbol, timeframe)
+        with self._lock:
+            series = self._mapped.get(key)
+            if series is None or series.signature != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                series = self._mapped[key] = _MappedSeries(path)
+            return series
@@ -0,0 +1,171 @@
+# apps/market_data/storage/tiered_store.py
+"""
+Hot/cold tiering for the OHLCV table.
+
+Bars older than `HOT_RETENTION_DAYS` are compacted out of the relational
+`OHLCV` table (hot tier) into month-partitioned, zstd-compressed Parquet files
+under `ARCHIVE_DIR` (cold tier), so the hot table and its indexes only hold the
+recent window production reads actually touch.
+
+`TieredOHLCVStore` reads both tiers and stitches them together, so callers do
+not need to know where the boundary is. The cold tier is only consulted for
+months that have an archive file (a directory listing, no I/O on the files
+otherwise), and a bar present in both tiers, e.g. re-ingested after it was
+archived, is served from the hot tier.
+
+The coverage index describes both tiers: compaction moves bars, it does not
+make them missing.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import pandas as pd
+import structlog
+from django.db import transaction
+from django.utils import timezone
+
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.storage.base import OHLCV_COLUMNS, ensure_utc
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+
+logger = structlog.get_logger(__name__)
+
+_EPSILON = datetime.timedelta(microseconds=1)
+# Timestamps per DELETE ... WHERE timestamp IN (...), below SQLite's bound-parameter limit.
+_DELETE_BATCH = 500
+
+
+class TieredOHLCVStore:
+    """
+    Reads the hot OHLCV table and the Parquet archive as one series.
+
+    Example:
+        store = TieredOHLCVStore(ORMOHLCVStore(fast_path=True), ParquetOHLCVStore(archive_dir))
+        df = store.load(asset, "H1", start_utc, end_utc)
+    """
+
+    mirrors_database = False
+
+    def __init__(self, hot: ORMOHLCVStore, archive: ParquetOHLCVStore) -> None:
+        self.hot = hot
+        self.archive = archive
+
+    def load(
+        self,
+        asset: Asset,
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        hot = self.hot.load(asset, timeframe, start_utc, end_utc)
+        cold = self.archive.load(asset, timeframe, start_utc, end_utc)
+        if cold.empty:
+            return hot
+        if hot.empty:
+            return cold
+        df = pd.concat([cold, hot])
+        return df[~df.index.duplicated(keep="last")].sort_index()[OHLCV_COLUMNS]
+
+    def load_many(
+        self,
+        assets: Sequence[Asset],
+        timeframe: str,
+        start_utc: datetime.datetime,
+        end_utc: datetime.datetime,
+    ) -> pd.DataFrame:
+        """Multi-asset load across both tiers (see `ORMOHLCVStore.load_many`)."""
+        hot = self.hot.load_many(assets, timeframe, start_utc, end_utc)
+        cold = self.archive.load_many(assets, timeframe, start_utc, end_utc)
+        if cold.empty:
+            return hot
+        if hot.empty:
+            return cold
+        df = pd.concat([cold, hot])
+        keys = pd.MultiIndex.from_arrays([df.index, df["symbol"]])
+        df = df[~keys.duplicated(keep="last")]
+        return df.reset_index().sort_values(["timestamp", "symbol"], kind="stable").set_index("timestamp")
+
+    def write(self, asset: Asset, timeframe: str, df: pd.DataFrame) -> int:
+        return 0
+
+
+@dataclass
+class CompactionResult:
+    symbol: str
+    timeframe: str
+    archived: int = 0
+    deleted: int = 0
+    months: int = 0
+
+
+def hot_cutoff(retention_days: int, now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Bars opened before this instant belong in the archive."""
+    return (now or timezone.now()) - datetime.timedelta(days=retention_days)
+
+
+def compact_series(
+    asset: Asset,
+    timeframe: str,
+    archive: ParquetOHLCVStore,
+    cutoff: datetime.datetime,
+    dry_run: bool = False,
+) -> CompactionResult:
+    """
+    Move the bars of one series opened before `cutoff` into the archive, one
+    calendar month at a time.
+
+    Each month is written to its Parquet partition first and read back; the hot
+    rows are deleted only when the archive holds at least as many bars for that
+    range, so an interrupted run never loses data and simply resumes.
+    """
+    cutoff = ensure_utc(cutoff)
+    result = CompactionResult(asset.symbol, timeframe)
+    rows = OHLCV.objects.filter(asset=asset, timeframe=timeframe, timestamp__lt=cutoff)
+    first = rows.order_by("timestamp").values_list("timestamp", flat=True).first()
+    if first is None:
+        return result
+
+    source = ORMOHLCVStore(fast_path=True)
+    month_start = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month_start < cutoff:
+        next_month = (month_start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        month_end = min(next_month, cutoff) - _EPSILON
+        df = source.load(asset, timeframe, month_start, month_end)
+        month_start = next_month
+        if df.empty:
+            continue
+
+        result.months += 1
+        result.archived += len(df)
+        if dry_run:
+            continue
+
+        archive.write(asset, timeframe, df)
+        stored = len(archive.load(asset, timeframe, df.index[0], df.index[-1]))
+        if stored < len(df):
+            raise RuntimeError(
+                f"Archive holds {stored} of {len(df)} bars for {asset.symbol} {timeframe} "
+                f"{df.index[0]:%Y-%m}; hot rows kept."
+            )
+        # Only the bars that were archived: one upserted into this month since the
+        # load is not in `df` and stays hot until the next run.
+        archived = [ts.to_pydatetime() for ts in df.index]
+        with transaction.atomic():
+            for i in range(0, len(archived), _DELETE_BATCH):
+                deleted, _ = rows.filter(timestamp__in=archived[i : i + _DELETE_BATCH]).delete()
+                result.deleted += deleted
+
+    logger.info(
+        "OHLCV series compacted",
+        symbol=asset.symbol,
+        timeframe=timeframe,
+        archived=result.archived,
+        deleted=result.deleted,
+        dry_run=dry_run,
+    )
+    return result
@@ -0,0 +1,87 @@
+# apps/market_data/streaming.py
+"""
+Streaming readers for large OHLCV seed files.
+
+Seed files use the `data/sample_data.json` layout:
+    {"symbol": "EURUSD", "timeframe": "H1", "ohlcv": [{"time": ..., "open": ...}, ...]}
+
+Instead of `json.load`-ing the whole document, rows are yielded one at a time by
+the incremental `ijson` parser, so memory use is bounded by the batch the caller
+keeps, not by the file size. Inputs may be gzip (`.gz`) or zstd (`.zst`)
+compressed; the codec is detected from the file's magic bytes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import ijson
+
+try:
+    import zstandard  # type: ignore
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def open_seed_file(path: Union[str, Path]) -> IO[bytes]:
+    """Open `path` for binary streaming, transparently decompressing gzip/zstd."""
+    raw = open(path, "rb")
+    magic = raw.read(4)
+    raw.seek(0)
+
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=raw)
+    if magic == _ZSTD_MAGIC:
+        if not _ZSTD_AVAILABLE:
+            raw.close()
+            raise RuntimeError("Reading .zst seed files requires the 'zstandard' package.")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_size=READ_BUFFER_SIZE, closefd=True)
+        return io.BufferedReader(reader, buffer_size=READ_BUFFER_SIZE)
+    return io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+
+
+def read_seed_header(path: Union[str, Path]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the top-level (symbol, timeframe) without materialising `ohlcv`.
+
+    Stops as soon as both are found, which is immediately for files that put
+    them first; otherwise the file is scanned once more, still in constant memory.
+    """
+    header: Dict[str, Optional[str]] = {"symbol": None, "timeframe": None}
+    with open_seed_file(path) as fh:
+        for prefix, event, value in ijson.parse(fh):
+            if prefix in header and event == "string":
+                header[prefix] = value
+                if all(header.values()):
+                    break
+    return header["symbol"], header["timeframe"]
+
+
+def iter_seed_rows(path: Union[str, Path], skip: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of the top-level `ohlcv` array one by one, skipping the first `skip`."""
+    with open_seed_file(path) as fh:
+        for position, row in enumerate(ijson.items(fh, "ohlcv.item", use_float=True)):
+            if position >= skip:
+                yield row
+
+
+def iter_seed_batches(
+    path: Union[str, Path], batch_size: int, skip: int = 0
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group `iter_seed_rows` into lists of at most `batch_size` rows."""
+    batch: List[Dict[str, Any]] = []
+    for row in iter_seed_rows(path, skip=skip):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,6 +1,6 @@
 # apps/market_data/tasks.py
 import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import structlog
 from celery import shared_task
@@ -71,4 +71,46 @@ def trigger_decision_manager(prev_result: Dict) -> Dict:
     # --- الإصلاح المطبق ---
     # إعادة القاموس أمر حيوي للسماح باستمرار السلسلة إذا أضيفت مهام أخرى في المستقبل.
     # هذه هي أفضل ممارسة للمهام في سلسلة Celery.
-    return prev_result
\ No newline at end of file
+    return prev_result
+
+@shared_task(bind=True, default_retry_delay=60, max_retries=3)
+def backfill_chunk_task(
+    self, symbol: str, timeframe_str: str, start_iso: str, end_iso: str, chunk_days: int = 30,
+    holes_only: bool = False,
+) -> Dict:
+    """
+    يجلب ويخزن جزءاً واحداً من عملية backfill تاريخية (يُستخدم ضمن Celery chord).
+    """
+    from apps.market_data.backfill import BackfillOrchestrator, ChunkSpec
+
+    spec = ChunkSpec(
+        symbol,
+        Timeframe(timeframe_str),
+        datetime.datetime.fromisoformat(start_iso),
+        datetime.datetime.fromisoformat(end_iso),
+    )
+    rows, error = BackfillOrchestrator(workers=1, chunk_days=chunk_days, holes_only=holes_only).execute_chunk(
+        spec, timezone.now(), close_connection=False
+    )
+    if error:
+        raise self.retry(exc=RuntimeError(error))
+    return {"symbol": symbol, "timeframe": timeframe_str, "start_utc": start_iso, "rows": rows}
+
+
+@shared_task
+def backfill_watermarks_task(
+    chunk_results: List[Dict], symbols: List[str], timeframe_str: str, start_iso: str, end_iso: str
+) -> Dict:
+    """
+    يحدّث علامات الاستيعاب بعد نجاح جميع أجزاء الـ backfill (callback للـ chord).
+    """
+    from apps.market_data.backfill import advance_backfill_watermarks
+
+    advance_backfill_watermarks(
+        symbols,
+        Timeframe(timeframe_str),
+        datetime.datetime.fromisoformat(start_iso),
+        datetime.datetime.fromisoformat(end_iso),
+    )
+    rows = sum(result["rows"] for result in chunk_results)
+    return {"timeframe": timeframe_str, "chunks": len(chunk_results), "rows": rows}
@@ -0,0 +1,135 @@
+# apps/market_data/tests/test_backfill.py
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.common.enums import Timeframe
+from apps.market_data.backfill import BackfillOrchestrator, plan_chunks
+from apps.market_data.models import Asset, BackfillCheckpoint, IngestionWatermark, OHLCV
+from apps.market_data.services import persist_ohlcv_frame
+from apps.market_data.storage.bulk_writer import write_ohlcv_bars
+from apps.market_data.tasks import backfill_chunk_task, backfill_watermarks_task
+
+UTC = datetime.timezone.utc
+
+
+class FakeBroker:
+    def __init__(self, fail_on=None) -> None:
+        index = pd.date_range("2024-01-01", "2024-03-31 23:00", freq="h", tz="UTC")
+        close = 1.1 + np.arange(len(index)) * 1e-5
+        self.df = pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": 10}, index=index
+        )
+        self.fail_on = fail_on
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, start_utc, end_utc):
+        self.calls.append((symbol, start_utc))
+        if self.fail_on and start_utc <= self.fail_on <= end_utc:
+            raise ConnectionError("terminal busy")
+        return self.df.loc[start_utc:end_utc].copy()
+
+
+def test_plan_chunks_is_grid_aligned():
+    start = datetime.datetime(2024, 1, 15, 6, tzinfo=UTC)
+    end = datetime.datetime(2024, 3, 1, tzinfo=UTC)
+    chunks = plan_chunks(["EURUSD", "GBPUSD"], Timeframe.H1, start, end, chunk_days=10)
+
+    assert len(chunks) == 2 * 6
+    assert chunks[0].start <= start < chunks[0].end
+    assert all((c.end - datetime.datetime(1970, 1, 1, tzinfo=UTC)).days % 10 == 0 for c in chunks)
+    assert chunks[1].start == chunks[0].end
+
+
+@pytest.mark.django_db
+class TestBackfillOrchestrator:
+    start = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+    end = datetime.datetime(2024, 4, 1, tzinfo=UTC)
+
+    def test_backfill_checkpoints_and_resumes(self):
+        failing = FakeBroker(fail_on=datetime.datetime(2024, 2, 10, tzinfo=UTC))
+        with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=failing.fetch_ohlcv):
+            report = BackfillOrchestrator(workers=1, chunk_days=15).run(
+                ["EURUSD"], Timeframe.H1, self.start, self.end
+            )
+
+        assert report.chunks_failed == 1
+        assert report.rows == len(failing.df) - 24 * 15
+        assert report.rows_per_second > 0
+        assert BackfillCheckpoint.objects.filter(status="FAILED").count() == 1
+        assert not IngestionWatermark.objects.exists()
+
+        healthy = FakeBroker()
+        with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=healthy.fetch_ohlcv):
+            report = BackfillOrchestrator(workers=1, chunk_days=15).run(
+                ["EURUSD"], Timeframe.H1, self.start, self.end
+            )
+
+        assert len(healthy.calls) == 1
+        assert report.chunks_skipped == report.chunks_total - 1
+        assert OHLCV.objects.filter(timeframe="H1").count() == len(healthy.df)
+        watermark = IngestionWatermark.objects.get(timeframe="H1")
+        assert watermark.last_timestamp == healthy.df.index[-1]
+
+    def test_backfill_of_older_history_keeps_the_watermark_to_its_range(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        covered_from = datetime.datetime(2024, 3, 1, tzinfo=UTC)
+        broker_end = datetime.datetime(2024, 3, 31, 23, tzinfo=UTC)
+        IngestionWatermark.objects.create(
+            asset=asset, timeframe="H1", covered_from=covered_from, last_timestamp=broker_end
+        )
+        broker = FakeBroker()
+        write_ohlcv_bars(asset, "H1", broker.df.loc[covered_from:])
+        with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=broker.fetch_ohlcv):
+            # Leaves February uncovered: the watermark must not stretch across it.
+            BackfillOrchestrator(workers=1, chunk_days=15).run(
+                ["EURUSD"], Timeframe.H1, self.start, datetime.datetime(2024, 1, 20, tzinfo=UTC)
+            )
+            watermark = IngestionWatermark.objects.get(asset=asset)
+            assert watermark.covered_from == covered_from and watermark.last_timestamp == broker_end
+
+            # Reaching the covered range extends it backwards; the frontier stays.
+            BackfillOrchestrator(workers=1, chunk_days=15).run(["EURUSD"], Timeframe.H1, self.start, covered_from)
+            watermark.refresh_from_db()
+            assert watermark.covered_from == self.start and watermark.last_timestamp == broker_end
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_runs_on_worker_pool():
+    broker = FakeBroker()
+    start = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+    with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=broker.fetch_ohlcv):
+        report = BackfillOrchestrator(workers=3, chunk_days=20).run(
+            ["EURUSD", "GBPUSD"], Timeframe.H1, start, start + datetime.timedelta(days=60)
+        )
+
+    chunks = plan_chunks(["GBPUSD"], Timeframe.H1, start, start + datetime.timedelta(days=60), chunk_days=20)
+    covered = broker.df.loc[chunks[0].start : chunks[-1].end - datetime.timedelta(hours=1)]
+    assert report.chunks_failed == 0, report.failures
+    assert OHLCV.objects.filter(asset__symbol="GBPUSD").count() == len(covered)
+    assert BackfillCheckpoint.objects.filter(status="DONE").count() == report.chunks_total
+
+
+@pytest.mark.django_db
+def test_celery_chunks_fetch_only_holes_and_the_callback_advances_watermarks():
+    broker = FakeBroker()
+    asset = Asset.objects.create(symbol="EURUSD")
+    spec = plan_chunks(["EURUSD"], Timeframe.H1, broker.df.index[0], broker.df.index[24 * 10], chunk_days=10)[0]
+    stored = broker.df.loc[spec.start : spec.end - datetime.timedelta(hours=1)]
+    persist_ohlcv_frame(asset, Timeframe.H1, stored.drop(stored.index[50:60]))  # records coverage
+
+    with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=broker.fetch_ohlcv):
+        result = backfill_chunk_task.apply(
+            args=("EURUSD", "H1", spec.start.isoformat(), spec.end.isoformat(), 10, True)
+        ).get()
+
+    assert result["rows"] == 10
+    assert stored.index[50] in [start for _, start in broker.calls]
+    assert not IngestionWatermark.objects.exists()
+
+    backfill_watermarks_task.apply(args=([result], ["EURUSD"], "H1", spec.start.isoformat(), spec.end.isoformat()))
+    watermark = IngestionWatermark.objects.get(asset=asset)
+    assert watermark.covered_from == spec.start and watermark.last_timestamp == stored.index[-1]
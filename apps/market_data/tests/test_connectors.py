@@ -0,0 +1,103 @@
+# apps/market_data/tests/test_connectors.py
+import datetime
+import json
+
+import pandas as pd
+import pytest
+from django.core.management import call_command
+
+from apps.common.enums import Timeframe
+from apps.market_data.connectors.base import get_connector
+from apps.market_data.connectors.replay_connector import ReplayConnector
+from apps.market_data.connectors.synthetic_connector import SyntheticConnector
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.services import ingest_ohlcv_data
+
+UTC = datetime.timezone.utc
+
+
+class TestReplayConnector:
+    def test_serves_sample_json_layout(self, tmp_path):
+        bars = [
+            {
+                "time": f"2025-10-20T0{h}:00:00Z",
+                "open": "1.1",
+                "high": "1.2",
+                "low": "1.0",
+                "close": "1.15",
+                "volume": h,
+            }
+            for h in range(5)
+        ]
+        path = tmp_path / "sample_data.json"
+        path.write_text(json.dumps({"symbol": "EURUSD", "timeframe": "H1", "ohlcv": bars}))
+        connector = ReplayConnector(tmp_path)
+
+        start = datetime.datetime(2025, 10, 20, 1, tzinfo=UTC)
+        df = connector.fetch_ohlcv("EURUSD", Timeframe.H1, start, start + datetime.timedelta(hours=2))
+        assert list(df["volume"]) == [1, 2, 3]
+        assert df["close"].dtype == float
+        assert connector.fetch_ohlcv("GBPUSD", Timeframe.H1, df.index[0], df.index[-1]).empty
+
+    def test_serves_named_csv(self, tmp_path):
+        index = pd.date_range("2024-01-01", periods=10, freq="h", tz="UTC")
+        pd.DataFrame(
+            {"timestamp": index, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1}
+        ).to_csv(tmp_path / "XAUUSD_H1.csv", index=False)
+
+        df = ReplayConnector(tmp_path).fetch_ohlcv("XAUUSD", Timeframe.H1, index[2], index[-1])
+        assert len(df) == 8
+
+
+    def test_falls_back_to_the_json_file_declaring_the_series(self, tmp_path):
+        bar = {"time": "2025-10-20T00:00:00Z", "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+        for symbol in ("AUDUSD", "EURUSD"):
+            (tmp_path / f"{symbol.lower()}.json").write_text(
+                json.dumps({"symbol": symbol, "timeframe": "H1", "ohlcv": [bar]})
+            )
+
+        start = datetime.datetime(2025, 10, 20, tzinfo=UTC)
+        df = ReplayConnector(tmp_path).fetch_ohlcv("EURUSD", Timeframe.H1, start, start)
+        assert len(df) == 1
+
+    def test_configured_connector_is_reused(self, settings, tmp_path):
+        settings.MARKET_DATA_CONFIG = {"CONNECTOR": "replay", "REPLAY_PATH": str(tmp_path)}
+        connector = get_connector()
+        assert isinstance(connector, ReplayConnector) and get_connector() is connector
+
+        settings.MARKET_DATA_CONFIG = {**settings.MARKET_DATA_CONFIG, "CONNECTOR_LATENCY_MS": 5}
+        assert get_connector() is not connector
+
+
+class TestSyntheticConnector:
+    def test_deterministic_and_skips_weekends(self):
+        connector = SyntheticConnector(seed=3)
+        start = datetime.datetime(2024, 1, 1, tzinfo=UTC)  # Monday
+        end = start + datetime.timedelta(days=7, minutes=-1)
+        week = connector.fetch_ohlcv("EURUSD", Timeframe.M1, start, end)
+        assert len(week) == 5 * 1440
+
+        overlap = connector.fetch_ohlcv("EURUSD", Timeframe.M1, week.index[1000], week.index[3000])
+        pd.testing.assert_frame_equal(overlap, week.loc[week.index[1000]:week.index[3000]], check_freq=False)
+        assert (week["high"] >= week[["open", "close"]].max(axis=1)).all()
+        assert (week["low"] <= week[["open", "close"]].min(axis=1)).all()
+        assert not week.equals(
+            SyntheticConnector(seed=3).fetch_ohlcv("GBPUSD", Timeframe.M1, start, end)
+        )
+
+
+@pytest.mark.django_db
+class TestOfflineIngestion:
+    def test_ingest_through_configured_connector(self, settings):
+        settings.MARKET_DATA_CONFIG = {**settings.MARKET_DATA_CONFIG, "CONNECTOR": "synthetic"}
+        assert isinstance(get_connector(), SyntheticConnector)
+
+        start = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+        end = start + datetime.timedelta(hours=47)
+        count = ingest_ohlcv_data("EURUSD", Timeframe.H1, start, end)
+        assert count == 48
+        assert OHLCV.objects.filter(asset__symbol="EURUSD", timeframe="H1").count() == 48
+
+    def test_benchmark_command_cleans_up(self):
+        call_command("benchmark_ingestion", "--timeframe", "H1", "--days", "20", "--symbol", "BENCH")
+        assert not Asset.objects.filter(symbol="BENCH").exists()
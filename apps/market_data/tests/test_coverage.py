@@ -0,0 +1,84 @@
+# apps/market_data/tests/test_coverage.py
+import datetime
+
+import pandas as pd
+import pytest
+
+from apps.common.enums import Timeframe
+from apps.market_data.coverage import TradingCalendar, coverage_report, rebuild_coverage, record_coverage
+from apps.market_data.models import Asset, CoverageInterval, OHLCV
+
+UTC = datetime.timezone.utc
+# 2024-01-01 is a Monday.
+MONDAY = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def hours(start: datetime.datetime, end: datetime.datetime) -> pd.DatetimeIndex:
+    return pd.date_range(start, end, freq="h", tz="UTC", name="timestamp")
+
+
+def test_expected_bars_skips_weekends():
+    calendar = TradingCalendar()
+    two_weeks = MONDAY + datetime.timedelta(days=14) - datetime.timedelta(hours=1)
+
+    assert calendar.expected_bars(Timeframe.H1, MONDAY, two_weeks) == 2 * 5 * 24
+    assert calendar.expected_bars(Timeframe.H1, MONDAY, two_weeks) == len(
+        calendar.expected_index(Timeframe.H1, MONDAY, two_weeks)
+    )
+    saturday = MONDAY + datetime.timedelta(days=5)
+    assert calendar.first_expected(Timeframe.H1, saturday, saturday + datetime.timedelta(hours=47)) is None
+
+
+@pytest.mark.django_db
+class TestCoverageIndex:
+    def test_weekend_does_not_split_but_missing_hours_do(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        friday_close = MONDAY + datetime.timedelta(days=4, hours=23)
+        next_monday = MONDAY + datetime.timedelta(days=7)
+        index = hours(MONDAY, friday_close).append(hours(next_monday, next_monday + datetime.timedelta(hours=23)))
+        # Tuesday 10:00-12:00 never arrived.
+        missing = hours(MONDAY + datetime.timedelta(days=1, hours=10), MONDAY + datetime.timedelta(days=1, hours=12))
+        record_coverage(asset, "H1", index.difference(missing))
+
+        report = coverage_report(asset, "H1", MONDAY, next_monday + datetime.timedelta(hours=23))
+        assert len(report.intervals) == 2
+        assert [(h.start, h.end, h.expected_bars) for h in report.holes] == [
+            (missing[0].to_pydatetime(), missing[-1].to_pydatetime(), 3)
+        ]
+        assert report.covered_bars == len(index) - 3
+
+    def test_writes_merge_and_fill_holes_exactly(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        end = MONDAY + datetime.timedelta(hours=23)
+        record_coverage(asset, "H1", hours(MONDAY, MONDAY + datetime.timedelta(hours=5)))
+        record_coverage(asset, "H1", hours(MONDAY + datetime.timedelta(hours=12), end))
+        # Overlapping rewrite must not double-count bars.
+        record_coverage(asset, "H1", hours(MONDAY + datetime.timedelta(hours=4), MONDAY + datetime.timedelta(hours=8)))
+
+        holes = coverage_report(asset, "H1", MONDAY, end).holes
+        assert [(h.start.hour, h.end.hour) for h in holes] == [(9, 11)]
+
+        record_coverage(asset, "H1", hours(MONDAY + datetime.timedelta(hours=9), MONDAY + datetime.timedelta(hours=11)))
+        interval = CoverageInterval.objects.get(asset=asset, timeframe="H1")
+        assert (interval.start, interval.end, interval.bars) == (MONDAY, end, 24)
+        assert coverage_report(asset, "H1", MONDAY, end).completeness == 1.0
+
+    def test_crypto_expects_weekend_bars(self):
+        asset = Asset.objects.create(symbol="BTCUSD", asset_type="CRYPTO")
+        saturday = MONDAY + datetime.timedelta(days=5)
+
+        holes = coverage_report(asset, "H1", saturday, saturday + datetime.timedelta(hours=23)).holes
+        assert [h.expected_bars for h in holes] == [24]
+
+    def test_rebuild_from_stored_bars(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        index = hours(MONDAY, MONDAY + datetime.timedelta(hours=9)).delete(4)
+        OHLCV.objects.bulk_create(
+            OHLCV(asset=asset, timeframe="H1", timestamp=ts, open=1, high=1, low=1, close=1, volume=1)
+            for ts in index
+        )
+
+        assert rebuild_coverage(asset, "H1") == 2
+        report = coverage_report(asset, "H1", MONDAY, MONDAY + datetime.timedelta(hours=9))
+        assert report.missing_bars == 1
+        assert report.holes[0].start == MONDAY + datetime.timedelta(hours=4)
@@ -0,0 +1,93 @@
+# apps/market_data/tests/test_live.py
+import datetime
+
+import pandas as pd
+import pytest
+
+from apps.common.enums import Timeframe
+from apps.market_data.live import AsyncBarWriter, BarAggregator, BarClosed, FrameCacheFeeder
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.resampling import resample_ohlcv
+from apps.market_data.storage.frame_cache import OHLCVFrameCache
+from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+from apps.market_data.tests.test_resampling import make_minutes
+
+
+def collect(aggregator):
+    events = []
+    aggregator.subscribe(events.append)
+    return events
+
+
+class TestBarAggregator:
+    def test_polled_partial_bars_close_base_and_derived_bars(self):
+        bars = make_minutes("2024-03-04 09:00", 125)
+        aggregator = BarAggregator(Timeframe.M1, [Timeframe.H1])
+        events = collect(aggregator)
+
+        for end in range(1, len(bars) + 1):
+            polled = bars.iloc[max(0, end - 2) : end].copy()
+            # The last bar is still forming: the first poll sees only its open.
+            forming = polled.iloc[-1]
+            polled.iloc[-1] = [forming["open"]] * 4 + [0]
+            aggregator.on_bars("EURUSD", polled)
+            aggregator.on_bars("EURUSD", bars.iloc[max(0, end - 2) : end])
+
+        base = [e for e in events if e.timeframe == Timeframe.M1]
+        hourly = [e for e in events if e.timeframe == Timeframe.H1]
+        assert len(base) == len(bars) - 1
+        assert [e.timestamp for e in hourly] == list(
+            pd.date_range("2024-03-04 09:00", periods=2, freq="h", tz="UTC").to_pydatetime()
+        )
+        expected = resample_ohlcv(bars.iloc[:120], Timeframe.H1, Timeframe.M1)
+        pd.testing.assert_frame_equal(pd.concat([e.bar for e in hourly]), expected, check_freq=False)
+        assert aggregator.forming("EURUSD", Timeframe.H1).index[0].hour == 11
+
+    def test_ticks_flush_and_priming(self):
+        aggregator = BarAggregator(Timeframe.M1, [Timeframe.M5])
+        aggregator.prime("XAUUSD", make_minutes("2024-03-04 10:00", 3))
+        events = collect(aggregator)
+        start = datetime.datetime(2024, 3, 4, 10, 3, tzinfo=datetime.timezone.utc)
+        for second, price in enumerate([2.0, 2.5, 1.5, 2.2]):
+            aggregator.on_tick("XAUUSD", start + datetime.timedelta(seconds=second * 15), price, 1)
+
+        assert [e.timestamp.minute for e in events] == [2]
+        closed = aggregator.flush(start + datetime.timedelta(minutes=2))
+        assert [(e.timeframe, e.timestamp.minute) for e in closed] == [(Timeframe.M1, 3), (Timeframe.M5, 0)]
+        minute = closed[0].bar.iloc[0]
+        assert (minute["open"], minute["high"], minute["low"], minute["close"]) == (2.0, 2.5, 1.5, 2.2)
+        assert closed[1].bar["volume"].iloc[0] > minute["volume"]
+
+        # A late tick for a closed bar is dropped.
+        aggregator.on_tick("XAUUSD", start, 9.0)
+        assert aggregator.forming("XAUUSD", Timeframe.M1) is None
+
+    def test_rejects_non_derivable_targets(self):
+        with pytest.raises(ValueError):
+            BarAggregator(Timeframe.M5, [Timeframe.M1])
+
+
+@pytest.mark.django_db
+class TestLiveHandlers:
+    def test_cached_live_bar_survives_stale_store_copy(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        store = ParquetOHLCVStore(tmp_path)
+        hours = resample_ohlcv(make_minutes("2024-03-04 00:00", 60 * 10), Timeframe.H1, Timeframe.M1)
+        stale = hours.copy()
+        stale.iloc[-1, stale.columns.get_loc("close")] = 9.0  # ingested while forming
+        store.write(asset, "H1", stale)
+        cache = OHLCVFrameCache(store=store)
+
+        feeder = FrameCacheFeeder(cache, {Timeframe.H1: datetime.timedelta(days=1)})
+        feeder(BarClosed("EURUSD", Timeframe.H1, hours.iloc[-1:]))
+        df = cache.get(asset, "H1", hours.index[0], hours.index[-1] + datetime.timedelta(hours=2))
+
+        assert len(df) == len(hours)
+        assert df["close"].iloc[-1] == hours["close"].iloc[-1]
+
+    def test_writer_persists_queued_bars_per_series(self):
+        hours = resample_ohlcv(make_minutes("2024-03-04 00:00", 60 * 3), Timeframe.H1, Timeframe.M1)
+        writer = AsyncBarWriter()
+        writer.write([BarClosed("EURUSD", Timeframe.H1, hours.iloc[i : i + 1]) for i in range(3)])
+
+        assert OHLCV.objects.filter(asset__symbol="EURUSD", timeframe="H1").count() == 3
@@ -0,0 +1,85 @@
+# apps/market_data/tests/test_panel.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.market_data.models import Asset
+from apps.market_data.panel import load_panel
+from apps.market_data.storage.bulk_writer import write_ohlcv_bars
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+
+START = pd.Timestamp("2024-01-31 20:00", tz="UTC")
+END = pd.Timestamp("2024-02-01 06:00", tz="UTC")
+
+
+def make_bars(hours, base: float) -> pd.DataFrame:
+    index = pd.DatetimeIndex([START + pd.Timedelta(hours=h) for h in hours], name="timestamp")
+    close = base + np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": 10},
+        index=index,
+    )
+
+
+@pytest.fixture
+def two_assets():
+    gold = Asset.objects.create(symbol="XAUUSD")
+    silver = Asset.objects.create(symbol="XAGUSD")
+    # Silver misses hours 2-5, so alignment has something to do.
+    bars = {"XAUUSD": make_bars(range(8), 2000.0), "XAGUSD": make_bars([0, 1, 6, 7], 25.0)}
+    write_ohlcv_bars(gold, "H1", bars["XAUUSD"])
+    write_ohlcv_bars(silver, "H1", bars["XAGUSD"])
+    return bars
+
+
+@pytest.mark.django_db
+class TestLoadPanel:
+    def test_inner_alignment_uses_one_query(self, two_assets, django_assert_num_queries):
+        store = ORMOHLCVStore()
+        # One query for the assets, one for every bar of both symbols.
+        with django_assert_num_queries(2):
+            panel = load_panel(["XAUUSD", "XAGUSD"], "H1", START, END, align="inner", store=store)
+
+        assert list(panel.columns.names) == ["field", "symbol"]
+        assert list(panel["close"].columns) == ["XAUUSD", "XAGUSD"]
+        assert len(panel) == 4
+        np.testing.assert_allclose(panel["close"]["XAGUSD"], two_assets["XAGUSD"]["close"])
+        np.testing.assert_allclose(panel["close"]["XAUUSD"], [2000.0, 2001.0, 2006.0, 2007.0])
+
+    def test_ffill_respects_staleness_limit(self, two_assets):
+        panel = load_panel(
+            ["XAUUSD", "XAGUSD"], "H1", START, END, align="ffill", max_staleness_bars=2, store=ORMOHLCVStore()
+        )
+        silver = panel.xs("XAGUSD", axis=1, level="symbol")
+
+        assert len(panel) == 8
+        # Hours 2-3 repeat the 01:00 close as flat zero-volume bars, hours 4-5 are too stale.
+        assert silver["close"].iloc[2:4].tolist() == [26.0, 26.0]
+        assert silver["open"].iloc[2:4].tolist() == [26.0, 26.0]
+        assert silver["volume"].iloc[2:4].tolist() == [0.0, 0.0]
+        assert silver["close"].iloc[4:6].isna().all()
+        assert silver["close"].iloc[6] == 27.0
+
+    def test_outer_alignment_and_unknown_symbol(self, two_assets):
+        panel = load_panel(
+            ["XAGUSD", "NOPE"], "H1", START, END, fields=["close"], align="outer", store=ORMOHLCVStore()
+        )
+
+        assert list(panel.columns.get_level_values("symbol")) == ["XAGUSD", "NOPE"]
+        assert panel["close"]["XAGUSD"].notna().sum() == 4
+        assert panel["close"]["NOPE"].isna().all()
+
+    def test_parquet_scan_matches_orm(self, two_assets, tmp_path):
+        parquet = ParquetOHLCVStore(tmp_path)
+        for symbol, bars in two_assets.items():
+            parquet.write_symbol(symbol, "H1", bars)
+
+        from_orm = load_panel(["XAUUSD", "XAGUSD"], "H1", START, END, align="ffill", store=ORMOHLCVStore())
+        from_parquet = load_panel(["XAUUSD", "XAGUSD"], "H1", START, END, align="ffill", store=parquet)
+
+        pd.testing.assert_frame_equal(from_parquet, from_orm)
+
+    def test_rejects_unknown_alignment(self):
+        with pytest.raises(ValueError):
+            load_panel(["XAUUSD"], "H1", START, END, align="left")
@@ -0,0 +1,111 @@
+# apps/market_data/tests/test_resampling.py
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import Asset, OHLCV
+from apps.market_data.resampling import SessionCalendar, bucket_floor, resample_ohlcv
+from apps.market_data.services import ingest_ohlcv_data
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+from apps.market_data.storage.resampled_store import ResamplingOHLCVStore
+
+
+def make_minutes(start: str, periods: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    index = pd.date_range(start, periods=periods, freq="min", tz="UTC", name="timestamp")
+    close = np.round(1.1 + np.cumsum(rng.normal(0, 1e-4, periods)), 5)
+    spread = np.round(rng.uniform(0, 5e-4, periods), 5)
+    return pd.DataFrame(
+        {
+            "open": close - spread / 2,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1, 100, periods),
+        },
+        index=index,
+    )
+
+
+class TestResampleOHLCV:
+    def test_matches_pandas_aggregation(self):
+        bars = make_minutes("2024-03-04 22:30", 60 * 30)
+        # Leave a hole so empty buckets are exercised.
+        bars = bars.drop(bars.index[200:400])
+
+        h4 = resample_ohlcv(bars, Timeframe.H4, Timeframe.M1)
+        expected = (
+            bars.resample("4h", label="left", closed="left")
+            .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+            .dropna()
+        )
+        expected["volume"] = expected["volume"].astype(np.int64)
+        pd.testing.assert_frame_equal(h4, expected, check_freq=False, check_names=False)
+
+    def test_session_alignment_follows_new_york_close(self):
+        session = SessionCalendar("America/New_York", datetime.time(17, 0))
+        # 2024-03-08 is before the US DST switch, 2024-03-11 after it.
+        winter = bucket_floor(datetime.datetime(2024, 3, 8, 23, 0, tzinfo=datetime.timezone.utc), Timeframe.D1, session)
+        summer = bucket_floor(datetime.datetime(2024, 3, 12, 20, 0, tzinfo=datetime.timezone.utc), Timeframe.D1, session)
+
+        assert winter == datetime.datetime(2024, 3, 8, 22, 0, tzinfo=datetime.timezone.utc)
+        assert summer == datetime.datetime(2024, 3, 11, 21, 0, tzinfo=datetime.timezone.utc)
+
+    def test_complete_only_drops_forming_bucket(self):
+        bars = make_minutes("2024-03-04 00:00", 150)
+        assert len(resample_ohlcv(bars, Timeframe.H1, Timeframe.M1)) == 3
+        assert len(resample_ohlcv(bars, Timeframe.H1, Timeframe.M1, complete_only=True)) == 2
+
+        with pytest.raises(ValueError):
+            resample_ohlcv(bars, Timeframe.M5, Timeframe.H1)
+
+
+@pytest.mark.django_db
+class TestDerivedTimeframes:
+    def test_ingest_materialises_derived_timeframes(self, settings):
+        settings.MARKET_DATA_CONFIG = {
+            **settings.MARKET_DATA_CONFIG,
+            "BASE_TIMEFRAME": "M1",
+            "DERIVED_TIMEFRAMES": ["M15", "H1"],
+        }
+        bars = make_minutes("2024-03-04 00:00", 180)
+        start, end = bars.index[0].to_pydatetime(), bars.index[-1].to_pydatetime()
+
+        with patch(
+            "apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv",
+            side_effect=lambda symbol, tf, s, e: bars.loc[s:e].copy(),
+        ):
+            ingest_ohlcv_data("EURUSD", Timeframe.M1, start, end)
+
+        asset = Asset.objects.get(symbol="EURUSD")
+        assert OHLCV.objects.filter(asset=asset, timeframe="M15").count() == 12
+        h1 = ORMOHLCVStore(fast_path=True).load(asset, "H1", start, end)
+        expected = resample_ohlcv(bars, Timeframe.H1, Timeframe.M1)
+        pd.testing.assert_frame_equal(h1, expected, check_freq=False, check_index_type=False, atol=1e-8)
+
+    def test_resample_on_read_fallback(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_minutes("2024-03-04 00:00", 120)
+        OHLCV.objects.bulk_create(
+            OHLCV(
+                asset=asset,
+                timeframe="M1",
+                timestamp=ts.to_pydatetime(),
+                open=row.open,
+                high=row.high,
+                low=row.low,
+                close=row.close,
+                volume=int(row.volume),
+            )
+            for ts, row in bars.iterrows()
+        )
+        store = ResamplingOHLCVStore(ORMOHLCVStore(fast_path=True), Timeframe.M1)
+
+        m5 = store.load(asset, "M5", bars.index[7], bars.index[-1])
+        assert m5.index[0] == bars.index[10]
+        assert len(m5) == 22
+        assert m5["volume"].iloc[0] == bars["volume"].iloc[10:15].sum()
@@ -0,0 +1,75 @@
+# apps/market_data/tests/test_services.py
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.common.enums import Timeframe
+from apps.market_data.models import IngestionWatermark, OHLCV
+from apps.market_data.services import ingest_ohlcv_data
+
+UTC = datetime.timezone.utc
+
+
+class FakeBroker:
+    """Serves a fixed hourly series and records every requested window."""
+
+    def __init__(self, start: str, periods: int) -> None:
+        index = pd.date_range(start, periods=periods, freq="h", tz="UTC")
+        close = 1.1 + np.arange(periods) * 1e-4
+        self.df = pd.DataFrame(
+            {"open": close, "high": close + 5e-4, "low": close - 5e-4, "close": close, "volume": 100},
+            index=index,
+        )
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, start_utc, end_utc):
+        self.calls.append((start_utc, end_utc))
+        return self.df.loc[start_utc:end_utc].copy()
+
+
+@pytest.fixture
+def broker():
+    fake = FakeBroker("2024-01-01", periods=48)
+    with patch("apps.market_data.connectors.mt5_connector.MT5Connector.fetch_ohlcv", side_effect=fake.fetch_ohlcv):
+        yield fake
+
+
+@pytest.mark.django_db
+class TestIncrementalIngestion:
+    start = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+
+    def test_second_cycle_only_fetches_past_the_watermark(self, broker, settings):
+        settings.MARKET_DATA_CONFIG = {**settings.MARKET_DATA_CONFIG, "INGEST_OVERLAP_BARS": 2}
+        first_end = self.start + datetime.timedelta(hours=23)
+        ingest_ohlcv_data("EURUSD", Timeframe.H1, self.start, first_end)
+
+        watermark = IngestionWatermark.objects.get(asset__symbol="EURUSD", timeframe="H1")
+        assert watermark.last_timestamp == first_end
+
+        second_end = self.start + datetime.timedelta(hours=47)
+        ingest_ohlcv_data("EURUSD", Timeframe.H1, self.start, second_end)
+
+        assert broker.calls[1][0] == first_end - datetime.timedelta(hours=2)
+        assert OHLCV.objects.filter(asset__symbol="EURUSD", timeframe="H1").count() == 48
+        watermark.refresh_from_db()
+        assert watermark.last_timestamp == second_end
+        assert watermark.covered_from == self.start
+
+    def test_backward_extension_and_full_refetch(self, broker):
+        later = self.start + datetime.timedelta(hours=24)
+        end = self.start + datetime.timedelta(hours=47)
+        ingest_ohlcv_data("EURUSD", Timeframe.H1, later, end)
+
+        # A window starting before the covered range is fetched in full.
+        ingest_ohlcv_data("EURUSD", Timeframe.H1, self.start, end)
+        assert broker.calls[1][0] == self.start
+        watermark = IngestionWatermark.objects.get(asset__symbol="EURUSD", timeframe="H1")
+        assert watermark.covered_from == self.start
+
+        # incremental=False bypasses the watermark entirely.
+        ingest_ohlcv_data("EURUSD", Timeframe.H1, self.start, end, incremental=False)
+        assert broker.calls[2][0] == self.start
+        assert OHLCV.objects.filter(asset__symbol="EURUSD", timeframe="H1").count() == 48
@@ -0,0 +1,78 @@
+# apps/market_data/tests/test_sqlite_mode.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from apps.common.enums import Timeframe
+from apps.common.sqlite import configure_connection, single_writer
+from apps.market_data import services
+from apps.market_data.models import Asset, OHLCV
+
+pytestmark = pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite concurrency mode")
+
+
+def make_bars(periods: int) -> pd.DataFrame:
+    index = pd.date_range("2024-03-04", periods=periods, freq="h", tz="UTC", name="timestamp")
+    close = np.linspace(1.1, 1.2, periods)
+    return pd.DataFrame(
+        {"open": close, "high": close + 0.001, "low": close - 0.001, "close": close, "volume": 1},
+        index=index,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_performance_mode_applies_pragmas():
+    with override_settings(SQLITE_PERFORMANCE_MODE=True, SQLITE_PRAGMAS={"synchronous": "NORMAL"}):
+        configure_connection(None, connection)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+
+
+def test_single_writer_is_reentrant():
+    with single_writer():
+        with single_writer():
+            pass
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_chains_write_through_one_writer(monkeypatch):
+    chains = 6
+    bars = make_bars(200)
+    assets = [Asset.objects.create(symbol=f"STRESS{i}") for i in range(chains)]
+
+    active = []
+    overlaps = []
+    guard = threading.Lock()
+    write = services.write_ohlcv_bars
+
+    def tracked_write(*args, **kwargs):
+        with guard:
+            active.append(1)
+            overlaps.append(len(active))
+        try:
+            return write(*args, **kwargs)
+        finally:
+            with guard:
+                active.pop()
+
+    monkeypatch.setattr(services, "write_ohlcv_bars", tracked_write)
+
+    def run_chain(asset):
+        try:
+            for offset in range(0, len(bars), 50):
+                services.persist_ohlcv_frame(asset, Timeframe.H1, bars.iloc[offset : offset + 50])
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=chains) as pool:
+        for future in [pool.submit(run_chain, asset) for asset in assets]:
+            future.result()
+
+    assert max(overlaps) == 1
+    assert OHLCV.objects.count() == chains * len(bars)
@@ -0,0 +1,532 @@
+import datetime
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+
+from apps.analytics.services import ChartDataService, OHLCVLoader
+from apps.common.enums import Timeframe
+from apps.common.pg_copy import copy_enabled, copy_rows
+from apps.market_data.models import Asset, OHLCV, ScaledOHLCV
+from apps.market_data.services import persist_ohlcv_frame
+from apps.market_data.storage.backends import get_ohlcv_store
+from apps.market_data.storage.bulk_writer import write_ohlcv_bars
+from apps.market_data.storage.fixed_point_store import FixedPointOHLCVStore
+from apps.market_data.storage.frame_cache import OHLCVFrameCache
+from apps.market_data.storage.orm_store import ORMOHLCVStore
+from apps.market_data.storage.parquet_store import ParquetOHLCVStore
+from apps.market_data.storage.redis_cache import (
+    RedisSegmentCache,
+    SharedCacheOHLCVStore,
+    decode_segment,
+    encode_segment,
+)
+from apps.market_data.storage.snapshot_store import SnapshotFormatError, SnapshotOHLCVStore
+from apps.market_data.storage.tiered_store import TieredOHLCVStore, compact_series
+
+
+def make_bars(start: str, periods: int, freq: str = "h") -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq=freq, tz="UTC", name="timestamp")
+    close = np.linspace(1.10, 1.20, periods)
+    return pd.DataFrame(
+        {
+            "open": close - 0.001,
+            "high": close + 0.002,
+            "low": close - 0.002,
+            "close": close,
+            "volume": np.arange(periods, dtype=np.int64),
+        },
+        index=index,
+    )
+
+
+@pytest.mark.django_db
+class TestParquetOHLCVStore:
+    def test_write_partitions_by_month_and_reads_range(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        store = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-01-30", 24 * 4)
+
+        assert store.write(asset, "H1", bars) == len(bars)
+        files = sorted(p.name for p in store.series_dir("EURUSD", "H1").glob("*.parquet"))
+        assert files == ["2024-01.parquet", "2024-02.parquet"]
+        assert not list(store.series_dir("EURUSD", "H1").glob("*.tmp"))
+
+        start = datetime.datetime(2024, 1, 31, 12, tzinfo=datetime.timezone.utc)
+        end = datetime.datetime(2024, 2, 1, 5, tzinfo=datetime.timezone.utc)
+        df = store.load(asset, "H1", start, end)
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert df.index[0] == start and df.index[-1] == end
+        assert len(df) == 18
+        assert df["close"].dtype == np.float64
+        assert df["volume"].dtype == np.int64
+        pd.testing.assert_frame_equal(df, bars.loc[start:end], check_freq=False)
+
+    def test_rewrite_replaces_existing_bars(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        store = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-03-01", 10)
+        store.write(asset, "H1", bars)
+
+        updated = bars.iloc[[-1]].copy()
+        updated["close"] = 9.9
+        store.write(asset, "H1", updated)
+
+        df = store.load(asset, "H1", bars.index[0], bars.index[-1])
+        assert len(df) == 10
+        assert df["close"].iloc[-1] == 9.9
+
+    def test_concurrent_writers_of_one_partition_keep_every_row(self, tmp_path):
+        store = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-01-01", 24 * 8)
+        days = [bars.iloc[day * 24 : (day + 1) * 24] for day in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda day: store.write_symbol("EURUSD", "H1", day), days))
+
+        df = store.load(Asset(symbol="EURUSD"), "H1", bars.index[0], bars.index[-1])
+        pd.testing.assert_frame_equal(df, bars, check_freq=False)
+
+    def test_loader_reads_from_configured_backend(self, tmp_path):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        bars = make_bars("2024-05-01", 48)
+        ParquetOHLCVStore(tmp_path).write(asset, "H1", bars)
+        assert not OHLCV.objects.exists()
+
+        config = {"OHLCV_BACKEND": "parquet", "PARQUET_STORE_DIR": str(tmp_path)}
+        with override_settings(MARKET_DATA_CONFIG=config):
+            df = OHLCVLoader().load_dataframe(asset, "H1", bars.index[0], bars.index[-1])
+            assert len(df) == 48
+
+            with pytest.raises(ValueError, match="No OHLCV data found"):
+                OHLCVLoader().load_dataframe(
+                    asset, "D1", bars.index[0], bars.index[-1]
+                )
+
+
+@pytest.mark.django_db
+class TestORMOHLCVStoreFastPath:
+    def test_fast_path_matches_classic_path(self):
+        asset = Asset.objects.create(symbol="GBPUSD")
+        bars = make_bars("2024-06-03", 30)
+        OHLCV.objects.bulk_create(
+            OHLCV(
+                asset=asset,
+                timeframe="H1",
+                timestamp=ts.to_pydatetime(),
+                open=round(row.open, 8),
+                high=round(row.high, 8),
+                low=round(row.low, 8),
+                close=round(row.close, 8),
+                volume=int(row.volume),
+            )
+            for ts, row in bars.iterrows()
+        )
+        start, end = bars.index[3], bars.index[20]
+
+        classic = ORMOHLCVStore(fast_path=False).load(asset, "H1", start, end)
+        fast = ORMOHLCVStore(fast_path=True).load(asset, "H1", start, end)
+
+        assert len(fast) == 18
+        assert fast.index.tz is not None
+        assert fast["volume"].dtype == np.int64
+        pd.testing.assert_frame_equal(fast, classic, check_freq=False, check_index_type=False)
+
+    def test_fast_path_empty_range(self):
+        asset = Asset.objects.create(symbol="GBPUSD")
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        df = ORMOHLCVStore(fast_path=True).load(asset, "H1", start, start + datetime.timedelta(days=1))
+        assert df.empty
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+
+    def test_fast_path_is_the_default(self):
+        with override_settings(MARKET_DATA_CONFIG={}):
+            store = get_ohlcv_store()
+        assert isinstance(store, ORMOHLCVStore) and store.fast_path
+
+    def test_loader_queries_use_covering_index(self):
+        asset = Asset.objects.create(symbol="GBPUSD")
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        queries = ORMOHLCVStore(fast_path=True).loader_querysets(
+            [asset], "H1", start, start + datetime.timedelta(days=45)
+        )
+
+        for queryset in queries.values():
+            assert "COVERING INDEX ohlcv_series_range_cover" in queryset.explain()
+
+
+@pytest.mark.django_db
+class TestFixedPointOHLCVStore:
+    def test_roundtrip_rescales_to_float64(self):
+        asset = Asset.objects.create(symbol="XAUUSD", price_scale=3)
+        bars = make_bars("2024-07-01", 12).round(3)
+        store = FixedPointOHLCVStore()
+
+        assert store.write(asset, "H1", bars) == 12
+        stored = ScaledOHLCV.objects.order_by("timestamp").first()
+        assert stored.close == int(round(bars["close"].iloc[0] * 1000))
+
+        df = store.load(asset, "H1", bars.index[0], bars.index[-1])
+        assert df["close"].dtype == np.float64
+        pd.testing.assert_frame_equal(df, bars, check_freq=False)
+
+    def test_write_upserts_forming_bar(self):
+        asset = Asset.objects.create(symbol="XAUUSD", price_scale=3)
+        bars = make_bars("2024-07-01", 3).round(3)
+        store = FixedPointOHLCVStore()
+        store.write(asset, "H1", bars)
+
+        last = bars.iloc[[-1]].copy()
+        last["close"] = 2411.125
+        store.write(asset, "H1", last)
+
+        assert ScaledOHLCV.objects.count() == 3
+        df = store.load(asset, "H1", bars.index[0], bars.index[-1])
+        assert df["close"].iloc[-1] == 2411.125
+
+
+@pytest.mark.django_db
+class TestBulkOHLCVWriter:
+    def test_counts_inserted_and_updated_rows(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-08-01", 10).round(5)
+
+        first = write_ohlcv_bars(asset, "H1", bars.iloc[:8], batch_size=3)
+        assert (first.inserted, first.updated) == (8, 0)
+
+        forming = bars.copy()
+        forming.loc[forming.index[7], "close"] = 1.5
+        second = write_ohlcv_bars(asset, "H1", forming.iloc[6:], batch_size=3)
+        assert (second.inserted, second.updated, second.skipped) == (2, 2, 0)
+        assert second.first_timestamp == bars.index[6]
+
+        assert OHLCV.objects.filter(asset=asset).count() == 10
+        repaired = OHLCV.objects.get(asset=asset, timestamp=bars.index[7])
+        assert float(repaired.close) == 1.5
+
+    def test_ignore_mode_skips_existing_bars(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-08-01", 5).round(5)
+        write_ohlcv_bars(asset, "H1", bars)
+
+        changed = bars.copy()
+        changed["close"] = 2.0
+        result = write_ohlcv_bars(asset, "H1", changed, upsert=False)
+
+        assert (result.inserted, result.updated, result.skipped) == (0, 0, 5)
+        assert result.written == 0
+        assert not OHLCV.objects.filter(asset=asset, close=2).exists()
+
+    def test_copy_path_is_postgres_only(self):
+        if connection.vendor == "postgresql":
+            pytest.skip("SQLite fallback")
+        asset = Asset.objects.create(symbol="EURUSD")
+        with override_settings(PG_COPY_MIN_ROWS=1):
+            assert not copy_enabled(10)
+            assert copy_rows(OHLCV, ["asset"], [(asset.pk,)]) is None
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY needs DB_ENGINE=postgres")
+    @override_settings(PG_COPY_MIN_ROWS=1)
+    def test_copy_upsert_counts_match_bulk_create_path(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-08-01", 10).round(5)
+        assert write_ohlcv_bars(asset, "H1", bars.iloc[:8]).inserted == 8
+
+        forming = bars.copy()
+        forming.loc[forming.index[7], "close"] = 1.5
+        result = write_ohlcv_bars(asset, "H1", forming.iloc[6:])
+        assert (result.inserted, result.updated, result.skipped) == (2, 2, 0)
+        assert float(OHLCV.objects.get(asset=asset, timestamp=bars.index[7]).close) == 1.5
+
+        ignored = write_ohlcv_bars(asset, "H1", bars.assign(close=2.0), upsert=False)
+        assert (ignored.inserted, ignored.skipped) == (0, 10)
+        assert OHLCV.objects.filter(asset=asset).count() == 10
+
+
+class CountingStore:
+    """Wraps a store and records every range it is asked to load."""
+
+    mirrors_database = False
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.loads = []
+
+    def load(self, asset, timeframe, start_utc, end_utc):
+        self.loads.append((start_utc, end_utc))
+        return self.inner.load(asset, timeframe, start_utc, end_utc)
+
+    def write(self, asset, timeframe, df):
+        return self.inner.write(asset, timeframe, df)
+
+
+@pytest.mark.django_db
+class TestOHLCVFrameCache:
+    def test_serves_subranges_and_appends_only_the_tail(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        parquet = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-09-01", 100)
+        parquet.write(asset, "H1", bars.iloc[:60])
+        store = CountingStore(parquet)
+        cache = OHLCVFrameCache(store=store)
+
+        first = cache.get(asset, "H1", bars.index[0], bars.index[59])
+        assert len(first) == 60
+        inner = cache.get(asset, "H1", bars.index[10], bars.index[20])
+        assert len(inner) == 11
+        assert len(store.loads) == 1
+
+        forming = bars.iloc[59:].copy()
+        forming.loc[forming.index[0], "close"] = 7.0
+        parquet.write(asset, "H1", forming)
+        df = cache.get(asset, "H1", bars.index[30], bars.index[-1])
+
+        assert store.loads[-1][0] == bars.index[59]
+        assert len(df) == 70
+        assert df["close"].iloc[29] == 7.0
+
+        older = cache.get(asset, "H1", bars.index[0] - pd.Timedelta(days=1), bars.index[5])
+        assert len(older) == 6
+        assert store.loads[-1][1] < bars.index[0]
+
+    def test_truncate_and_lru_eviction(self, tmp_path):
+        eur = Asset.objects.create(symbol="EURUSD")
+        gbp = Asset.objects.create(symbol="GBPUSD")
+        parquet = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-09-01", 24)
+        parquet.write(eur, "H1", bars)
+        parquet.write(gbp, "H1", bars)
+        store = CountingStore(parquet)
+        cache = OHLCVFrameCache(max_entries=1, store=store)
+
+        cache.get(eur, "H1", bars.index[0], bars.index[-1])
+        cache.truncate(eur, "H1", bars.index[12])
+        df = cache.get(eur, "H1", bars.index[0], bars.index[-1])
+        assert len(df) == 24
+        assert store.loads[-1][0] == bars.index[11]
+
+        cache.get(gbp, "H1", bars.index[0], bars.index[-1])
+        assert len(cache) == 1
+        cache.get(eur, "H1", bars.index[0], bars.index[-1])
+        assert store.loads[-1] == (bars.index[0], bars.index[-1])
+
+    def test_reloads_series_written_by_another_process(self):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-09-02", 48)
+        persist_ohlcv_frame(asset, Timeframe.H1, bars)
+        store = CountingStore(ORMOHLCVStore(fast_path=True))
+        cache = OHLCVFrameCache(store=store)  # a worker that did not run the write below
+        cache.get(asset, "H1", bars.index[0], bars.index[-1])
+
+        revised = bars.iloc[[10]].copy()
+        revised["close"] = 7.0
+        persist_ohlcv_frame(asset, Timeframe.H1, revised)  # truncates only this process's cache
+
+        df = cache.get(asset, "H1", bars.index[0], bars.index[-1])
+        assert df["close"].iloc[10] == 7.0
+        assert len(store.loads) == 2
+        cache.get(asset, "H1", bars.index[0], bars.index[-1])
+        assert len(store.loads) == 2
+
+
+@pytest.mark.django_db
+class TestSharedRedisCache:
+    def test_segment_encoding_roundtrip(self):
+        bars = make_bars("2024-10-01", 5)
+        payload = encode_segment(bars)
+
+        assert len(payload) == 8 + 5 * 48
+        pd.testing.assert_frame_equal(decode_segment(payload), bars, check_freq=False)
+        assert decode_segment(encode_segment(bars.iloc[:0])).empty
+
+    def test_reads_through_day_buckets_and_invalidates(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        parquet = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-10-01", 24 * 3)
+        parquet.write(asset, "H1", bars)
+        inner = CountingStore(parquet)
+        client = fakeredis.FakeRedis()
+        store = SharedCacheOHLCVStore(inner, RedisSegmentCache(client))
+
+        start, end = bars.index[5], bars.index[50]
+        first = store.load(asset, "H1", start, end)
+        pd.testing.assert_frame_equal(first, bars.loc[start:end], check_freq=False)
+        assert len(inner.loads) == 1
+        assert client.exists("ohlcv:v1:EURUSD:H1:2024-10-02")
+
+        # A second worker sharing the same Redis never touches the store.
+        other = CountingStore(parquet)
+        again = SharedCacheOHLCVStore(other, RedisSegmentCache(client)).load(asset, "H1", start, end)
+        pd.testing.assert_frame_equal(again, first)
+        assert other.loads == []
+
+        RedisSegmentCache(client).invalidate(asset, "H1", bars.index[30], bars.index[30])
+        store.load(asset, "H1", start, end)
+        assert inner.loads[-1][0] == pd.Timestamp("2024-10-02", tz="UTC")
+        assert len(inner.loads) == 2
+
+    def test_read_racing_an_invalidation_is_not_cached(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        parquet = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-10-01", 24)
+        parquet.write(asset, "H1", bars)
+        client = fakeredis.FakeRedis()
+        cache = RedisSegmentCache(client)
+
+        class InvalidatedDuringLoad(CountingStore):
+            def load(self, *args):
+                df = super().load(*args)
+                cache.invalidate(asset, "H1", bars.index[0], bars.index[-1])  # ingestion commits meanwhile
+                return df
+
+        racing = SharedCacheOHLCVStore(InvalidatedDuringLoad(parquet), cache)
+        racing.load(asset, "H1", bars.index[0], bars.index[-1])
+
+        assert not client.exists("ohlcv:v1:EURUSD:H1:2024-10-01")
+        SharedCacheOHLCVStore(parquet, cache).load(asset, "H1", bars.index[0], bars.index[-1])
+        assert client.exists("ohlcv:v1:EURUSD:H1:2024-10-01")
+
+    def test_falls_back_to_store_when_redis_is_down(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        parquet = ParquetOHLCVStore(tmp_path)
+        bars = make_bars("2024-10-01", 10)
+        parquet.write(asset, "H1", bars)
+        server = fakeredis.FakeServer()
+        server.connected = False
+        store = SharedCacheOHLCVStore(parquet, RedisSegmentCache(fakeredis.FakeRedis(server=server)))
+
+        assert len(store.load(asset, "H1", bars.index[0], bars.index[-1])) == 10
+
+
+@pytest.mark.django_db
+class TestTieredOHLCVStore:
+    def test_compaction_moves_old_bars_and_reads_span_both_tiers(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-01-30", 24 * 5)
+        write_ohlcv_bars(asset, "H1", bars)
+        archive = ParquetOHLCVStore(tmp_path)
+        cutoff = pd.Timestamp("2024-02-02", tz="UTC").to_pydatetime()
+
+        dry = compact_series(asset, "H1", archive, cutoff, dry_run=True)
+        assert dry.archived == 24 * 3 and dry.months == 2
+        assert OHLCV.objects.count() == len(bars)
+
+        result = compact_series(asset, "H1", archive, cutoff)
+        assert result.deleted == 24 * 3
+        assert OHLCV.objects.filter(timestamp__lt=cutoff).count() == 0
+        assert sorted(p.name for p in archive.series_dir("EURUSD", "H1").glob("*.parquet")) == [
+            "2024-01.parquet",
+            "2024-02.parquet",
+        ]
+
+        store = TieredOHLCVStore(ORMOHLCVStore(fast_path=True), archive)
+        df = store.load(asset, "H1", bars.index[0], bars.index[-1])
+        pd.testing.assert_frame_equal(df, bars, check_freq=False)
+
+        # Re-ingested bars in the archived range win over the archived copy.
+        updated = bars.iloc[[10]].copy()
+        updated["close"] = 9.9
+        write_ohlcv_bars(asset, "H1", updated)
+        df = store.load(asset, "H1", bars.index[0], bars.index[-1])
+        assert len(df) == len(bars)
+        assert df["close"].iloc[10] == 9.9
+
+        panel = store.load_many([asset], "H1", bars.index[0], bars.index[-1])
+        assert len(panel) == len(bars)
+        assert (panel["symbol"] == "EURUSD").all()
+
+    def test_compaction_keeps_bars_written_after_the_month_was_loaded(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-01-10", 24 * 2)
+        write_ohlcv_bars(asset, "H1", bars.iloc[::2])  # every other hour is still missing
+        late = bars.iloc[[5]]
+
+        class IngestDuringArchive(ParquetOHLCVStore):
+            def write(self, *args):
+                written = super().write(*args)
+                write_ohlcv_bars(asset, "H1", late)  # lands inside the month being compacted
+                return written
+
+        cutoff = pd.Timestamp("2024-02-01", tz="UTC").to_pydatetime()
+        result = compact_series(asset, "H1", IngestDuringArchive(tmp_path), cutoff)
+
+        assert result.deleted == 24
+        assert list(OHLCV.objects.values_list("timestamp", flat=True)) == [late.index[0]]
+
+    def test_chart_data_includes_archived_bars(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        bars = make_bars("2024-01-30", 24 * 5)
+        write_ohlcv_bars(asset, "H1", bars)
+        config = {"ARCHIVE_ENABLED": True, "ARCHIVE_DIR": str(tmp_path)}
+        cutoff = pd.Timestamp("2024-02-02", tz="UTC").to_pydatetime()
+        compact_series(asset, "H1", ParquetOHLCVStore(tmp_path), cutoff)
+
+        with override_settings(MARKET_DATA_CONFIG=config):
+            chart = ChartDataService.get_chart_data("EURUSD", "H1", bars.index[0], bars.index[-1])
+
+        assert len(chart["ohlcv"]) == len(bars)
+        assert chart["ohlcv"][0]["close"] == f"{bars['close'].iloc[0]:.8f}"
+
+    def test_command_refuses_to_compact_without_the_archive(self, tmp_path):
+        asset = Asset.objects.create(symbol="EURUSD")
+        write_ohlcv_bars(asset, "H1", make_bars("2024-01-30", 24))
+        config = {"ARCHIVE_ENABLED": False, "ARCHIVE_DIR": str(tmp_path), "HOT_RETENTION_DAYS": 1}
+
+        with override_settings(MARKET_DATA_CONFIG=config):
+            with pytest.raises(CommandError):
+                call_command("compact_ohlcv", stdout=io.StringIO())
+            assert OHLCV.objects.count() == 24
+
+            call_command("compact_ohlcv", "--force", stdout=io.StringIO())
+        assert OHLCV.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestSnapshotOHLCVStore:
+    def test_roundtrip_and_inclusive_window(self, tmp_path):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        store = SnapshotOHLCVStore(tmp_path)
+        bars = make_bars("2024-01-30", 24 * 4)
+
+        assert store.write(asset, "H1", bars) == len(bars)
+        pd.testing.assert_frame_equal(store.load(asset, "H1", bars.index[0], bars.index[-1]), bars, check_freq=False)
+
+        start, end = bars.index[5], bars.index[40]
+        df = store.load(asset, "H1", start, end)
+        assert df.index[0] == start and df.index[-1] == end
+        assert df["volume"].dtype == np.int64
+        assert store.load(asset, "D1", start, end).empty
+        after = bars.index[-1] + pd.Timedelta(hours=1)
+        assert store.load(asset, "H1", after, after + pd.Timedelta(days=1)).empty
+
+    def test_rewrite_is_picked_up_and_loader_reads_snapshots(self, tmp_path):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        store = SnapshotOHLCVStore(tmp_path)
+        bars = make_bars("2024-05-01", 48)
+        store.write(asset, "H1", bars.iloc[:24])
+        assert len(store.load(asset, "H1", bars.index[0], bars.index[-1])) == 24
+
+        store.write(asset, "H1", bars)
+        assert len(store.load(asset, "H1", bars.index[0], bars.index[-1])) == 48
+
+        with override_settings(MARKET_DATA_CONFIG={"SNAPSHOT_DIR": str(tmp_path)}):
+            df = OHLCVLoader(from_snapshot=True).load_dataframe(asset, "H1", bars.index[0], bars.index[-1])
+        assert len(df) == 48
+        assert not OHLCV.objects.exists()
+
+    def test_rejects_foreign_files(self, tmp_path):
+        asset = Asset.objects.create(symbol="XAUUSD")
+        store = SnapshotOHLCVStore(tmp_path)
+        path = store.path_for("XAUUSD", "H1")
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"\0" * 256)
+
+        with pytest.raises(SnapshotFormatError):
+            store.load(asset, "H1", datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1))
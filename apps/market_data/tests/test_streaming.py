@@ -0,0 +1,75 @@
+# apps/market_data/tests/test_streaming.py
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+import zstandard
+from django.core.management import call_command
+
+from apps.market_data.models import OHLCV
+from apps.market_data.streaming import iter_seed_batches, read_seed_header
+from apps.trading_core.models import FeatureVector
+
+
+def seed_payload(rows: int, header_last: bool = False) -> bytes:
+    bars = [
+        {
+            "time": f"2025-01-{1 + i // 24:02d}T{i % 24:02d}:00:00Z",
+            "open": "1.16622000",
+            "high": "1.16646000",
+            "low": "1.16554000",
+            "close": "1.16566000",
+            "volume": i,
+        }
+        for i in range(rows)
+    ]
+    header = {"symbol": "EURUSD", "timeframe": "H1"}
+    payload = {"ohlcv": bars, **header} if header_last else {**header, "ohlcv": bars}
+    return json.dumps(payload).encode()
+
+
+class TestSeedStreaming:
+    @pytest.mark.parametrize("codec", ["plain", "gzip", "zstd"])
+    def test_reads_compressed_files_in_batches(self, tmp_path, codec):
+        raw = seed_payload(25, header_last=True)
+        path = tmp_path / "seed.json"
+        if codec == "gzip":
+            raw = gzip.compress(raw)
+        elif codec == "zstd":
+            raw = zstandard.ZstdCompressor().compress(raw)
+        path.write_bytes(raw)
+
+        assert read_seed_header(path) == ("EURUSD", "H1")
+        batches = list(iter_seed_batches(path, batch_size=10, skip=3))
+        assert [len(b) for b in batches] == [10, 10, 2]
+        assert batches[0][0]["volume"] == 3
+
+
+@pytest.mark.django_db
+class TestSeedDataFromJsonCommand:
+    def test_streams_batches_and_resumes_after_failure(self, tmp_path):
+        path = tmp_path / "seed.json.gz"
+        path.write_bytes(gzip.compress(seed_payload(50)))
+
+        original = FeatureVector.objects.bulk_create
+        calls = {"n": 0}
+
+        def flaky_bulk_create(*args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 3:
+                raise RuntimeError("connection lost")
+            return original(*args, **kwargs)
+
+        with patch.object(FeatureVector.objects, "bulk_create", side_effect=flaky_bulk_create):
+            with pytest.raises(RuntimeError):
+                call_command("seed_data_from_json", str(path), "--batch-size", "20")
+
+        # The failed batch was rolled back; the first two are committed and recorded.
+        assert OHLCV.objects.count() == 20 * 2
+        assert json.loads((tmp_path / "seed.json.gz.progress").read_text()) == {"rows": 40}
+
+        call_command("seed_data_from_json", str(path), "--batch-size", "20", "--resume")
+        assert OHLCV.objects.count() == 50
+        assert FeatureVector.objects.count() == 50
+        assert not (tmp_path / "seed.json.gz.progress").exists()
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import OHLCVIngestAPIView
+from .views import OHLCVCoverageAPIView, OHLCVIngestAPIView
 
 # هذه القائمة هي ما يبحث عنه Django
 urlpatterns = [
     path("ohlcv/ingest/", OHLCVIngestAPIView.as_view(), name="ohlcv_ingest"),
+    path("ohlcv/coverage/", OHLCVCoverageAPIView.as_view(), name="ohlcv_coverage"),
 ]
\ No newline at end of file
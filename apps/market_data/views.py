@@ -7,7 +7,9 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .serializers import OHLCVIngestRequestSerializer
+from .coverage import coverage_report
+from .models import Asset
+from .serializers import OHLCVCoverageRequestSerializer, OHLCVIngestRequestSerializer
 from .tasks import ingest_historical_data_task
 
 logger = structlog.get_logger(__name__)
@@ -56,3 +58,36 @@ class OHLCVIngestAPIView(APIView):
             {"message": "OHLCV ingestion task started.", "task_id": task.id},
             status=status.HTTP_202_ACCEPTED,
         )
+
+
+class OHLCVCoverageAPIView(APIView):
+    """Answers "which bars of this series are missing" from the coverage index alone."""
+
+    def get(self, request: Request) -> Response:
+        serializer = OHLCVCoverageRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        asset = Asset.objects.filter(symbol=data["symbol"]).first()
+        if asset is None:
+            return Response({"detail": f"Unknown symbol '{data['symbol']}'."}, status=status.HTTP_404_NOT_FOUND)
+
+        report = coverage_report(asset, data["timeframe"], data["start_date"], data["end_date"])
+        return Response(
+            {
+                "symbol": report.symbol,
+                "timeframe": report.timeframe,
+                "expected_bars": report.expected_bars,
+                "covered_bars": report.covered_bars,
+                "missing_bars": report.missing_bars,
+                "completeness": round(report.completeness, 6),
+                "intervals": [
+                    {"start": start.isoformat(), "end": end.isoformat(), "bars": bars}
+                    for start, end, bars in report.intervals
+                ],
+                "holes": [
+                    {"start": hole.start.isoformat(), "end": hole.end.isoformat(), "expected_bars": hole.expected_bars}
+                    for hole in report.holes
+                ],
+            }
+        )
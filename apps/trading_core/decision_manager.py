@@ -7,13 +7,12 @@ from apps.market_data.models import Asset
 from apps.trading_core.models import TradingSignal
 from apps.trading_core.execution_manager import ExecutionManager
 from apps.analytics.services import OHLCVLoader
+from apps.market_data.storage.frame_cache import get_frame_cache
 from apps.mlops.services import get_active_model
-from apps.analytics.features.pipeline import FeaturePipeline
+from apps.analytics.features.incremental import build_features
 
 # Indicators
-from ta.trend import EMAIndicator, ADXIndicator
-from ta.momentum import RSIIndicator
-from ta.volatility import AverageTrueRange
+from apps.analytics.features.graph import IndicatorGraph
 
 logger = structlog.get_logger(__name__)
 
@@ -33,7 +32,7 @@ class DecisionManager:
         logger.info("Decision Pipeline Activated", symbol=self.symbol)
 
         # 1. Multi-Timeframe Data Loading (H1 & D1)
-        loader = OHLCVLoader()
+        loader = OHLCVLoader(cache=get_frame_cache())
         end_utc = timezone.now()
         # نحتاج بيانات كافية لحساب EMA200 و ADX D1
         start_utc_h1 = end_utc - timezone.timedelta(days=20) 
@@ -53,8 +52,11 @@ class DecisionManager:
 
         # 2. MACRO REGIME CHECK (The Shield against Whipsaws)
         # هذا الفلتر هو ما كان سينقذنا في 2020
-        d1_adx = ADXIndicator(high=df_d1['high'], low=df_d1['low'], close=df_d1['close'], window=14).adx().iloc[-1]
-        d1_atr = AverageTrueRange(high=df_d1['high'], low=df_d1['low'], close=df_d1['close'], window=14).average_true_range().iloc[-1]
+        # One graph per frame: ADX/ATR share the true range here, and the H1 filters
+        # share EMA200/RSI14/ADX14 with the feature pipeline below.
+        d1 = IndicatorGraph(df_d1)
+        d1_adx = d1.get('adx', 14)[-1]
+        d1_atr = d1.get('atr', 14)[-1]
         
         # الشرط: تقلب عالي (>20$) + اتجاه واضح (ADX > 20)
         # ملاحظة: خفضنا ADX قليلاً لضمان عدم تفويت بدايات الترند
@@ -64,10 +66,11 @@ class DecisionManager:
 
         # 3. STRATEGY SIGNAL (H1 Trend Pullback)
         close = df_h1['close']
+        h1 = IndicatorGraph(df_h1)
         
-        h1_ema200 = EMAIndicator(close=close, window=200).ema_indicator().iloc[-1]
-        h1_rsi = RSIIndicator(close=close, window=14).rsi().iloc[-1]
-        h1_adx = ADXIndicator(high=df_h1['high'], low=df_h1['low'], close=close, window=14).adx().iloc[-1]
+        h1_ema200 = h1.get('ema', 'close', 200)[-1]
+        h1_rsi = h1.get('rsi', 14)[-1]
+        h1_adx = h1.get('adx', 14)[-1]
         
         last_close = close.iloc[-1]
         last_open = df_h1['open'].iloc[-1]
@@ -91,7 +94,7 @@ class DecisionManager:
         
         try:
             # Prepare features exactly as trained
-            features_df = FeaturePipeline.build_feature_dataframe(self.symbol, df_h1)
+            features_df = build_features(self.asset, self.timeframe, df_h1, graph=h1)
             latest_features = features_df.iloc[[-1]][registry.feature_list]
             
             ml_prob = model.predict_proba(latest_features)[0, 1]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.6 on 2026-10-17 17:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market_data", "0007_ohlcv_covering_index"),
+        ("trading_core", "0006_circuitbreakerstate_order"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeatureEngineState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("timeframe", models.CharField(help_text="e.g., M1, H1, D1", max_length=5)),
+                ("pipeline_version", models.PositiveIntegerField()),
+                (
+                    "last_timestamp",
+                    models.DateTimeField(
+                        help_text="Open time of the last closed bar folded into the state (UTC)"
+                    ),
+                ),
+                ("state", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feature_engine_states",
+                        to="market_data.asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Feature Engine State",
+                "verbose_name_plural": "Feature Engine States",
+                "unique_together": {("asset", "timeframe", "pipeline_version")},
+            },
+        ),
+    ]
@@ -7,6 +7,7 @@ Contents
 - VerifiedPattern: result of a verifier (one-to-one with PatternCandidate)
 - TradingSignal: a trading instruction derived from a verified pattern (one-to-one with PatternCandidate)
 - FeatureVector: stored snapshot of engineered features for an asset at a timestamp (for ML / backtesting)
+- FeatureEngineState: resumable indicator state of the incremental feature engine
 - Order: a record of a trade execution sent to a broker
 - CircuitBreakerState: tracks the state of the system's risk management circuit breaker
 
@@ -224,6 +225,28 @@ class FeatureVector(models.Model):
         }
 
 
+class FeatureEngineState(models.Model):
+    """
+    Recursive indicator state of the incremental feature engine
+    (`apps.analytics.features.incremental`) for one (asset, timeframe, pipeline version),
+    so any worker can resume the stream where the last one stopped.
+    """
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, related_name="feature_engine_states")
+    timeframe = models.CharField(max_length=5, help_text="e.g., M1, H1, D1")
+    pipeline_version = models.PositiveIntegerField()
+    last_timestamp = models.DateTimeField(help_text="Open time of the last closed bar folded into the state (UTC)")
+    state = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("asset", "timeframe", "pipeline_version")
+        verbose_name = "Feature Engine State"
+        verbose_name_plural = "Feature Engine States"
+
+    def __str__(self) -> str:
+        return f"{self.asset.symbol} {self.timeframe} v{self.pipeline_version} @ {self.last_timestamp.isoformat()}"
+
+
 # -----------------------------------------------
 # New: Execution and Risk Management Models
 # -----------------------------------------------
@@ -1,56 +1,38 @@
 # apps/trading_core/strategies.py
 import pandas as pd
-import numpy as np
-from ta.volatility import BollingerBands
-from ta.momentum import RSIIndicator
-from ta.trend import ADXIndicator, EMAIndicator
+from apps.analytics.features.graph import IndicatorGraph
 
-def calculate_choppiness(df: pd.DataFrame, window: int = 14) -> pd.Series:
+def calculate_choppiness(df: pd.DataFrame, window: int = 14, graph: IndicatorGraph = None) -> pd.Series:
     """Manual CHOP calculation for Strategy use."""
-    high = df['high']
-    low = df['low']
-    close = df['close']
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift(1))
-    tr3 = abs(low - close.shift(1))
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    tr_sum = tr.rolling(window=window).sum()
-    range_hl = high.rolling(window=window).max() - low.rolling(window=window).min()
-    
-    # Handle zeros to avoid log errors
-    range_hl = range_hl.replace(0, np.nan)
-    
-    chop = 100 * np.log10(tr_sum / range_hl) / np.log10(window)
-    return chop.fillna(50) # Default to neutral if NaN
+    graph = graph or IndicatorGraph(df)
+    return graph.series('chop', window).fillna(50) # Default to neutral if NaN
 
-def trend_pullback_signal(df: pd.DataFrame) -> bool:
+def trend_pullback_signal(df: pd.DataFrame, graph: IndicatorGraph = None) -> bool:
     """
     Trend Pullback + Quality Control Strategy (Robust).
+    Pass the frame's IndicatorGraph to share indicators with other consumers.
     """
     if len(df) < 200: 
         return False
 
-    close = df['close']
-    open_price = df['open']
-    high = df['high']
-    low = df['low']
+    graph = graph or IndicatorGraph(df)
+    close = graph.get('close')
+    open_price = graph.get('open')
     
     # Indicators
-    ema_200 = EMAIndicator(close=close, window=200).ema_indicator()
-    rsi_ind = RSIIndicator(close=close, window=14)
-    adx_ind = ADXIndicator(high=high, low=low, close=close, window=14)
+    ema_200 = graph.get('ema', 'close', 200)
+    rsi = graph.get('rsi', 14)
+    adx = graph.get('adx', 14)
     
     # Calculate Chop Manually
-    chop_series = calculate_choppiness(df)
+    chop_series = calculate_choppiness(df, graph=graph)
     
     # Latest Values
-    last_close = close.iloc[-1]
-    last_open = open_price.iloc[-1]
-    last_ema = ema_200.iloc[-1]
-    last_rsi = rsi_ind.rsi().iloc[-1]
-    last_adx = adx_ind.adx().iloc[-1]
+    last_close = close[-1]
+    last_open = open_price[-1]
+    last_ema = ema_200[-1]
+    last_rsi = rsi[-1]
+    last_adx = adx[-1]
     last_chop = chop_series.iloc[-1]
     
     # Logic Checks
@@ -99,16 +99,58 @@ TEMPLATES = [
 
 
 # --- 7. إعدادات قاعدة البيانات ---
-print("--- Using SQLite Database ---")
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / SQLITE_NAME,
-        "OPTIONS": {
-            "check_same_thread": False,
-        },
+# DB_ENGINE=postgres switches to PostgreSQL (POSTGRES_* variables, see docker-compose.yml);
+# SQLite serialises all writers and only suits single-worker setups.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite").lower()
+if DB_ENGINE in ("postgres", "postgresql"):
+    print("--- Using PostgreSQL Database ---")
+    # Behind pgbouncer in transaction pooling mode server-side cursors cannot be used.
+    PGBOUNCER = os.getenv("PGBOUNCER", "False").lower() in ("true", "1", "t")
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "trady2"),
+            "USER": os.getenv("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+            "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # persistent connections: Celery workers reuse one connection across tasks
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "DISABLE_SERVER_SIDE_CURSORS": PGBOUNCER,
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+                "application_name": os.getenv("DB_APPLICATION_NAME", "trady2"),
+            },
+        }
+    }
+else:
+    print("--- Using SQLite Database ---")
+    # opt-in concurrency mode: WAL + tuned pragmas on every connection and one queued
+    # writer across all worker processes (see apps/common/sqlite.py)
+    SQLITE_PERFORMANCE_MODE = os.getenv("SQLITE_PERFORMANCE_MODE", "False").lower() in ("true", "1", "t")
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": int(os.getenv("SQLITE_CACHE_KIB", "64000")) * -1,
+        "mmap_size": int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 ** 2))),
+        "temp_store": "MEMORY",
+    }
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / SQLITE_NAME,
+            "OPTIONS": {
+                "check_same_thread": False,
+                # seconds a statement waits for a lock before "database is locked"
+                "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "30" if SQLITE_PERFORMANCE_MODE else "5")),
+            },
+        }
     }
-}
+
+# PostgreSQL bulk loads (OHLCV, FeatureVector) of at least PG_COPY_MIN_ROWS rows use COPY FROM STDIN
+PG_COPY_ENABLED = os.getenv("PG_COPY_ENABLED", "True").lower() in ("true", "1", "t")
+PG_COPY_MIN_ROWS = int(os.getenv("PG_COPY_MIN_ROWS", "500"))
 
 
 # --- 8. إعدادات المصادقة ---
@@ -162,6 +204,18 @@ ANALYTICS_CONFIG = {
     "VERIFICATION_CONFIDENCE_THRESHOLD": 0.7,
     "RSI_OVERBOUGHT": 70,
     "DTW_SENSITIVITY_K": 4.0,
+    # Stream features bar by bar from persisted indicator state (FeatureEngineState) instead of
+    # recomputing the whole window each cycle.
+    "INCREMENTAL_FEATURES": os.getenv("INCREMENTAL_FEATURES", "False").lower() in ("true", "1", "t"),
+    # Also append generated features to the columnar float32 store (features/store.py) under
+    # FEATURE_STORE_DIR; the prediction API then reads the latest row from there.
+    "FEATURE_STORE_ENABLED": os.getenv("FEATURE_STORE_ENABLED", "False").lower() in ("true", "1", "t"),
+    "FEATURE_STORE_DIR": os.getenv("FEATURE_STORE_DIR", str(BASE_DIR / "data" / "feature_store")),
+    # Memoise FeaturePipeline results on disk, keyed by a hash of the input bars and of the pipeline
+    # code (features/cache.py); least recently used entries go once FEATURE_CACHE_MAX_BYTES is exceeded.
+    "FEATURE_CACHE_ENABLED": os.getenv("FEATURE_CACHE_ENABLED", "False").lower() in ("true", "1", "t"),
+    "FEATURE_CACHE_DIR": os.getenv("FEATURE_CACHE_DIR", str(BASE_DIR / "data" / "feature_cache")),
+    "FEATURE_CACHE_MAX_BYTES": int(os.getenv("FEATURE_CACHE_MAX_BYTES", str(1024 ** 3))),
     "mlops": {
         "model_output_dir": "mlops/models/",
         "registry_app_label": "mlops",
@@ -182,7 +236,60 @@ TRADING_CONFIG = {
 }
 
 
-# --- 13. إعدادات التسجيل ---
+# --- 13. إعدادات تخزين بيانات السوق ---
+MARKET_DATA_CONFIG = {
+    # "orm" (OHLCV table), "parquet" (columnar store) or "fixed_point" (ScaledOHLCV table);
+    # the last two are mirrored from the OHLCV table on ingest
+    "OHLCV_BACKEND": os.getenv("OHLCV_BACKEND", "orm"),
+    "PARQUET_STORE_DIR": os.getenv("PARQUET_STORE_DIR", str(BASE_DIR / "data" / "ohlcv_parquet")),
+    # ORM reads via raw cursor into NumPy arrays (no per-row dicts/Decimals)
+    "ORM_FAST_PATH": os.getenv("ORM_FAST_PATH", "True").lower() in ("true", "1", "t"),
+    # bars re-fetched behind the ingestion watermark to repair the still-forming bar
+    "INGEST_OVERLAP_BARS": int(os.getenv("INGEST_OVERLAP_BARS", "2")),
+    # process-local cache of OHLCV frames shared by the analysis chain and DecisionManager;
+    # entries are reloaded once another process writes their series (CoverageInterval.updated_at)
+    "FRAME_CACHE_ENABLED": os.getenv("FRAME_CACHE_ENABLED", "True").lower() in ("true", "1", "t"),
+    "FRAME_CACHE_MAX_ENTRIES": int(os.getenv("FRAME_CACHE_MAX_ENTRIES", "32")),
+    "FRAME_CACHE_MAX_BYTES": int(os.getenv("FRAME_CACHE_MAX_BYTES", str(256 * 1024 ** 2))),
+    # shared day-bucketed OHLCV cache in Redis (defaults to REDIS_URL)
+    "REDIS_CACHE_ENABLED": os.getenv("REDIS_CACHE_ENABLED", "False").lower() in ("true", "1", "t"),
+    "REDIS_CACHE_URL": os.getenv("REDIS_CACHE_URL"),
+    "REDIS_CACHE_TTL": int(os.getenv("REDIS_CACHE_TTL", str(7 * 24 * 3600))),
+    "REDIS_CACHE_LIVE_TTL": int(os.getenv("REDIS_CACHE_LIVE_TTL", "300")),
+    # resampling: higher timeframes are built from BASE_TIMEFRAME bars, either materialised
+    # on ingest (DERIVED_TIMEFRAMES, comma separated) or on read when not stored
+    "BASE_TIMEFRAME": os.getenv("BASE_TIMEFRAME", "M1"),
+    "DERIVED_TIMEFRAMES": [tf for tf in os.getenv("DERIVED_TIMEFRAMES", "").split(",") if tf],
+    "RESAMPLE_ON_READ": os.getenv("RESAMPLE_ON_READ", "False").lower() in ("true", "1", "t"),
+    # trading-day boundary for H4/D1 buckets, e.g. "America/New_York" + "17:00" for FX
+    "SESSION_TIMEZONE": os.getenv("SESSION_TIMEZONE", "UTC"),
+    "SESSION_START": os.getenv("SESSION_START", "00:00"),
+    # session weekdays (0 = Monday) with expected bars for the coverage index; crypto assets trade daily
+    "TRADING_WEEKDAYS": os.getenv("TRADING_WEEKDAYS", "0,1,2,3,4"),
+    # hot/cold tiering: `compact_ohlcv` moves bars older than HOT_RETENTION_DAYS from the OHLCV
+    # table into Parquet month files under ARCHIVE_DIR; the "orm" backend then reads both tiers
+    "ARCHIVE_ENABLED": os.getenv("ARCHIVE_ENABLED", "False").lower() in ("true", "1", "t"),
+    "ARCHIVE_DIR": os.getenv("ARCHIVE_DIR", str(BASE_DIR / "data" / "ohlcv_archive")),
+    "HOT_RETENTION_DAYS": int(os.getenv("HOT_RETENTION_DAYS", "120")),
+    # live bars (`run_live_bars`): connector poll interval, wait past a bar's end before closing it
+    # without a newer bar, and history loaded into the frame cache before the first live bar
+    "LIVE_POLL_SECONDS": float(os.getenv("LIVE_POLL_SECONDS", "0.5")),
+    "LIVE_CLOSE_GRACE_SECONDS": float(os.getenv("LIVE_CLOSE_GRACE_SECONDS", "2")),
+    "LIVE_WARMUP_DAYS": int(os.getenv("LIVE_WARMUP_DAYS", "100")),
+    # memory-mapped per-series exports (`snapshot_ohlcv`) read by research commands with --from-snapshot
+    "SNAPSHOT_DIR": os.getenv("SNAPSHOT_DIR", str(BASE_DIR / "data" / "ohlcv_snapshots")),
+    # OHLCV source: "mt5" (terminal), "replay" (files under REPLAY_PATH) or "synthetic" (generated)
+    "CONNECTOR": os.getenv("MARKET_DATA_CONNECTOR", "mt5"),
+    "REPLAY_PATH": os.getenv("REPLAY_PATH", str(BASE_DIR / "data")),
+    "CONNECTOR_LATENCY_MS": float(os.getenv("CONNECTOR_LATENCY_MS", "0")),
+    "SYNTHETIC_SEED": int(os.getenv("SYNTHETIC_SEED", "0")),
+    # historical backfill (manage.py backfill_ohlcv)
+    "BACKFILL_CHUNK_DAYS": int(os.getenv("BACKFILL_CHUNK_DAYS", "30")),
+    "BACKFILL_WORKERS": int(os.getenv("BACKFILL_WORKERS", "4")),
+}
+
+
+# --- 14. إعدادات التسجيل ---
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,